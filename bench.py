@@ -0,0 +1,494 @@
+# ClickShot benchmarks - synthetic captures stand in for the screen, so these run
+# headless on any OS. Not part of the app (ClickShot.spec bundles main.py only).
+#   python bench.py formats | scroll | export | startup | suite   (-h for options)
+
+import os, sys, io, time, argparse, ctypes, json
+from ctypes import wintypes
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from main import (APP_NAME, CAPTURE_FORMATS, EXPORTERS, PNG_ENCODE_PRESETS, Capture, ClickShotApp,
+                  DocBuilder, DocxAppender, FakePlatform, Frame, Metrics, ScrollingGrabber, ScrollStitcher,
+                  Session, SyntheticGrabber, _webp_ok, add_page, analyze_frame, choose_format,
+                  display_inches, encode_image, make_preview, needs_resample, new_document,
+                  resample_for_display, synthetic_desktop, synthetic_photo)
+
+# ----- Capture format benchmark -----
+def format_corpus(width: int = 1920, height: int = 1080) -> dict:
+    """Synthetic frames: a few-colour terminal, anti-aliased/shaded UI and photo-like."""
+    rng = np.random.default_rng(3)
+    term = np.empty((height, width, 4), dtype=np.uint8)
+    term[...] = (30, 30, 30, 255)
+    palette = rng.integers(80, 256, (8, 3), dtype=np.uint8)
+    for y in range(8, height - 16, 18):
+        rows = term[y:y + 12, :, :3]
+        glyphs = rng.random((12, width)) < 0.35
+        rows[glyphs] = np.broadcast_to(palette[rng.integers(0, 8, width)], (12, width, 3))[glyphs]
+
+    ui = synthetic_desktop(width, height, 1).astype(np.float32)
+    blur = ui.copy()  # 2x2 box filter stands in for font/edge anti-aliasing
+    blur[1:, :] += ui[:-1, :]
+    blur[:, 1:] += ui[:, :-1]
+    blur[1:, 1:] += ui[:-1, :-1]
+    blur[..., :3] *= (0.9 + 0.1 * np.linspace(0, 1, height, dtype=np.float32))[:, None, None] / 4
+    blur[..., 3] = 255
+    return {"ui-terminal": Frame(term), "ui-antialiased": Frame(blur.astype(np.uint8)),
+            "photo": Frame(synthetic_photo(width, height, 1))}
+
+def format_benchmark(width: int = 1920, height: int = 1080, preset: str = "balanced") -> list:
+    """Encode each corpus frame in every capture format; rows of
+    (frame, format, KiB, ms, chosen-by-auto)."""
+    import tempfile
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, frame in format_corpus(width, height).items():
+            auto = choose_format(analyze_frame(frame))
+            for fmt, ext in CAPTURE_FORMATS.items():
+                if fmt == "webp" and not _webp_ok():
+                    continue
+                path = str(Path(tmp) / f"{name}_{fmt}{ext}")
+                t0 = time.perf_counter()
+                encode_image(frame.tobytes(), "RGB", frame.size, path, fmt, preset, "BGRX")
+                ms = (time.perf_counter() - t0) * 1000
+                rows.append((name, fmt, os.path.getsize(path) / 1024, ms, fmt == auto))
+    return rows
+
+# ----- Scrolling capture benchmark -----
+def scroll_benchmark(steps=(7, 45, 120, 300), width: int = 1200, height: int = 800,
+                     page_rows: int = 6000) -> list:
+    """Stitch a synthetic long page scrolled by `step` rows per grab; rows of
+    (step, grabs, lost, exact, p50 ms, p95 ms) for the stitching alone."""
+    box = {"left": 0, "top": 0, "width": width, "height": height}
+    rows = []
+    for step in steps:
+        g = ScrollingGrabber(width, height, page_rows, step)
+        st = ScrollStitcher(width, height, (page_rows + height) * width * 4)
+        times = []
+        while True:
+            at_end = g.offset == len(g.page) - g.band
+            frame = g.grab(box)
+            t0 = time.perf_counter()
+            added = st.add(frame)
+            times.append((time.perf_counter() - t0) * 1000)
+            if at_end and not added:
+                break
+        exact = bool(np.array_equal(st.result().bgra, g.expected()))
+        rows.append((step, len(times), st.lost, exact,
+                     float(np.percentile(times, 50)), float(np.percentile(times, 95))))
+    return rows
+
+# ----- Export benchmark -----
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process, in MiB."""
+    try:
+        import resource
+    except ImportError:  # Windows: peak working set from psapi
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("rest", ctypes.c_size_t * 7)]
+        c = Counters()
+        c.cb = ctypes.sizeof(c)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                 ctypes.byref(c), c.cb)
+        return c.PeakWorkingSetSize / (1 << 20)
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return kb / (1 << 20) if sys.platform == "darwin" else kb / (1 << 10)
+
+def export_corpus(folder: Path, shots: int, width: int = 1280, height: int = 720):
+    """`shots` distinct UI-like PNGs: one synthetic desktop, a different noise band in each."""
+    base = synthetic_desktop(width, height, 7)[..., 2::-1]
+    for i in range(shots):
+        fb = base.copy()
+        fb[height // 2:height // 2 + 24] = np.random.default_rng(i).integers(0, 256, (24, width, 3))
+        Image.fromarray(fb).save(folder / f"shot_{i:05d}.png", compress_level=1)
+
+def export_probe(folder: Path, backend: str, save_every: int = 20) -> dict:
+    """Child side: write every shot in `folder` with one backend ("docx" = python-docx
+    through DocxAppender, as DocBuilder does; "pdf"/"html" = the streaming exporters),
+    saving every `save_every` shots. Returns seconds, peak RSS and output size."""
+    import docx  # noqa: F401 - loaded for every backend, so the baselines compare
+    baseline = peak_rss_mb()
+    images = sorted(folder.glob("shot_*.png"))
+    session = Session(folder.parent, "Export benchmark", None, folder,
+                      folder / "bench.pptx", folder / "bench.docx")
+    slide_w, slide_h = 9144000, 6858000  # python-pptx's default 10 x 7.5 in
+    t0 = time.perf_counter()
+    if backend == "docx":
+        out, doc = session.docx_path, new_document(session)
+        appender = DocxAppender(out)
+        add, save = (lambda p, c, size, media: add_page(doc, c, media)), (lambda: appender.save(doc))
+    else:
+        ex = EXPORTERS[backend](session.pptx_path.with_suffix("." + backend))
+        ex.start(session.project_name, (slide_w, slide_h))
+        out, add, save = ex.path, ex.add, ex.save
+    for n, path in enumerate(images, 1):
+        data = path.read_bytes()
+        with Image.open(io.BytesIO(data)) as im:
+            size = im.size
+        display_in = display_inches(slide_w, slide_h, size)
+        media = resample_for_display(data, size, display_in, 150) if needs_resample(data, size, display_in, 150) else data
+        add(path, f"{path.stem} (monitor)", size, media)
+        if n % save_every == 0:
+            save()
+    save()
+    seconds = time.perf_counter() - t0
+    written = out.stat().st_size
+    if backend == "html":
+        written += sum(p.stat().st_size for p in ex.thumbs.iterdir())
+    return {"seconds": round(seconds, 2), "peak_rss_mb": round(peak_rss_mb(), 1),
+            "baseline_mb": round(baseline, 1), "out_mb": round(written / (1 << 20), 1)}
+
+def export_benchmark(shots: int = 1000, width: int = 1280, height: int = 720) -> dict:
+    """Time and peak RSS of writing `shots` synthetic captures as DOCX, PDF and HTML,
+    each backend in a fresh process."""
+    import subprocess, tempfile
+    cmd = [sys.executable, str(Path(__file__).resolve())]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp) / "shots"
+        folder.mkdir()
+        export_corpus(folder, shots, width, height)
+        for backend in ("docx", "pdf", "html"):
+            out = subprocess.run(cmd + ["export", "--probe", backend, "--folder", str(folder)],
+                                 capture_output=True, text=True)
+            if out.returncode != 0:
+                raise RuntimeError(out.stderr.strip() or f"probe exited with {out.returncode}")
+            results[backend] = json.loads(out.stdout.strip().splitlines()[-1])
+    return results
+
+# ----- Startup benchmark -----
+def startup_probe(folder: Path) -> dict:
+    """Child side: start the app on a throwaway session, return its milestones
+    (time.time()) once capture and documents are ready, then quit."""
+    folder.mkdir(parents=True, exist_ok=True)
+    session = Session(base_folder=folder.parent, project_name="Startup", template_path=None,
+                      project_dir=folder, pptx_path=folder / "Startup.pptx",
+                      docx_path=folder / "Startup.docx")
+    app = ClickShotApp(session)
+
+    def poll():
+        if "capture_ready" in app.startup and app.builder.ready.is_set():
+            app.startup.setdefault("docs_ready", time.time())
+            app._quit()
+        else:
+            app.root.after(5, poll)
+    app.root.after(5, poll)
+    app.root.after(30_000, app._quit)  # give up
+    app.run()
+    return app.startup
+
+def startup_benchmark(runs: int = 5) -> dict:
+    """Cold-start ClickShot `runs` times in fresh processes and report milliseconds
+    from process launch to first window, capture-ready and docs-ready (min/median)."""
+    import subprocess, tempfile, statistics
+    cmd = [sys.executable, str(Path(__file__).resolve())]
+    samples = {"window": [], "capture_ready": [], "docs_ready": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(runs):
+            t0 = time.time()
+            out = subprocess.run(cmd + ["startup", "--probe", str(Path(tmp) / f"run{i}")],
+                                 capture_output=True, text=True)
+            if out.returncode != 0:
+                raise RuntimeError(out.stderr.strip() or f"probe exited with {out.returncode}")
+            marks = json.loads(out.stdout.strip().splitlines()[-1])
+            for k in samples:
+                if k in marks:
+                    samples[k].append((marks[k] - t0) * 1000)
+    return {k: {"min_ms": round(min(v), 1), "median_ms": round(statistics.median(v), 1)}
+            for k, v in samples.items() if v}
+
+# ----- Benchmark suite (headless, JSON results, baseline comparison) -----
+SUITE_SIZES = {"1080p": (1920, 1080), "4k": (3840, 2160), "ultrawide": (3440, 1440),
+               "superwide": (7680, 2160)}
+PREVIEW_BUDGET_MS = 30  # p95 of the name-dialog preview, at any size: it delays the dialog
+SUITE_POINTS = (1, 10, 100, 1000)  # document sizes (shots) reported by the docs part
+
+def _timings(seconds: list, pixels: int) -> dict:
+    xs = sorted(seconds)
+    mean = sum(xs) / len(xs)
+    return {"ms_p50": round(xs[len(xs) // 2] * 1000, 2),
+            "ms_p95": round(xs[min(len(xs) - 1, int(len(xs) * 0.95))] * 1000, 2),
+            "per_s": round(1 / mean, 2), "mpix_s": round(pixels / mean / 1e6, 1)}
+
+def suite_capture_probe(folder: Path, width: int, height: int, repeat: int = 20,
+                        preset: str = "balanced") -> dict:
+    """Child side: the per-shot path on one synthetic frame, each stage timed
+    `repeat` times after a warm-up - grab (a fresh BGRA buffer, as from mss),
+    convert (BGRA -> RGB image), preview (as in the name dialog) and encode
+    (raw bytes -> PNG, as the encoder pool does for a saved shot)."""
+    capture = Capture(SyntheticGrabber(width, height, seed=1), FakePlatform([(0, 0, width, height)]))
+    box = {"left": 0, "top": 0, "width": width, "height": height}
+    frame = capture.grab(box)
+    out_png = str(folder / "shot.png")
+    stages = {
+        "grab": lambda: capture.grab(box),
+        "convert": frame.to_image,
+        "preview": lambda: make_preview(frame, 540, 320),
+        "encode": lambda: encode_image(frame.tobytes(), "RGB", frame.size, out_png, "png", preset, "BGRX"),
+    }
+    res = {}
+    for name, fn in stages.items():
+        fn()
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+        res[name] = _timings(times, width * height)
+    res["png_kib"] = round(os.path.getsize(out_png) / 1024, 1)
+    res["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return res
+
+def suite_docs_probe(folder: Path, width: int, height: int, shots: int = 1000,
+                     save_every: int = 10, embed_dpi: int = 150) -> dict:
+    """Child side: feed `shots` distinct captures through a DocBuilder, saving every
+    `save_every` shots, and report, at each of SUITE_POINTS, the mean prepare and
+    per-deck build times of the shots since the previous point, the time of each
+    deck's save that reached it, deck sizes and peak RSS. Timings come from the builder's own metrics spans; `wall_s`
+    also includes writing the PNGs, a save's worth at a time (removed once saved)."""
+    metrics_path = folder / "metrics.jsonl"
+    session = Session(folder.parent, "Benchmark", None, folder, folder / "bench.pptx", folder / "bench.docx")
+    metrics = Metrics(metrics_path)
+    builder = DocBuilder(session, save_quiet=3600, save_max_latency=3600, embed_dpi=embed_dpi, metrics=metrics)
+    builder.init_docs()
+    builder.ready.wait()
+    base = synthetic_desktop(width, height, 7)[..., 2::-1]
+    points = [n for n in SUITE_POINTS if n < shots] + [shots]
+    t0 = time.perf_counter()
+    saved_at, rows = [], []
+    n = 0
+    while n < shots:
+        # One save's worth: the PNGs are written before the adds so writing them
+        # does not compete with the builder for the GIL
+        stop = min([shots, (n // save_every + 1) * save_every] + [p for p in points if p > n])
+        chunk = []
+        for i in range(n + 1, stop + 1):
+            fb = base.copy()  # a distinct tile per shot, so no two images share a part
+            fb[64:128, 64:128] = np.random.default_rng(i).integers(0, 256, (64, 64, 3))
+            chunk.append(folder / f"shot_{i:05d}.png")
+            Image.fromarray(fb).save(chunk[-1], compress_level=1)
+        for i, path in enumerate(chunk, n + 1):
+            builder.add(path, f"shot {i} (monitor)", metrics.new_shot(time.perf_counter()),
+                        mode="monitor", size=(width, height))
+        builder.save(now=True)
+        while builder.backlog or builder.unsaved:
+            if builder.last_error:
+                raise RuntimeError(builder.last_error)
+            time.sleep(0.002)
+        n = stop
+        saved_at.append(n)
+        for path in chunk:
+            path.unlink()
+        if n in points:
+            rows.append({"shots": n, "pptx_mb": round(session.pptx_path.stat().st_size / (1 << 20), 1),
+                         "docx_mb": round(session.docx_path.stat().st_size / (1 << 20), 1),
+                         "peak_rss_mb": round(peak_rss_mb(), 1)})
+    wall = time.perf_counter() - t0
+    builder.close(wait=True)
+    metrics.close()
+    docs = ("prepare", "pptx", "docx")
+    spans = {d: {} for d in docs}  # stage -> shot -> ms
+    saves = {"pptx": [], "docx": []}
+    for line in metrics_path.read_text(encoding="utf-8").splitlines():
+        rec = json.loads(line)
+        if rec["stage"] == "prepare":
+            spans["prepare"][rec["shot"]] = rec["ms"]
+        elif rec["stage"] == "build" and rec.get("doc") in saves:
+            spans[rec["doc"]][rec["shot"]] = rec["ms"]
+        elif rec["stage"] == "save" and rec.get("doc") in saves and rec.get("shots"):
+            saves[rec["doc"]].append(rec["ms"])
+    save_ms = {d: dict(zip(saved_at, ms)) for d, ms in saves.items()}
+    prev = 0
+    for row in rows:
+        n = row["shots"]
+        for d in docs:  # mean per shot since the previous point
+            span = [spans[d][i] for i in range(prev + 1, n + 1) if i in spans[d]]
+            row[f"{d}_ms"] = round(sum(span) / max(1, len(span)), 2)
+        for d in saves:
+            row[f"{d}_save_ms"] = save_ms[d].get(n)
+        prev = n
+    # The decks are written in parallel: a shot costs its preparation plus the slower writer
+    busy = (sum(spans["prepare"].values()) + max(sum(spans[d].values()) + sum(saves[d]) for d in saves)) / 1000
+    return {"points": rows, "shots_per_s": round(shots / busy, 2) if busy else None,
+            "wall_s": round(wall, 1), "peak_rss_mb": round(peak_rss_mb(), 1)}
+
+def suite_benchmark(sizes=tuple(SUITE_SIZES), shots: int = 1000, repeat: int = 20,
+                    preset: str = "balanced", progress=None) -> dict:
+    """Run every part for every size, each in a fresh process (clean peak RSS, no
+    caches carried over). Returns a JSON-able dict: machine, parameters, results."""
+    import subprocess, tempfile, platform as pf
+    import PIL
+    cmd = [sys.executable, str(Path(__file__).resolve())]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label in sizes:
+            w, h = SUITE_SIZES[label]
+            results[label] = {}
+            for part in ("capture", "docs"):
+                if progress:
+                    progress(f"{label} {part}...")
+                folder = Path(tmp) / f"{label}_{part}"
+                folder.mkdir()
+                out = subprocess.run(cmd + ["suite", "--probe", part, "--size", f"{w}x{h}", "--folder", str(folder),
+                                            "--shots", str(shots), "--repeat", str(repeat), "--preset", preset],
+                                     capture_output=True, text=True)
+                if out.returncode != 0:
+                    raise RuntimeError(out.stderr.strip() or f"probe exited with {out.returncode}")
+                results[label][part] = json.loads(out.stdout.strip().splitlines()[-1])
+    return {"machine": {"python": pf.python_version(), "os": pf.platform(), "cpus": os.cpu_count(),
+                        "numpy": np.__version__, "pillow": PIL.__version__},
+            "params": {"shots": shots, "repeat": repeat, "preset": preset},
+            "results": results}
+
+def suite_flatten(report: dict) -> dict:
+    """{"4k/capture/encode/ms_p50": 81.2, "4k/docs/1000/save_ms": 35.0, ...}"""
+    flat = {}
+    def walk(prefix, node):
+        if isinstance(node, dict):
+            for k, v in node.items():
+                walk(f"{prefix}/{k}" if prefix else str(k), v)
+        elif isinstance(node, list):  # docs points, keyed by document size
+            for row in node:
+                walk(f"{prefix.rsplit('/', 1)[0]}/{row['shots']}",
+                     {k: v for k, v in row.items() if k != "shots"})
+        elif isinstance(node, (int, float)) and not isinstance(node, bool):
+            flat[prefix] = node
+    walk("", report["results"])
+    return flat
+
+def suite_compare(baseline: dict, current: dict, tolerance: float = 0.15) -> list:
+    """Rows of (metric, baseline, current, change, regressed) for metrics in both
+    reports. Throughput (per_s, mpix_s) should not drop, everything else (times,
+    sizes, memory) should not grow, by more than `tolerance`."""
+    base, cur = suite_flatten(baseline), suite_flatten(current)
+    rows = []
+    for key in base.keys() & cur.keys():
+        b, c = base[key], cur[key]
+        if not b:
+            continue
+        change = (c - b) / b
+        higher_better = key.endswith(("per_s", "mpix_s"))
+        rows.append((key, b, c, change, -change > tolerance if higher_better else change > tolerance))
+    return sorted(rows)
+
+# ----- Entrypoint -----
+def cli(argv) -> int:
+    ap = argparse.ArgumentParser(prog="bench.py", description=f"{APP_NAME} benchmarks.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    f = sub.add_parser("formats", help="size/time of each capture format on synthetic frames")
+    f.add_argument("--size", default="1920x1080", help="frame size, WxH")
+    f.add_argument("--preset", choices=tuple(PNG_ENCODE_PRESETS), default="balanced")
+    sc = sub.add_parser("scroll", help="scrolling-capture stitching speed/accuracy on a synthetic page")
+    sc.add_argument("--size", default="1200x800", help="grab box size, WxH")
+    sc.add_argument("--steps", default="7,45,120,300", help="rows scrolled per grab, comma separated")
+    e = sub.add_parser("export", help="time/peak memory of DOCX vs streamed PDF/HTML export")
+    e.add_argument("--shots", type=int, default=1000)
+    e.add_argument("--size", default="1280x720", help="capture size, WxH")
+    e.add_argument("--probe", choices=("docx", *EXPORTERS), help=argparse.SUPPRESS)  # child process mode
+    e.add_argument("--folder", type=Path, help=argparse.SUPPRESS)
+    u = sub.add_parser("suite", help="benchmark suite: capture path and document building per screen size (JSON)")
+    u.add_argument("--sizes", default=",".join(SUITE_SIZES), help="comma separated: " + ", ".join(SUITE_SIZES))
+    u.add_argument("--shots", type=int, default=1000, help="shots fed to the document builder")
+    u.add_argument("--repeat", type=int, default=20, help="timed runs per capture stage")
+    u.add_argument("--preset", choices=tuple(PNG_ENCODE_PRESETS), default="balanced")
+    u.add_argument("--out", type=Path, help="write the results as JSON (e.g. to keep as a baseline)")
+    u.add_argument("--baseline", type=Path, help="compare against an earlier --out file")
+    u.add_argument("--tolerance", type=float, default=0.15, help="relative change counted as a regression")
+    u.add_argument("--preview-budget", type=float, default=PREVIEW_BUDGET_MS,
+                   help="preview p95 in ms above which the suite fails")
+    u.add_argument("--probe", choices=("capture", "docs"), help=argparse.SUPPRESS)  # child process mode
+    u.add_argument("--size", help=argparse.SUPPRESS)
+    u.add_argument("--folder", type=Path, help=argparse.SUPPRESS)
+    s = sub.add_parser("startup", help="time-to-first-window / time-to-capture-ready (Windows)")
+    s.add_argument("--runs", type=int, default=5)
+    s.add_argument("--probe", type=Path, help=argparse.SUPPRESS)  # child process mode
+    args = ap.parse_args(argv)
+
+    if args.cmd == "formats":
+        w, h = (int(v) for v in args.size.lower().split("x"))
+        for name, frame in format_corpus(w, h).items():
+            t0 = time.perf_counter()
+            stats = analyze_frame(frame)
+            print(f"{name}: {stats}  analyze {(time.perf_counter() - t0) * 1000:.1f} ms")
+        print(f"{'frame':<16}{'format':<8}{'KiB':>9}{'ms':>9}")
+        for name, fmt, kib, ms, chosen in format_benchmark(w, h, args.preset):
+            print(f"{name:<16}{fmt:<8}{kib:9.0f}{ms:9.0f}{'  <- auto' if chosen else ''}")
+        return 0
+
+    if args.cmd == "scroll":
+        w, h = (int(v) for v in args.size.lower().split("x"))
+        print(f"{'step':>6}{'grabs':>7}{'lost':>6}  {'exact':<7}{'p50 ms':>8}{'p95 ms':>8}")
+        for step, grabs, lost, exact, p50, p95 in scroll_benchmark(
+                tuple(int(v) for v in args.steps.split(",")), w, h):
+            print(f"{step:6}{grabs:7}{lost:6}  {str(exact):<7}{p50:8.2f}{p95:8.2f}")
+        return 0
+
+    if args.cmd == "export":
+        if args.probe:
+            print(json.dumps(export_probe(args.folder, args.probe)))
+            return 0
+        w, h = (int(v) for v in args.size.lower().split("x"))
+        print(f"{'backend':<8}{'seconds':>9}{'peak MiB':>10}{'(imports)':>11}{'output MiB':>12}")
+        for backend, r in export_benchmark(args.shots, w, h).items():
+            print(f"{backend:<8}{r['seconds']:9.1f}{r['peak_rss_mb']:10.0f}{r['baseline_mb']:11.0f}{r['out_mb']:12.1f}")
+        return 0
+
+    if args.cmd == "suite":
+        if args.probe:
+            w, h = (int(v) for v in args.size.lower().split("x"))
+            if args.probe == "capture":
+                r = suite_capture_probe(args.folder, w, h, args.repeat, args.preset)
+            else:
+                r = suite_docs_probe(args.folder, w, h, args.shots)
+            print(json.dumps(r))
+            return 0
+        sizes = [v.strip() for v in args.sizes.split(",") if v.strip()]
+        unknown = [v for v in sizes if v not in SUITE_SIZES]
+        if unknown:
+            print(f"Unknown size(s): {', '.join(unknown)}", file=sys.stderr)
+            return 2
+        report = suite_benchmark(sizes, args.shots, args.repeat, args.preset,
+                                 progress=lambda m: print(m, file=sys.stderr))
+        for label, parts in report["results"].items():
+            cap, docs = parts["capture"], parts["docs"]
+            print(f"{label} {'x'.join(map(str, SUITE_SIZES[label]))}  capture peak {cap['peak_rss_mb']:.0f} MiB")
+            for stage in ("grab", "convert", "preview", "encode"):
+                t = cap[stage]
+                print(f"  {stage:<9}{t['ms_p50']:9.1f} ms p50{t['ms_p95']:9.1f} ms p95{t['per_s']:9.1f}/s{t['mpix_s']:9.1f} MP/s")
+            print(f"  docs: {docs['shots_per_s']} shots/s, peak {docs['peak_rss_mb']:.0f} MiB")
+            print(f"  {'shots':>6}{'prepare':>9}{'pptx':>8}{'docx':>8}{'save pptx':>11}{'docx':>8}"
+                  f"{'pptx':>8}{'docx':>8}{'peak':>7}")
+            print(f"  {'':>6}{'ms/shot':>25}{'ms':>19}{'MiB':>23}")
+            for row in docs["points"]:
+                print(f"  {row['shots']:>6}{row['prepare_ms']:9.1f}{row['pptx_ms']:8.1f}{row['docx_ms']:8.1f}"
+                      f"{row['pptx_save_ms']:11.1f}{row['docx_save_ms']:8.1f}"
+                      f"{row['pptx_mb']:8.1f}{row['docx_mb']:8.1f}{row['peak_rss_mb']:7.0f}")
+        if args.out:
+            args.out.write_text(json.dumps(report, indent=1), encoding="utf-8")
+            print(f"Results written to {args.out}")
+        slow = [(label, parts["capture"]["preview"]["ms_p95"]) for label, parts in report["results"].items()
+                if parts["capture"]["preview"]["ms_p95"] > args.preview_budget]
+        for label, ms in slow:
+            print(f"OVER BUDGET preview p95 {ms:.1f} ms at {label} (budget {args.preview_budget:g} ms)")
+        if args.baseline:
+            rows = suite_compare(json.loads(args.baseline.read_text(encoding="utf-8")), report, args.tolerance)
+            regressed = [r for r in rows if r[4]]
+            for key, b, c, change, bad in rows:
+                if bad or abs(change) > args.tolerance:
+                    print(f"{'REGRESSED' if bad else 'improved':<10}{key:<36}{b:>10}{c:>10}{change:+8.0%}")
+            print(f"{len(rows)} metrics compared, {len(regressed)} regressed (tolerance {args.tolerance:.0%})")
+            return 1 if regressed or slow else 0
+        return 1 if slow else 0
+
+    if args.cmd == "startup":
+        if args.probe:
+            print(json.dumps(startup_probe(args.probe)))
+            return 0
+        for stage, r in startup_benchmark(args.runs).items():
+            print(f"{stage:<14} min {r['min_ms']:7.1f} ms   median {r['median_ms']:7.1f} ms")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(cli(sys.argv[1:]))
@@ -1,53 +1,244 @@
 # ClickShot - Button-only, fast screenshots with instant naming + PPTX/DOCX
 # Windows 10/11 only. Run as Administrator recommended (for window picking precision).
 
-import os, sys, time, threading, ctypes, queue
+import os, sys, io, time, argparse, cProfile, threading, ctypes, queue, json, zipfile, zlib, hashlib, shutil
 from ctypes import wintypes
+from collections import OrderedDict, deque
 from dataclasses import dataclass
+from functools import cache
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
 
-import mss
-from PIL import Image, ImageTk
-import tkinter as tk
-from tkinter import filedialog, simpledialog, messagebox
-
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
-from pptx.dml.color import RGBColor
-
-from docx import Document
-from docx.shared import Inches as DocxInches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+import numpy as np
+from PIL import Image
+try:
+    import tkinter as tk
+    from tkinter import filedialog, simpledialog, messagebox
+except ImportError:  # headless use (python main.py build ...)
+    tk = None
 
-import win32api, win32gui, win32con
+# python-pptx / python-docx, mss, PIL.ImageTk and pywin32 are imported where they
+# are first used (DocBuilder worker, grabber, name dialog, platform backend), so
+# the first window is not held up by loading them.
 
 APP_NAME = "ClickShot"
 
-# ----- DPI awareness -----
-user32 = ctypes.windll.user32
-try:
-    user32.SetProcessDpiAwarenessContext(ctypes.c_void_p(-4))  # Per Monitor v2
-except Exception:
-    pass
-
-# DWM extended frame (accurate window bounds)
-dwmapi = ctypes.windll.dwmapi
-DWMWA_EXTENDED_FRAME_BOUNDS = 9
+# ----- Settings (clickshot_data/config.json) -----
+APP_DIR = Path(sys.executable).parent if getattr(sys, "frozen", False) else Path(__file__).resolve().parent
+DATA_DIR = APP_DIR / "clickshot_data"
+CONFIG_PATH = DATA_DIR / "config.json"
+TEMPLATE_CACHE_DIR = DATA_DIR / "template_cache"
+DEFAULT_CONFIG = {
+    "save_quiet_s": 1.5,          # write the decks once captures pause this long...
+    "save_max_latency_s": 10.0,   # ...or at the latest this long after the first unsaved shot
+    "embed_dpi": 150,             # resolution of pictures inside PPTX/DOCX (0 = full size)
+    "doc_writers": "threads",     # threads | processes (each document written by a process of its own)
+    "doc_max_queued": 8,          # shots waiting per document before captures are held back
+    "part_max_slides": 0,         # roll the decks over to <Project>_part2... after this many shots (0 = never)...
+    "part_max_mb": 0,             # ...or before their pictures pass this many MB (0 = no limit)
+    "preview_target_ms": 250,     # capture -> name dialog budget, reported when exceeded
+    "metrics": True,              # per-stage timings -> <project>/clickshot_metrics.jsonl
+    "profile_next_capture": False,  # cProfile the first capture, dump a .prof into the project
+    "png_encode": "balanced",     # fast | balanced | small (see PNG_ENCODE_PRESETS)
+    "capture_format": "auto",     # auto (by content) | png | png8 | webp | jpeg
+    "encode_max_pending": 4,      # captures allowed to wait for the PNG encoder
+    "hide_delay_ms": 120,         # wait after hiding the window before grabbing
+    "burst_fps": 5.0,             # burst capture rate...
+    "burst_seconds": 10.0,        # ...and length
+    "burst_buffer_mb": 512,       # frames waiting for the encoder; beyond this they are dropped
+    "burst_name": "burst_{start:%Y%m%d_%H%M%S}_{index:04d}",  # {start} datetime, {index}, {mode}
+    "scroll_fps": 12.0,           # scrolling capture grab rate
+    "scroll_idle_s": 2.0,         # ...ends this long after the page stops moving
+    "scroll_buffer_mb": 256,      # stitched image budget (rows beyond it are not captured)
+    "dedupe": "flag",             # near-duplicate of an earlier shot: off | flag | skip | collapse
+    "dedupe_distance": 4,         # max differing bits (of 64) to count as a near-duplicate
+    "region_capture": "frozen",   # frozen (select on a snapshot, crop it) | live (grab after selecting)
+    "all_monitors_area": "work",  # all-monitors capture: work (taskbars excluded) | monitor
+    "existing_decks": "ask",      # project already has a PPTX/DOCX: ask | append | new (replace)
+    "exports": [],                # extra reports next to the decks: "pdf", "html"
+}
+
+def load_config() -> dict:
+    cfg = dict(DEFAULT_CONFIG)
+    try:
+        cfg.update(json.loads(CONFIG_PATH.read_text(encoding="utf-8")))
+    except Exception:
+        pass
+    return cfg
 
+# ----- Platform backend (Win32/DWM, loaded on first use) -----
 class RECT(ctypes.Structure):
     _fields_ = [('left', wintypes.LONG), ('top', wintypes.LONG),
                 ('right', wintypes.LONG), ('bottom', wintypes.LONG)]
 
-def get_extended_frame_bounds(hwnd):
-    rect = RECT()
+def enable_dpi_awareness():
+    """Per-monitor v2 DPI awareness; must run before the first Tk window."""
     try:
-        dwmapi.DwmGetWindowAttribute(hwnd, DWMWA_EXTENDED_FRAME_BOUNDS,
-                                     ctypes.byref(rect), ctypes.sizeof(rect))
-        return (rect.left, rect.top, rect.right, rect.bottom)
+        ctypes.windll.user32.SetProcessDpiAwarenessContext(ctypes.c_void_p(-4))
     except Exception:
-        return win32gui.GetWindowRect(hwnd)
+        pass
+
+class Platform:
+    """Desktop geometry and window lookup used by the capture modes."""
+
+    def virtual_screen(self) -> tuple:
+        """(x, y, w, h) of the desktop spanning all monitors."""
+        raise NotImplementedError
+
+    def monitor_workarea_under_cursor(self) -> dict:
+        """Grab box of the monitor under the mouse, taskbar excluded."""
+        raise NotImplementedError
+
+    def monitors(self) -> list:
+        """One {"monitor": box, "work": box, "primary": bool} per display, primary first.
+        Boxes are in virtual-desktop coordinates and may be negative (left of/above the primary)."""
+        raise NotImplementedError
+
+    def window_at(self, x: int, y: int):
+        """Top-level window under a desktop point, or None for desktop/taskbar/ClickShot."""
+        raise NotImplementedError
+
+    def window_bounds(self, hwnd) -> tuple:
+        """(left, top, right, bottom) of a window, without its drop shadow."""
+        raise NotImplementedError
+
+class Win32Platform(Platform):
+    DWMWA_EXTENDED_FRAME_BOUNDS = 9
+
+    def __init__(self):
+        import win32api, win32gui, win32con
+        self.api, self.gui, self.con = win32api, win32gui, win32con
+        self.user32 = ctypes.windll.user32
+        self.dwmapi = ctypes.windll.dwmapi  # DWM extended frame (accurate window bounds)
+
+    def virtual_screen(self):
+        SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN = 76, 77
+        SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN = 78, 79
+        x = self.user32.GetSystemMetrics(SM_XVIRTUALSCREEN)
+        y = self.user32.GetSystemMetrics(SM_YVIRTUALSCREEN)
+        w = self.user32.GetSystemMetrics(SM_CXVIRTUALSCREEN)
+        h = self.user32.GetSystemMetrics(SM_CYVIRTUALSCREEN)
+        return x, y, w, h
+
+    def monitor_workarea_under_cursor(self):
+        x, y = self.api.GetCursorPos()
+        hmon = self.api.MonitorFromPoint((x, y), self.con.MONITOR_DEFAULTTONEAREST)
+        info = self.api.GetMonitorInfo(hmon)
+        l, t, r, b = info["Work"]  # excludes taskbar on that monitor
+        return {"left": l, "top": t, "width": r - l, "height": b - t}
+
+    def monitors(self):
+        out = []
+        for hmon, _dc, _rect in self.api.EnumDisplayMonitors(None, None):
+            info = self.api.GetMonitorInfo(hmon)
+            out.append({"monitor": rect_box(info["Monitor"]), "work": rect_box(info["Work"]),
+                        "primary": bool(info["Flags"] & 1)})  # MONITORINFOF_PRIMARY
+        return sorted(out, key=lambda m: not m["primary"])
+
+    def window_at(self, x, y):
+        hwnd = self.gui.WindowFromPoint((x, y))
+        if not hwnd:
+            return None
+        hwnd = self.gui.GetAncestor(hwnd, self.con.GA_ROOT)
+        # Filter out desktop/taskbar/our own windows
+        cname = self.gui.GetClassName(hwnd)
+        title = self.gui.GetWindowText(hwnd) or ""
+        if cname.lower() in ("shell_traywnd", "progman", "workerw"):
+            return None
+        if title.find(APP_NAME) != -1:
+            return None
+        return hwnd
+
+    def window_bounds(self, hwnd):
+        rect = RECT()
+        try:
+            self.dwmapi.DwmGetWindowAttribute(hwnd, self.DWMWA_EXTENDED_FRAME_BOUNDS,
+                                              ctypes.byref(rect), ctypes.sizeof(rect))
+            return (rect.left, rect.top, rect.right, rect.bottom)
+        except Exception:
+            return self.gui.GetWindowRect(hwnd)
+
+class FakePlatform(Platform):
+    """A scripted monitor layout and windows, for exercising capture geometry off Windows.
+
+    `monitors` is a list of (left, top, width, height) rects, primary first; the work
+    area of each is the rect minus `taskbar` pixels at the bottom. `windows` are
+    (left, top, right, bottom) rects, topmost first; a window's handle is its
+    1-based position. Pair it with a SyntheticGrabber covering `virtual_screen()`.
+    """
+
+    def __init__(self, monitors: list, taskbar: int = 40, cursor: tuple = (0, 0), windows: list = ()):
+        self._windows = [tuple(w) for w in windows]
+        self._monitors = []
+        for i, (l, t, w, h) in enumerate(monitors):
+            self._monitors.append({"monitor": {"left": l, "top": t, "width": w, "height": h},
+                                   "work": {"left": l, "top": t, "width": w, "height": h - taskbar},
+                                   "primary": i == 0})
+        self.cursor = cursor
+
+    def virtual_screen(self):
+        u = box_union([m["monitor"] for m in self._monitors])
+        return u["left"], u["top"], u["width"], u["height"]
+
+    def monitor_workarea_under_cursor(self):
+        return dict(monitor_at(self._monitors, *self.cursor)["work"])
+
+    def monitors(self):
+        return [dict(m) for m in self._monitors]
+
+    def window_at(self, x, y):
+        for hwnd, (l, t, r, b) in enumerate(self._windows, 1):
+            if l <= x < r and t <= y < b:
+                return hwnd
+        return None
+
+    def window_bounds(self, hwnd):
+        return self._windows[hwnd - 1]
+
+def rect_box(rect) -> dict:
+    """(left, top, right, bottom) -> grab box."""
+    l, t, r, b = rect
+    return {"left": l, "top": t, "width": r - l, "height": b - t}
+
+def box_union(boxes) -> dict:
+    """Smallest box containing all of `boxes`."""
+    l = min(b["left"] for b in boxes)
+    t = min(b["top"] for b in boxes)
+    r = max(b["left"] + b["width"] for b in boxes)
+    bt = max(b["top"] + b["height"] for b in boxes)
+    return {"left": l, "top": t, "width": r - l, "height": bt - t}
+
+def box_intersect(a: dict, b: dict) -> dict | None:
+    """Overlap of two boxes, or None if they do not touch."""
+    l, t = max(a["left"], b["left"]), max(a["top"], b["top"])
+    r = min(a["left"] + a["width"], b["left"] + b["width"])
+    bt = min(a["top"] + a["height"], b["top"] + b["height"])
+    if r <= l or bt <= t:
+        return None
+    return {"left": l, "top": t, "width": r - l, "height": bt - t}
+
+def monitor_at(monitors: list, x: int, y: int) -> dict:
+    """The monitor containing desktop point (x, y), else the nearest one (like MONITOR_DEFAULTTONEAREST)."""
+    def distance(m):
+        b = m["monitor"]
+        dx = max(b["left"] - x, 0, x - (b["left"] + b["width"] - 1))
+        dy = max(b["top"] - y, 0, y - (b["top"] + b["height"] - 1))
+        return dx * dx + dy * dy
+    return min(monitors, key=distance)
+
+_platform = None
+_platform_lock = threading.Lock()
+
+def get_platform() -> Platform:
+    """The backend for this OS, created (and its libraries imported) on first call."""
+    global _platform
+    with _platform_lock:
+        if _platform is None:
+            if os.name != "nt":
+                raise RuntimeError(f"{APP_NAME} capture requires Windows.")
+            _platform = Win32Platform()
+        return _platform
 
 # ----- Session -----
 @dataclass
@@ -59,168 +250,2686 @@ class Session:
     pptx_path: Path
     docx_path: Path
 
-# ----- Document Builder (background-safe) -----
-class DocBuilder:
-    def __init__(self, session: Session):
-        self.session = session
-        self.q = queue.Queue()
-        self.t = threading.Thread(target=self._worker, daemon=True)
-        self._running = True
-        self.t.start()
-
-    def init_docs(self): self.q.put(("init",))
-    def add(self, image_path: Path, caption: str): self.q.put(("add", image_path, caption))
-    def save(self): self.q.put(("save",))
+# ----- Document layout (shared by the live DocBuilder and the batch builder) -----
+DOCX_PICTURE_IN = 6.5  # picture width on a Word page
+EMU_PER_INCH = 914400  # python-pptx lengths are EMU
+
+def new_presentation(session: Session, out: "PackageAppender | None" = None, title: str | None = None,
+                     report=None):
+    """A new deck: the session's template (via TemplateCache) plus a title slide
+    (`title`, default the project name). Problems go to `report(text)`.
+
+    With `out`, the cached template is copied to `out.path` and opened for appending,
+    so none of its pictures or fonts are read and the first save only adds slides.
+    If the cache fails (say, its folder is read-only) the template is used as is.
+    """
+    from pptx import Presentation
+    try:
+        template = session.template_path
+        cached = None
+        if template and template.exists():
+            try:
+                cached = TemplateCache().get(template)
+            except Exception as e:
+                if report: report(f"Template cache unavailable ({e}); using {template.name} directly")
+        if cached and out:
+            shutil.copyfile(cached, out.path)
+            prs = out.open(Presentation)
+        elif cached:
+            prs = Presentation(str(cached))
+        elif template and template.exists():
+            prs = Presentation(str(template))
+        else:
+            prs = Presentation()
+        if len(prs.slides) == 0:
+            layout = prs.slide_layouts[0] if prs.slide_layouts else None
+            if layout:
+                slide = prs.slides.add_slide(layout)
+                if slide.shapes.title:
+                    slide.shapes.title.text = title or session.project_name
+                if len(slide.placeholders) > 1:
+                    try:
+                        slide.placeholders[1].text = f"Generated {datetime.now():%Y-%m-%d}"
+                    except Exception:
+                        pass
+    except Exception as e:
+        if report: report(f"Could not use the template ({e}); started a blank deck")
+        prs = Presentation()
+    return prs
+
+def new_document(session: Session, title: str | None = None):
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    try:
+        doc = Document()
+        h = doc.add_heading(title or session.project_name, 0)
+        h.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        p = doc.add_paragraph(f"Generated on {datetime.now():%Y-%m-%d %H:%M:%S}")
+        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        doc.add_page_break()
+    except Exception:
+        doc = Document()
+    return doc
+
+def fit_picture(slide_w: int, slide_h: int, size: tuple) -> tuple:
+    """(pic_w, pic_h) in EMU for an image of `size` pixels on a slide."""
+    w, h = size
+    ar = w / h
+    max_w = slide_w * 0.88
+    max_h = slide_h * 0.74
+    if max_w / ar <= max_h:
+        return max_w, max_w / ar
+    return max_h * ar, max_h
+
+def display_inches(slide_w: int, slide_h: int, size: tuple) -> float:
+    """Widest on-page width of a picture: one derivative serves both documents."""
+    return max(fit_picture(slide_w, slide_h, size)[0] / EMU_PER_INCH, DOCX_PICTURE_IN)
+
+def is_webp(data: bytes) -> bool:
+    return data[:4] == b"RIFF" and data[8:12] == b"WEBP"
+
+def needs_resample(data: bytes, size: tuple, display_in: float, dpi: int) -> bool:
+    """Whether the embedded copy must differ from the file: too large for `dpi`, or
+    WebP, which PowerPoint/Word pictures cannot hold."""
+    return is_webp(data) or bool(dpi and size[0] > int(display_in * dpi))
+
+def resample_for_display(data: bytes, size: tuple, display_in: float, dpi: int) -> bytes:
+    """`data` resampled to `dpi` at `display_in` wide, or `data` itself when it is
+    not larger than that (or dpi is 0) and can be embedded as is.
+
+    The copy keeps the source's kind: JPEG stays JPEG, a palette PNG is
+    re-quantized to a palette, anything else (RGB PNG, WebP) becomes PNG.
+    """
+    if not needs_resample(data, size, display_in, dpi):
+        return data
+    target_w = int(display_in * dpi) if dpi else 0
+    with Image.open(io.BytesIO(data)) as im:
+        kind, palette = im.format, im.mode == "P"
+        if im.mode not in ("RGB", "RGBA", "L"):
+            im = im.convert("RGB")
+        if target_w and size[0] > target_w:
+            target_h = max(1, round(size[1] * target_w / size[0]))
+            small = im.resize((target_w, target_h), Image.LANCZOS, reducing_gap=3.0)
+        else:
+            small = im.copy()
+    out = io.BytesIO()
+    if kind == "JPEG":
+        small.convert("RGB").save(out, "JPEG", quality=JPEG_QUALITY)
+    elif palette:
+        small.convert("RGB").quantize(256).save(out, "PNG", compress_level=6)
+    else:
+        small.save(out, "PNG", compress_level=6)
+    return out.getvalue()
+
+def content_layout_index(count: int) -> int:
+    """Layout shots are placed on: "Blank" (6) in the stock layout set, else the last one."""
+    return 6 if count > 6 else count - 1
+
+def add_slide(prs, caption: str, size: tuple, media: bytes):
+    """Add a captioned picture slide. A failure removes the half-built slide and raises."""
+    from pptx.util import Inches, Pt
+    from pptx.enum.text import PP_ALIGN
+    from pptx.dml.color import RGBColor
+    slide = prs.slides.add_slide(prs.slide_layouts[content_layout_index(len(prs.slide_layouts))])
+    try:
+        slide_w, slide_h = prs.slide_width, prs.slide_height
+        pic_w, pic_h = fit_picture(slide_w, slide_h, size)
+        left = (slide_w - pic_w) / 2
+        top  = (slide_h - pic_h) / 2 - Inches(0.6)
+        slide.shapes.add_picture(io.BytesIO(media), left, top, width=pic_w, height=pic_h)
+
+        tb = slide.shapes.add_textbox(left, top + pic_h + Inches(0.25), pic_w, Inches(0.8))
+        tf = tb.text_frame; tf.clear()
+        p = tf.paragraphs[0]; p.text = caption
+        p.alignment = PP_ALIGN.CENTER; p.font.size = Pt(20); p.font.bold = True
+        p.font.color.rgb = RGBColor(0, 110, 210)
+    except Exception:
+        sld_ids = prs.slides._sldIdLst  # the new slide is the last one
+        r_id = sld_ids[-1].rId
+        sld_ids.remove(sld_ids[-1])
+        prs.part.drop_rel(r_id)
+        raise
+
+def add_page(doc, caption: str, media: bytes):
+    """Add a page with a heading and picture. A failure removes what was added and raises."""
+    from docx.shared import Inches as DocxInches
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    added = []
+    try:
+        h1 = doc.add_heading(caption, level=1)
+        added.append(h1)
+        h1.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        par = doc.add_paragraph(); run = par.add_run()
+        added.append(par)
+        try:
+            run.add_picture(io.BytesIO(media), width=DocxInches(DOCX_PICTURE_IN))
+        except Exception:
+            run.add_picture(io.BytesIO(media), width=DocxInches(6.0))
+        par.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        added.append(doc.add_page_break())
+    except Exception:
+        for block in added:
+            block._p.getparent().remove(block._p)
+        raise
+
+# ----- Metrics (per-stage timings, JSONL) -----
+class _NullSpan:
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("metrics", "stage", "shot", "fields", "t0")
+
+    def __init__(self, metrics, stage, shot, fields):
+        self.metrics, self.stage, self.shot, self.fields = metrics, stage, shot, fields
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record(self.stage, time.perf_counter() - self.t0, self.shot, **self.fields)
+        return False
+
+class Metrics:
+    """Per-stage timings of the capture -> durable-save pipeline, one JSON line per event;
+    shots are numbered so their stages join up. Without a `path` it is a no-op."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self.enabled = path is not None
+        self._lock = threading.Lock()
+        self._fh = None
+        self._next_shot = 0
+        self._started: dict[int, float] = {}      # shot -> perf_counter start
+        self._durable = deque(maxlen=500)         # recent shot-to-durable seconds
+
+    def span(self, stage: str, shot: int | None = None, **fields):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage, shot, fields)
+
+    def record(self, stage: str, seconds: float | None = None, shot: int | None = None, **fields):
+        if not self.enabled:
+            return
+        rec = {"ts": round(time.time(), 3), "stage": stage}
+        if shot is not None: rec["shot"] = shot
+        if seconds is not None: rec["ms"] = round(seconds * 1000, 2)
+        rec.update(fields)
+        line = json.dumps(rec) + "\n"
+        with self._lock:
+            try:
+                if self._fh is None:
+                    self._fh = open(self.path, "a", encoding="utf-8", buffering=1)
+                self._fh.write(line)
+            except Exception:
+                self.enabled = False  # never let metrics break a capture
+
+    def new_shot(self, started: float) -> int | None:
+        """Register a shot whose machine time started at `started` (perf_counter)."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._next_shot += 1
+            self._started[self._next_shot] = started
+            return self._next_shot
+
+    def pause(self, shot: int | None, seconds: float):
+        """Leave time spent waiting on the user (name dialog) out of shot-to-durable."""
+        if shot in self._started:
+            self._started[shot] += seconds
+
+    def durable(self, shots):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        for shot in shots:
+            t0 = self._started.pop(shot, None)
+            if t0 is not None:
+                self._durable.append(now - t0)
+                self.record("durable", now - t0, shot)
+
+    def summary(self) -> str | None:
+        if not self._durable:
+            return None
+        xs = sorted(self._durable)
+        p50 = xs[len(xs) // 2]
+        p95 = xs[min(len(xs) - 1, int(len(xs) * 0.95))]
+        return f"shot→saved p50 {p50:.1f}s · p95 {p95:.1f}s"
+
     def close(self):
-        self._running = False
-        self.q.put(("close",))
+        with self._lock:
+            if self._fh:
+                self._fh.close()
+                self._fh = None
+
+# ----- Incremental package writer (append-only .pptx/.docx) -----
+class PackageAppender:
+    """Saves an OPC package (.pptx/.docx) by appending its new parts to the zip on disk;
+    only the index parts, kept at the tail, are rewritten. `open()` resumes a file."""
+
+    STORED_EXT = (".png", ".jpg", ".jpeg", ".gif", ".webp")  # already compressed
+    _sealed_classes: dict = {}  # library ImagePart class -> its sealed subclass (see _sealed)
+    OPAQUE_TYPES: dict = {}  # content type -> stand-in XML for parts left unparsed by open()
+
+    def __init__(self, path: Path, release_media: bool = False):
+        self.path = path
+        self.release_media = release_media  # drop image bytes from memory once written
+        self._released = False
+        self._written: dict[str, int] = {}  # membername -> id(part) of sealed parts
+        self._stamp = None                  # (size, mtime_ns) after our last save
+
+    # -- library adapters (python-pptx / python-docx differ in these internals) --
+    def _content_types(self, parts) -> bytes: raise NotImplementedError
+    def _pkg_rels_xml(self, package) -> bytes: raise NotImplementedError
+
+    def save(self, document):
+        main = document.part
+        package = main.package
+        parts = list(package.iter_parts())
+        index = {"[Content_Types].xml", "_rels/.rels",
+                 main.partname.membername, main.partname.rels_uri.membername}
+        by_name = {part.partname.membername: part for part in parts}
+
+        if self._can_append(by_name):
+            with zipfile.ZipFile(self.path, "a") as zf:
+                idx = [zi for zi in zf.filelist if zi.filename in index]
+                tail = min((zi.header_offset for zi in idx), default=zf.start_dir)
+                if all(zi.header_offset < tail for zi in zf.filelist if zi.filename not in index):
+                    zf.filelist = [zi for zi in zf.filelist if zi.filename not in index]
+                    for zi in idx:
+                        zf.NameToInfo.pop(zi.filename, None)
+                    zf.start_dir = tail
+                    for name, part in by_name.items():
+                        if name not in index and name not in self._written:
+                            self._write_part(zf, part)
+                    self._write_index(zf, package, parts, main)
+                    tail = None
+            if tail is None:
+                self._remember()
+                return
+        self._rewrite(package, parts, main, by_name, index)
+
+    def open(self, load):
+        """Open the package on disk for appending; `load` is Presentation / Document.
+
+        The library is handed a copy of the package in which every non-XML part
+        (pictures, fonts, embeddings) and every OPAQUE_TYPES part (existing slides)
+        is an empty stand-in. The real ones stay in the file and are sealed as
+        already written, so opening costs about the same for 5 slides or 500. A
+        file whose index parts are not at its tail (saved by Office) is reordered
+        once, streaming member by member, and so is one whose parts the library renames
+        as it loads them (slides after a deleted one).
+        """
+        from xml.etree import ElementTree
+        with zipfile.ZipFile(self.path) as src:
+            index = self._index_names(src)
+            tail = min(zi.header_offset for zi in src.filelist if zi.filename in index)
+            in_order = all(zi.header_offset < tail for zi in src.filelist if zi.filename not in index)
+        if not in_order:
+            self._reorder(index)
+
+        buf = io.BytesIO()
+        stubs = 0
+        with zipfile.ZipFile(self.path) as src, zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as stub:
+            types = {el.get("PartName", "").lstrip("/"): el.get("ContentType")
+                     for el in ElementTree.fromstring(src.read("[Content_Types].xml"))
+                     if el.tag.endswith("}Override")}
+            for zi in src.filelist:
+                name = zi.filename
+                if name.endswith((".xml", ".rels")) and types.get(name) not in self.OPAQUE_TYPES:
+                    stub.writestr(name, src.read(name))
+                else:
+                    stub.writestr(name, self.OPAQUE_TYPES.get(types.get(name), b""))
+                    stubs += 1
+        document = load(buf)
+
+        main = document.part
+        parts = [part for part in main.package.iter_parts() if part is not main]
+        names = {id(part): part.partname for part in parts}
+        self._settle(document)
+        moved = {id(part) for part in parts if part.partname != names[id(part)]}
+        if moved:  # renamed in memory: move them (and fix rels pointing at them) on disk too
+            moves = {}
+            for part in parts:
+                old, new = names[id(part)], part.partname
+                if any(not rel.is_external and id(rel.target_part) in moved for rel in part.rels.values()):
+                    moves[old.rels_uri.membername] = (new.rels_uri.membername, part.rels.xml)
+                elif id(part) in moved and len(part.rels):
+                    moves[old.rels_uri.membername] = (new.rels_uri.membername, None)
+                if id(part) in moved:
+                    moves[old.membername] = (new.membername, None)
+            self._reorder(index, moves, main)
+        self._written = {part.partname.membername: id(part) for part in parts}
+        self._released = stubs > 0  # a full rewrite could not reproduce the stand-ins
+        self._remember()
+        return document
+
+    @staticmethod
+    def _index_names(zf) -> set:
+        """Names of the index parts of an OPC zip (see the class docstring)."""
+        from xml.etree import ElementTree
+        rels = ElementTree.fromstring(zf.read("_rels/.rels"))
+        main = next(el.get("Target") for el in rels
+                    if el.get("Type", "").endswith("/officeDocument")).lstrip("/")
+        folder, _, leaf = main.rpartition("/")
+        main_rels = f"{folder}/_rels/{leaf}.rels" if folder else f"_rels/{leaf}.rels"
+        return {"[Content_Types].xml", "_rels/.rels", main, main_rels}
+
+    def _settle(self, document):
+        """Let the library make the changes it makes on first use of `document`."""
+
+    def _reorder(self, index: set, moves: dict | None = None, main=None):
+        """Rewrite the zip with its index parts last, one member at a time.
+
+        `moves` maps old member names to (new name, new bytes or None to keep them);
+        the index parts are then written from `main`, which knows the new names.
+        """
+        moves = moves or {}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with zipfile.ZipFile(self.path) as src, zipfile.ZipFile(tmp, "w") as dst:
+            for zi in sorted(src.filelist, key=lambda zi: zi.filename in index):
+                name, data = moves.get(zi.filename, (zi.filename, None))
+                if main is not None and name in index:
+                    continue
+                if data is not None:
+                    dst.writestr(name, data, compress_type=zipfile.ZIP_DEFLATED)
+                    continue
+                out = zipfile.ZipInfo(name, zi.date_time)
+                out.compress_type, out.external_attr = zi.compress_type, zi.external_attr
+                with src.open(zi) as r, dst.open(out, "w", force_zip64=zi.file_size > zipfile.ZIP64_LIMIT) as w:
+                    shutil.copyfileobj(r, w, 1 << 20)
+            if main is not None:
+                self._write_index(dst, main.package, list(main.package.iter_parts()), main)
+        os.replace(tmp, self.path)
+
+    def _can_append(self, by_name) -> bool:
+        """Whether the file is still the one this writer saved last; if not, save()
+        rewrites it whole (atomically)."""
+        if self._stamp is None or not self.path.exists():
+            return False
+        st = self.path.stat()
+        if (st.st_size, st.st_mtime_ns) != self._stamp:
+            return False  # changed behind our back
+        for name, pid in self._written.items():
+            part = by_name.get(name)
+            if part is None or id(part) != pid:
+                return False  # a sealed part was renamed or dropped
+        return True
+
+    def _rewrite(self, package, parts, main, by_name, index):
+        if self._released:
+            raise RuntimeError(f"{self.path.name} changed on disk, and some of its parts are no longer in memory")
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        self._written.clear()
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, part in by_name.items():
+                if name not in index:
+                    self._write_part(zf, part)
+            self._write_index(zf, package, parts, main)
+        os.replace(tmp, self.path)
+        self._remember()
+
+    def _write_part(self, zf, part):
+        name = part.partname.membername
+        method = zipfile.ZIP_STORED if name.lower().endswith(self.STORED_EXT) else zipfile.ZIP_DEFLATED
+        zf.writestr(name, part.blob, compress_type=method)
+        if len(part.rels):
+            zf.writestr(part.partname.rels_uri.membername, part.rels.xml,
+                        compress_type=zipfile.ZIP_DEFLATED)
+        self._written[name] = id(part)
+        if self.release_media and method == zipfile.ZIP_STORED:
+            self._release(part)
+            self._released = True
+
+    def _release(self, part):
+        """Drop a written picture's bytes."""
+        part._blob = b""
+
+    @staticmethod
+    def _sealed(part, base, **fixed):
+        """Turn image part `part` into a subclass of `base` whose properties named in
+        `fixed` answer the stored values: the library computes them from the bytes."""
+        cls = PackageAppender._sealed_classes.get(base)
+        if cls is None:
+            props = {k: property(lambda self, k=k: self._sealed_values[k]) for k in fixed}
+            cls = PackageAppender._sealed_classes[base] = type("Sealed" + base.__name__, (base,), props)
+        part._sealed_values = fixed
+        part.__class__ = cls
+
+    def _write_index(self, zf, package, parts, main):
+        # Re-serialized whole on every save (DOCX body text included): the part of a save that grows with the deck
+        deflate = zipfile.ZIP_DEFLATED
+        zf.writestr("[Content_Types].xml", self._content_types(parts), compress_type=deflate)
+        zf.writestr("_rels/.rels", self._pkg_rels_xml(package), compress_type=deflate)
+        zf.writestr(main.partname.membername, main.blob, compress_type=deflate)
+        if len(main.rels):
+            zf.writestr(main.partname.rels_uri.membername, main.rels.xml, compress_type=deflate)
+
+    def _remember(self):
+        st = self.path.stat()
+        self._stamp = (st.st_size, st.st_mtime_ns)
+
+_PML = b'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"'
+
+class PptxAppender(PackageAppender):
+    OPAQUE_TYPES = {
+        "application/vnd.openxmlformats-officedocument.presentationml.slide+xml":
+            b"<p:sld " + _PML + b"><p:cSld><p:spTree/></p:cSld></p:sld>",
+        "application/vnd.openxmlformats-officedocument.presentationml.notesSlide+xml":
+            b"<p:notes " + _PML + b"><p:cSld><p:spTree/></p:cSld></p:notes>",
+    }
+
+    def _content_types(self, parts):
+        from pptx.opc.oxml import serialize_part_xml
+        from pptx.opc.serialized import _ContentTypesItem
+        return serialize_part_xml(_ContentTypesItem.xml_for(parts))
+
+    def _pkg_rels_xml(self, package):
+        return package._rels.xml
+
+    def _settle(self, prs):
+        prs.slides  # renames the slide parts to slide1.xml, slide2.xml, ... in slide order
+
+    def _release(self, part):
+        from pptx.parts.image import ImagePart
+        if isinstance(part, ImagePart):  # a repeat of it is found by sha1 and sized by _native_size
+            self._sealed(part, ImagePart, sha1=part.sha1, _native_size=part._native_size)
+        super()._release(part)
+
+class DocxAppender(PackageAppender):
+    def _release(self, part):
+        from docx.parts.image import ImagePart
+        if isinstance(part, ImagePart):  # a repeat of it is found by sha1 and sized from .image
+            image = part.image
+            self._sealed(part, ImagePart, sha1=part.sha1)
+            image._blob = b""
+        super()._release(part)
+
+    def _content_types(self, parts):
+        from docx.opc.pkgwriter import _ContentTypesItem
+        for part in parts:
+            if part.partname.membername not in self._written:  # sealed parts are final already
+                part.before_marshal()
+        return _ContentTypesItem.from_parts(parts).blob
+
+    def _pkg_rels_xml(self, package):
+        return package.rels.xml
+
+# ----- Report exporters (PDF / HTML, streamed one page per shot) -----
+class ReportExporter:
+    """Writes one page per shot straight to the file; only offsets stay in memory.
+
+    `start()` begins a new file, `open()` continues one this exporter wrote before
+    (False if the file is missing or not ours). `add()` writes the shot's page right
+    away; `save()` appends the small tail that makes the file complete (and the next
+    `add()` cuts it off again), so an export's writer saves it like the decks.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fh = None
+        self._body_end = 0  # where the tail written by save() starts
+
+    def start(self, title: str, slide_size: tuple): raise NotImplementedError
+    def open(self, slide_size: tuple) -> bool: raise NotImplementedError
+    def add(self, image_path: Path, caption: str, size: tuple, media: bytes): raise NotImplementedError
+    def _tail(self) -> bytes: raise NotImplementedError
+
+    def _begin(self, head: bytes):
+        self.close()
+        self._fh = open(self.path, "w+b")
+        self._fh.write(head)
+        self._body_end = self._fh.tell()
+
+    def _resume(self, body_end: int):
+        self.close()
+        self._fh = open(self.path, "r+b")
+        self._body_end = body_end
+
+    def _write(self, data: bytes) -> int:
+        """Append `data` to the body; returns its offset."""
+        self._fh.seek(self._body_end)
+        self._fh.truncate()
+        self._fh.write(data)
+        offset, self._body_end = self._body_end, self._body_end + len(data)
+        return offset
+
+    def save(self):
+        self._fh.seek(self._body_end)
+        self._fh.truncate()
+        self._fh.write(self._tail())
+        self._fh.flush()
 
-    def _worker(self):
-        prs, doc = None, None
-        while self._running:
+    def close(self):
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+
+# Helvetica-Bold advance widths (1/1000 em) for ASCII 32..126, to centre captions
+_HELV_BOLD = [278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+              556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+              975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+              667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+              333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+              611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584]
+
+def _text_width(text: str, size: float) -> float:
+    return sum(_HELV_BOLD[ord(c) - 32] if 32 <= ord(c) <= 126 else 556 for c in text) * size / 1000
+
+def _wrap(text: str, width: float, size: float) -> list:
+    lines, line = [], ""
+    for word in text.split(" "):
+        candidate = f"{line} {word}" if line else word
+        if line and _text_width(candidate, size) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    return lines + [line]
+
+def _pdf_str(text: str) -> bytes:
+    raw = text.encode("cp1252", "replace")  # WinAnsiEncoding: Latin-1 plus curly quotes etc.
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+def pdf_image(media: bytes) -> tuple:
+    """(image XObject dictionary entries, stream data) for embedded picture bytes.
+
+    JPEG goes in as it is (DCTDecode); 8-bit-or-less grey/RGB/palette PNG passes its
+    zlib stream through with the PNG predictor, so neither is re-encoded. Anything
+    else (alpha, 16-bit, interlaced, WebP) is decoded to RGB and deflated.
+    """
+    im = Image.open(io.BytesIO(media))
+    w, h = im.size
+    if im.format == "JPEG" and im.mode in ("RGB", "L"):
+        cs = "/DeviceRGB" if im.mode == "RGB" else "/DeviceGray"
+        return f"/Width {w} /Height {h} /ColorSpace {cs} /BitsPerComponent 8 /Filter /DCTDecode", media
+    if im.format == "PNG":
+        pos, idat, plte, ihdr = 8, [], b"", None
+        while pos < len(media):
+            n = int.from_bytes(media[pos:pos + 4], "big")
+            kind, data = media[pos + 4:pos + 8], media[pos + 8:pos + 8 + n]
+            if kind == b"IHDR": ihdr = data
+            elif kind == b"PLTE": plte = data
+            elif kind == b"IDAT": idat.append(data)
+            elif kind == b"IEND": break
+            pos += n + 12
+        bits, color, interlace = ihdr[8], ihdr[9], ihdr[12]
+        colors = {0: 1, 2: 3, 3: 1}.get(color)
+        if colors and not interlace and (bits == 8 or (bits < 8 and color != 2)):
+            cs = {0: "/DeviceGray", 2: "/DeviceRGB"}.get(color) or \
+                 f"[/Indexed /DeviceRGB {len(plte) // 3 - 1} <{plte.hex()}>]"
+            return (f"/Width {w} /Height {h} /ColorSpace {cs} /BitsPerComponent {bits} /Filter /FlateDecode "
+                    f"/DecodeParms << /Predictor 15 /Colors {colors} /BitsPerComponent {bits} /Columns {w} >>",
+                    b"".join(idat))
+    data = zlib.compress(im.convert("RGB").tobytes(), 6)
+    return f"/Width {w} /Height {h} /ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode", data
+
+class PdfExporter(ReportExporter):
+    """<project>.pdf: a slide-sized page per shot, laid out like `add_slide()`.
+
+    Fixed objects 1-4 (catalog, page tree, font, info) lead the file, then three
+    objects per page (picture, content, page). The page tree, xref table and
+    trailer are the tail: `open()` finds everything it needs in them.
+    """
+
+    CAPTION_PT = 20
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._offsets = [0]  # object number -> byte offset (0 is the free-list head)
+        self._pages: list[int] = []
+        self._size = (0, 0)  # page size in points
+
+    def start(self, title, slide_size):
+        self._size = (slide_size[0] / 12700, slide_size[1] / 12700)  # EMU -> pt
+        self._begin(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._offsets, self._pages = [0], []
+        self._obj(b"<< /Type /Catalog /Pages 2 0 R >>")
+        self._offsets.append(0)  # 2: the page tree lives in the tail
+        self._obj(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+        self._obj(b"<< /Title " + _pdf_str(title) + b" /Producer (" + APP_NAME.encode() + b") >>")
+
+    def open(self, slide_size):
+        import re
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(max(0, f.seek(0, 2) - 64))
+                xref = int(re.search(rb"startxref\s+(\d+)\s+%%EOF\s*$", f.read()).group(1))
+                f.seek(xref)
+                head = f.readline() + f.readline()
+                count = int(re.match(rb"xref\s+0 (\d+)", head).group(1))
+                offsets = [int(f.read(20)[:10]) for _ in range(count)]
+                f.seek(offsets[2])
+                tree = f.read(xref - offsets[2])
+        except (OSError, AttributeError, ValueError):
+            return False
+        if offsets[2] != max(offsets) or not tree.startswith(b"2 0 obj"):
+            return False  # not a file written by this exporter
+        self._offsets = offsets
+        self._pages = [int(n) for n in re.findall(rb"(\d+) 0 R", tree)]
+        self._size = (slide_size[0] / 12700, slide_size[1] / 12700)
+        self._resume(offsets[2])
+        return True
+
+    def _obj(self, body: bytes, stream: bytes | None = None) -> int:
+        num = len(self._offsets)
+        data = b"%d 0 obj\n" % num + body
+        if stream is not None:
+            data += b"\nstream\n" + stream + b"\nendstream"
+        self._offsets.append(self._write(data + b"\nendobj\n"))
+        return num
+
+    def add(self, image_path, caption, size, media):
+        pw, ph = self._size
+        emu = 12700
+        pic_w, pic_h = (v / emu for v in fit_picture(pw * emu, ph * emu, size))
+        left = (pw - pic_w) / 2
+        top = (ph - pic_h) / 2 - 43.2  # 0.6 in above centre, as on the slide
+        entries, data = pdf_image(media)
+        img = self._obj(f"<< /Type /XObject /Subtype /Image {entries} /Length {len(data)} >>".encode(), data)
+
+        pt = self.CAPTION_PT
+        ops = [f"q {pic_w:.2f} 0 0 {pic_h:.2f} {left:.2f} {ph - top - pic_h:.2f} cm /Im0 Do Q".encode(),
+               b"BT /F1 %d Tf 0 0.431 0.824 rg" % pt]
+        y = ph - (top + pic_h + 18 + 3.6 + pt)  # 0.25 in gap + text box inset, first baseline
+        for line in _wrap(caption, pic_w - 14.4, pt):
+            x = left + (pic_w - _text_width(line, pt)) / 2
+            ops.append(f"1 0 0 1 {x:.2f} {y:.2f} Tm ".encode() + _pdf_str(line) + b" Tj")
+            y -= pt * 1.2
+        ops.append(b"ET")
+        content = b"\n".join(ops)
+        cnt = self._obj(b"<< /Length %d >>" % len(content), content)
+        self._pages.append(self._obj(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {pw:.2f} {ph:.2f}] "
+            f"/Resources << /XObject << /Im0 {img} 0 R >> /Font << /F1 3 0 R >> >> /Contents {cnt} 0 R >>".encode()))
+
+    def _tail(self):
+        kids = " ".join(f"{n} 0 R" for n in self._pages)
+        tree = f"2 0 obj\n<< /Type /Pages /Kids [{kids}] /Count {len(self._pages)} >>\nendobj\n".encode()
+        self._offsets[2] = self._body_end
+        xref = self._body_end + len(tree)
+        table = [b"xref\n0 %d\n" % len(self._offsets), b"0000000000 65535 f \n"]
+        table += [b"%010d 00000 n \n" % off for off in self._offsets[1:]]
+        trailer = b"trailer\n<< /Size %d /Root 1 0 R /Info 4 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(self._offsets), xref)
+        return tree + b"".join(table) + trailer
+
+class HtmlExporter(ReportExporter):
+    """<project>.html: a figure per shot, its thumbnail lazy-loaded and linked to
+    the full image. Thumbnails (JPEG, at most THUMB_PX wide: the width the page
+    shows them at) go to <project>_thumbs/."""
+
+    THUMB_PX = 960
+    FOOTER = b"</main>\n</body>\n</html>\n"
+    STYLE = ("body{margin:0;background:#0d1117;color:#f0f6fc;font:16px 'Segoe UI',sans-serif}"
+             "main{max-width:%dpx;margin:auto;padding:24px}h1{color:#58a6ff}"
+             "figure{margin:0 0 48px}img{width:100%%;height:auto;display:block;background:#161b22}"
+             "figcaption{text-align:center;font-weight:bold;font-size:20px;color:#3b8eea;margin-top:10px}")
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.thumbs = path.with_name(path.stem + "_thumbs")
+
+    def start(self, title, slide_size):
+        import html
+        t = html.escape(title)
+        self._begin((f"<!doctype html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+                     f"<meta name=\"viewport\" content=\"width=device-width\">\n<title>{t}</title>\n"
+                     f"<style>{self.STYLE % self.THUMB_PX}</style>\n</head>\n<body>\n<main>\n"
+                     f"<h1>{t}</h1>\n<p>Generated {datetime.now():%Y-%m-%d %H:%M}</p>\n").encode("utf-8"))
+
+    def open(self, slide_size):
+        try:
+            size = self.path.stat().st_size
+            with open(self.path, "rb") as f:
+                f.seek(max(0, size - len(self.FOOTER)))
+                if f.read() != self.FOOTER:
+                    return False
+        except OSError:
+            return False
+        self._resume(size - len(self.FOOTER))
+        return True
+
+    def add(self, image_path, caption, size, media):
+        import html
+        from urllib.parse import quote
+        self.thumbs.mkdir(exist_ok=True)
+        thumb = self.thumbs / f"{image_path.stem}_{image_path.suffix.lstrip('.')}.jpg"
+        with Image.open(image_path) as im:
+            tw = min(self.THUMB_PX, im.width)
+            th = max(1, round(im.height * tw / im.width))
+            im.draft("RGB", (tw, th))  # JPEG: decode at 1/2..1/8 scale straight away
+            if im.mode != "RGB":
+                im = im.convert("RGB")
+            if im.size != (tw, th):
+                im = im.resize((tw, th), Image.BILINEAR, reducing_gap=2.0)
+            im.save(thumb, "JPEG", quality=82)
+        c = html.escape(caption)
+        self._write((f"<figure id=\"{html.escape(image_path.stem)}\"><a href=\"{quote(image_path.name)}\">"
+                     f"<img src=\"{quote(self.thumbs.name)}/{quote(thumb.name)}\" width=\"{tw}\" height=\"{th}\" "
+                     f"loading=\"lazy\" decoding=\"async\" alt=\"{c}\"></a>"
+                     f"<figcaption>{c}</figcaption></figure>\n").encode("utf-8"))
+
+    def _tail(self):
+        return self.FOOTER
+
+EXPORTERS = {"pdf": PdfExporter, "html": HtmlExporter}
+
+# ----- PPTX template cache (clickshot_data/template_cache) -----
+class TemplateCache:
+    """Trimmed copies of PPTX templates (<key>.pptx plus <key>.json with the template's
+    size, mtime and SHA-1), so a session does not parse the template."""
+
+    _lock = threading.Lock()
+
+    def __init__(self, folder: Path = TEMPLATE_CACHE_DIR):
+        self.folder = folder
+
+    def get(self, template: Path) -> Path:
+        """Path of the processed copy of `template`, built on a miss. A touched template
+        costs one hash, a changed one a rebuild."""
+        template = template.resolve()
+        key = hashlib.sha1(str(template).lower().encode("utf-8")).hexdigest()[:16]
+        copy, meta_path = self.folder / f"{key}.pptx", self.folder / f"{key}.json"
+        st = template.stat()
+        with self._lock:
             try:
-                msg = self.q.get(timeout=1)
-            except queue.Empty:
-                continue
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                meta = None
+            if meta and copy.exists():
+                if [meta["size"], meta["mtime_ns"]] == [st.st_size, st.st_mtime_ns]:
+                    return copy
+                sha1 = file_sha1(template)
+                if meta["sha1"] == sha1:  # touched, not changed
+                    meta["size"], meta["mtime_ns"] = st.st_size, st.st_mtime_ns
+                    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+                    return copy
+            else:
+                sha1 = file_sha1(template)
+            self.folder.mkdir(parents=True, exist_ok=True)
+            meta = self._build(template, copy)
+            meta.update(source=str(template), size=st.st_size, mtime_ns=st.st_mtime_ns, sha1=sha1)
+            meta_path.write_text(json.dumps(meta), encoding="utf-8")
+            return copy
 
-            if msg[0] == "init":
-                # PowerPoint
-                try:
-                    if self.session.template_path and self.session.template_path.exists():
-                        prs = Presentation(str(self.session.template_path))
+    @staticmethod
+    def _build(template: Path, copy: Path) -> dict:
+        """Keep the title layout, the content layout and those the template's slides use,
+        with the content layout where content_layout_index() finds it in the smaller set."""
+        from pptx import Presentation
+        prs = Presentation(str(template))
+        layouts = prs.slide_layouts
+        total = len(layouts)
+        content = layouts[content_layout_index(total)]
+        keep = {layouts[0].part, content.part} | {slide.slide_layout.part for slide in prs.slides}
+        for layout in list(layouts):
+            if layout.part not in keep:
+                layouts.remove(layout)
+        ids = layouts._sldLayoutIdLst
+        entry = next(el for el in ids if prs.slide_master.part.related_part(el.rId) is content.part)
+        at = content_layout_index(len(layouts))
+        if at:
+            ids.remove(entry)
+            ids.insert(at, entry)
+        PptxAppender(copy).save(prs)
+        return {"layouts": [len(layouts), total], "content_layout": content_layout_index(len(layouts)),
+                "content_layout_name": content.name, "slides": len(prs.slides)}
+
+# ----- Session journal (crash recovery) -----
+def file_stamp(path: Path):
+    """(size, mtime_ns) of a file, or None if it does not exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+def file_sha1(path: Path) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+@dataclass
+class Recovery:
+    records: list           # every "add" of the interrupted session, oldest first
+    checkpoints: dict       # output kind -> last "saved" record, if its file still matches it
+    resumed: bool = False   # the session appended to decks that existed before it
+
+    def done(self, kind: str) -> int:
+        """Seq of the last add in output `kind` on disk (0: none, or start over)."""
+        return self.checkpoints[kind]["seq"] if kind in self.checkpoints else 0
+
+    def part(self, kind: str) -> int:
+        """Part of output `kind` its checkpoint is in (see part_path)."""
+        return self.checkpoints[kind].get("part", 1) if kind in self.checkpoints else 1
+
+    @property
+    def todo(self) -> list:
+        """Adds that at least one of the decks on disk is missing."""
+        done = min(self.done("pptx"), self.done("docx"))
+        return [r for r in self.records if r["seq"] > done]
+
+class SessionJournal:
+    """Append-only, fsync'd record of a session's shots and saves in <project>/clickshot_journal.jsonl;
+    without a "closed" record it marks a session that died (see `recover()`)."""
+
+    NAME = "clickshot_journal.jsonl"
+
+    def __init__(self, project_dir: Path):
+        self.path = project_dir / self.NAME
+        self._lock = threading.Lock()
+        self._fh = None
+        self._seq = 0
+
+    def begin(self, session: Session, recovered: Recovery | None = None, resume: bool = False):
+        """Start a fresh journal, carrying over the adds of a recovered session."""
+        with self._lock:
+            self._fh = open(self.path, "w", encoding="utf-8")
+            self._seq = 0
+        resume = resume or bool(recovered and recovered.resumed)
+        self._append({"op": "session", "project": session.project_name, "ts": round(time.time(), 3),
+                      "resume": resume})
+        if recovered:
+            for rec in recovered.records:
+                self._append(rec)
+            for rec in recovered.checkpoints.values():
+                self._append(rec)
+
+    def add(self, image_path: Path, caption: str, mode: str = "", sha1: str | None = None) -> int:
+        """Journal a shot; returns its sequence number once the record is on disk."""
+        sha1 = sha1 or file_sha1(image_path)
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        self._append({"op": "add", "seq": seq, "path": image_path.name, "caption": caption,
+                      "mode": mode, "ts": round(time.time(), 3), "sha1": sha1})
+        return seq
+
+    def saved(self, doc: str, seq: int, stamp, part: int = 1):
+        self._append({"op": "saved", "doc": doc, "seq": seq, "stamp": stamp, "part": part})
+
+    def close(self):
+        self._append({"op": "closed"})
+        with self._lock:
+            if self._fh:
+                self._fh.close()
+                self._fh = None
+
+    def _append(self, rec: dict):
+        line = json.dumps(rec) + "\n"
+        with self._lock:
+            if self._fh is None:
+                return
+            if rec.get("op") == "add":
+                self._seq = max(self._seq, rec["seq"])
+            self._fh.write(line)
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    @classmethod
+    def recover(cls, session: Session) -> Recovery | None:
+        """What to replay for an interrupted session in this project, or None."""
+        path = session.project_dir / cls.NAME
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return None
+        adds, checkpoints, resumed = [], {}, False
+        for line in lines:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                break  # torn last line: the crash hit mid-write
+            op = rec.get("op")
+            if op == "session":
+                resumed = bool(rec.get("resume"))
+            elif op == "add":
+                adds.append(rec)
+            elif op == "saved":
+                if "doc" in rec:
+                    checkpoints[rec["doc"]] = rec
+                else:  # one record for both decks (journals of older versions)
+                    for doc in ("pptx", "docx"):
+                        checkpoints[doc] = {"op": "saved", "doc": doc, "seq": rec["seq"], "stamp": rec[doc]}
+            elif op == "closed":
+                return None
+        if not adds:
+            return None
+        if not resumed:  # a file changed since its checkpoint is rebuilt from every add
+            checkpoints = {doc: rec for doc, rec in checkpoints.items()
+                           if rec["stamp"] == file_stamp(part_path(output_path(session, doc), rec.get("part", 1)))}
+        # (decks that predate the session cannot be rebuilt: replay onto them as they are)
+        return Recovery(adds, checkpoints, resumed)
+
+# ----- Project catalog (SQLite) -----
+class Catalog:
+    """Per-project SQLite index of shots in <project>/clickshot_catalog.sqlite: names,
+    sizes, formats and placement. One connection behind a lock, shared by all threads."""
+
+    NAME = "clickshot_catalog.sqlite"
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS shots (
+            name     TEXT PRIMARY KEY,   -- file name in the project folder
+            caption  TEXT,
+            mode     TEXT,
+            width    INTEGER,
+            height   INTEGER,
+            sha1     TEXT,
+            captured REAL,               -- time.time()
+            format   TEXT,               -- png | png8 | webp | jpeg (see choose_format)
+            slide    INTEGER,            -- 1-based, NULL when not in the current decks
+            page     INTEGER,
+            part     INTEGER,            -- which part of rolled-over decks (see part_path)
+            duplicate_of TEXT            -- earlier shot it was collapsed into; not in the documents
+        );
+        CREATE INDEX IF NOT EXISTS shots_captured ON shots(captured);
+        CREATE TABLE IF NOT EXISTS stems (stem TEXT PRIMARY KEY, next INTEGER NOT NULL);
+    """
+
+    def __init__(self, project_dir: Path):
+        import sqlite3
+        self.dir = project_dir
+        self.path = project_dir / self.NAME
+        new = not self.path.exists()
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(self.SCHEMA)
+        cols = {row[1] for row in self.db.execute("PRAGMA table_info(shots)")}
+        for col, kind in (("format", "TEXT"), ("part", "INTEGER"), ("duplicate_of", "TEXT")):  # older catalogs
+            if col not in cols:
+                self.db.execute(f"ALTER TABLE shots ADD COLUMN {col} {kind}")
+        if new:
+            self._seed()
+
+    @classmethod
+    def existing(cls, project_dir: Path) -> "Catalog | None":
+        return cls(project_dir) if (project_dir / cls.NAME).exists() else None
+
+    def _seed(self):
+        """A catalog new to this folder starts from one directory listing."""
+        rows = []
+        for p in self.dir.iterdir():
+            if p.suffix.lower() in IMAGE_EXT and p.is_file():
+                rows.append((p.name, p.stem, p.stat().st_mtime))
+        with self._lock, self.db:
+            self.db.executemany("INSERT OR IGNORE INTO shots(name, caption, captured) VALUES (?, ?, ?)", rows)
+
+    def reserve(self, stem: str, ext: str = ".png") -> str:
+        """Claim a free file name <stem><ext> / <stem>_<n><ext> and record it."""
+        with self._lock, self.db:
+            row = self.db.execute("SELECT next FROM stems WHERE stem = ?", (stem,)).fetchone()
+            i = row[0] if row else 0
+            while True:
+                name = f"{stem}{ext}" if i == 0 else f"{stem}_{i}{ext}"
+                taken = self.db.execute("SELECT 1 FROM shots WHERE name = ?", (name,)).fetchone()
+                if not taken and not (self.dir / name).exists():
+                    break
+                i += 1
+            self.db.execute("INSERT OR REPLACE INTO stems(stem, next) VALUES (?, ?)", (stem, i + 1))
+            self.db.execute("INSERT INTO shots(name, captured) VALUES (?, ?)", (name, time.time()))
+        return name
+
+    def update(self, name: str, **fields):
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        with self._lock, self.db:
+            self.db.execute(f"UPDATE shots SET {cols} WHERE name = ?", (*fields.values(), name))
+
+    def get(self, name: str) -> dict | None:
+        with self._lock:
+            cur = self.db.execute("SELECT * FROM shots WHERE name = ?", (name,))
+            row = cur.fetchone()
+            return dict(zip([c[0] for c in cur.description], row)) if row else None
+
+    def size(self, name: str) -> tuple | None:
+        with self._lock:
+            row = self.db.execute("SELECT width, height FROM shots WHERE name = ?", (name,)).fetchone()
+        return (row[0], row[1]) if row and row[0] and row[1] else None
+
+    def shots(self, order: str = "captured") -> list:
+        """All rows as dicts, by capture time (or name)."""
+        key = "captured, name" if order == "captured" else "name"
+        with self._lock:
+            cur = self.db.execute(f"SELECT * FROM shots ORDER BY {key}")
+            cols = [c[0] for c in cur.description]
+            return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+    def clear_placement(self):
+        """The documents are being started over: no shot has a slide/page yet."""
+        with self._lock, self.db:
+            self.db.execute("UPDATE shots SET slide = NULL, page = NULL, part = NULL")
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+# ----- Document Builder (one background writer per output) -----
+def output_path(session: Session, kind: str) -> Path:
+    """Where output `kind` ("pptx", "docx" or an EXPORTERS key) of a session lives."""
+    return {"pptx": session.pptx_path, "docx": session.docx_path}.get(kind) or session.pptx_path.with_suffix("." + kind)
+
+def part_path(path: Path, part: int) -> Path:
+    """Part `part` of a deck that rolled over: <Project>.pptx, <Project>_part2.pptx, ..."""
+    return path if part <= 1 else path.with_name(f"{path.stem}_part{part}{path.suffix}")
+
+def last_part(path: Path) -> int:
+    """Highest part of `path` in its folder (1 if it never rolled over)."""
+    prefix, suffix, last = f"{path.stem}_part".lower(), path.suffix.lower(), 1
+    try:
+        names = [p.name.lower() for p in path.parent.iterdir()]
+    except OSError:
+        return 1
+    for name in names:
+        n = name[len(prefix):len(name) - len(suffix)]
+        if name.startswith(prefix) and name.endswith(suffix) and n.isdigit():
+            last = max(last, int(n))
+    return last
+
+def remove_parts(path: Path, keep: int = 1):
+    """Delete the parts of `path` after part `keep` (left by an earlier, longer build)."""
+    for n in range(keep + 1, last_part(path) + 1):
+        part_path(path, n).unlink(missing_ok=True)
+
+def part_title(session: Session, part: int) -> str:
+    return session.project_name if part <= 1 else f"{session.project_name} (part {part})"
+
+def _media_bytes(path: Path, prefix: str) -> int:
+    """Size of the pictures in a package on disk (read from its central directory)."""
+    try:
+        with zipfile.ZipFile(path) as z:
+            return sum(i.file_size for i in z.infolist() if i.filename.startswith(prefix))
+    except (OSError, zipfile.BadZipFile):
+        return 0
+
+class PartLimit:
+    """When the decks roll over to their next part: once a part has `max_shots`
+    shots, or before its pictures would pass `max_bytes` (0: no limit). A part
+    always gets at least one shot. Both decks roll at the same shot because one
+    PartLimit decides for both."""
+
+    def __init__(self, max_shots: int = 0, max_bytes: int = 0):
+        self.max_shots, self.max_bytes = max_shots, max_bytes
+        self.part, self.shots, self.bytes = 1, 0, 0
+
+    def seed(self, part: int, shots: int, size: int):
+        """Continue a part that already holds `shots` shots and `size` bytes of pictures."""
+        self.part, self.shots, self.bytes = part, shots, size
+
+    def take(self, size: int) -> bool:
+        """Count one more shot of `size` bytes; True if it starts a new part."""
+        roll = self.shots > 0 and bool(self.max_shots and self.shots >= self.max_shots
+                                       or self.max_bytes and self.bytes + size > self.max_bytes)
+        if roll:
+            self.part, self.shots, self.bytes = self.part + 1, 0, 0
+        self.shots += 1
+        self.bytes += size
+        return roll
+
+def index_path(session: Session) -> Path:
+    return session.pptx_path.with_name(f"{session.pptx_path.stem}_index.html")
+
+def write_index(session: Session, rows: list):
+    """<Project>_index.html for decks that rolled over: each part, linked, with
+    the caption and slide/page number of every shot in it. `rows` are dicts with
+    caption, part, slide and page (catalog rows will do). Small, so it is simply
+    rewritten (temp file, then replace) whenever it changes."""
+    import html
+    from urllib.parse import quote
+    parts: dict[int, list] = {}
+    for r in rows:
+        if r.get("slide") or r.get("page"):
+            parts.setdefault(r.get("part") or 1, []).append(r)
+    t = html.escape(session.project_name)
+    out = [f"<!doctype html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n<title>{t} (index)</title>\n"
+           "<style>body{margin:0;background:#0d1117;color:#f0f6fc;font:16px 'Segoe UI',sans-serif}"
+           "main{max-width:960px;margin:auto;padding:24px}h1{color:#58a6ff}a{color:#3b8eea}"
+           "table{border-collapse:collapse;width:100%;margin-bottom:32px}"
+           "td,th{padding:4px 8px;border-bottom:1px solid #30363d;text-align:left}td.n{width:4em}</style>\n"
+           f"</head>\n<body>\n<main>\n<h1>{t}</h1>\n<p>{sum(map(len, parts.values()))} shots in "
+           f"{len(parts)} parts, indexed {datetime.now():%Y-%m-%d %H:%M}</p>\n"]
+    for n in sorted(parts):
+        links = " · ".join(f"<a href=\"{quote(p.name)}\">{html.escape(p.name)}</a>"
+                           for p in (part_path(session.pptx_path, n), part_path(session.docx_path, n)))
+        out.append(f"<h2>Part {n}</h2>\n<p>{links}</p>\n<table>\n<tr><th>Slide</th><th>Page</th><th>Caption</th></tr>\n")
+        for r in sorted(parts[n], key=lambda r: (r.get("slide") or r.get("page") or 0)):
+            out.append(f"<tr><td class=\"n\">{r.get('slide') or ''}</td><td class=\"n\">{r.get('page') or ''}</td>"
+                       f"<td>{html.escape(r.get('caption') or r.get('name') or '')}</td></tr>\n")
+        out.append("</table>\n")
+    out.append("</main>\n</body>\n</html>\n")
+    path = index_path(session)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text("".join(out), encoding="utf-8")
+    os.replace(tmp, path)
+
+class PptxDeck:
+    """One part of the session's presentation, with the start/open/add/save/close
+    shape of ReportExporter, so one writer loop drives every output."""
+
+    def __init__(self, session: Session, part: int = 1):
+        self.session, self.path = session, part_path(session.pptx_path, part)
+        self.out = PptxAppender(self.path)
+        self.prs = None
+        self.problems: list[str] = []  # from start(), reported by the writer
+
+    @property
+    def slide_size(self) -> tuple:
+        return int(self.prs.slide_width), int(self.prs.slide_height)
+
+    def start(self, title: str, slide_size: tuple | None = None):
+        self.prs = new_presentation(self.session, self.out, title, self.problems.append)
+
+    def open(self, slide_size: tuple | None = None) -> bool:
+        from pptx import Presentation
+        self.prs = self.out.open(Presentation)
+        return True
+
+    def filled(self) -> tuple:
+        """(shots, bytes of pictures) in the deck as opened."""
+        return max(0, len(self.prs.slides) - 1), _media_bytes(self.path, "ppt/media/")
+
+    def add(self, image_path: Path, caption: str, size: tuple, media: bytes) -> int:
+        add_slide(self.prs, caption, size, media)
+        return len(self.prs.slides)
+
+    def save(self): self.out.save(self.prs)
+    def close(self): pass
+
+class DocxDeck:
+    """One part of the session's Word document (see PptxDeck); `add()` returns
+    the page number."""
+
+    def __init__(self, session: Session, part: int = 1):
+        self.session, self.path = session, part_path(session.docx_path, part)
+        self.out = DocxAppender(self.path)
+        self.doc = None
+        self.pages = 0  # pages before the next shot, title page included
+
+    def start(self, title: str, slide_size: tuple | None = None):
+        self.doc, self.pages = new_document(self.session, title), 1
+
+    def open(self, slide_size: tuple | None = None) -> bool:
+        from docx import Document
+        self.doc = self.out.open(Document)
+        self.pages = len(self.doc.element.body.xpath('.//w:br[@w:type="page"]'))
+        return True
+
+    def filled(self) -> tuple:
+        return max(0, self.pages - 1), _media_bytes(self.path, "word/media/")
+
+    def add(self, image_path: Path, caption: str, size: tuple, media: bytes) -> int:
+        add_page(self.doc, caption, media)
+        self.pages += 1
+        return self.pages
+
+    def save(self): self.out.save(self.doc)
+    def close(self): pass
+
+DECKS = ("pptx", "docx")  # the outputs that roll over into parts; exports never do
+
+def make_output(kind: str, session: Session, part: int = 1):
+    if kind == "pptx":
+        return PptxDeck(session, part)
+    if kind == "docx":
+        return DocxDeck(session, part)
+    return EXPORTERS[kind](output_path(session, kind))
+
+# Writer protocol: plain tuples tagged with these, so they cross a process boundary.
+# Inbox (builder -> writer):
+OP_INIT = "init"    # (OP_INIT, mode "new"/"open", slide_size, part)
+OP_ADD = "add"      # (OP_ADD, seq, shot, image_path, caption, size, media)
+OP_ROLL = "roll"    # (OP_ROLL, part): seal the current part, start that one
+OP_SAVE = "save"    # (OP_SAVE, now)
+OP_CLOSE = "close"  # (OP_CLOSE,)
+# Events (writer -> builder), the writer's kind always second:
+EV_READY = "ready"    # (EV_READY, kind, fresh, slide_size, part, filled, seconds, problem)
+EV_BUILT = "built"    # (EV_BUILT, kind, seq, shot, name, part, position, seconds)
+EV_SAVED = "saved"    # (EV_SAVED, kind, seq, part, stamp, shots, built, seconds)
+EV_ROLLED = "rolled"  # (EV_ROLLED, kind, part, seconds)
+EV_ERROR = "error"    # (EV_ERROR, kind, text)
+EV_CLOSED = "closed"  # (EV_CLOSED, kind, clean), always the last one
+
+def run_doc_writer(kind: str, session: Session, inbox, events, save_quiet: float, save_max_latency: float):
+    """Worker for one output (a thread, or a process of its own): applies the OP_*
+    messages from `inbox`, reports EV_* events on `events`. Saves are coalesced:
+    one hits the disk once requests have been quiet for `save_quiet` seconds or
+    the oldest is `save_max_latency` seconds old (or it is forced, or on close)."""
+    target, dirty, sealed = None, False, True
+    try:
+        part, slide_size = 1, None
+        unsaved = []  # metric shot ids added since the last save
+        built = 0     # adds applied to the document
+        applied = 0   # journal seq of the last add applied
+        first_req = last_req = None  # monotonic times of the pending save window
+        closing = False
+        while not closing:
+            timeout = 1.0
+            if first_req is not None:
+                due = min(last_req + save_quiet, first_req + save_max_latency)
+                timeout = max(0.0, due - time.monotonic())
+            try:
+                batch = [inbox.get(timeout=timeout)]
+            except queue.Empty:
+                batch = []
+            force = False
+            for msg in batch:
+                if msg[0] == OP_INIT:
+                    _, mode, slide_size, part = msg
+                    t0 = time.perf_counter()
+                    target = make_output(kind, session, part)
+                    problem = None
+                    if mode == "open" and target.path.exists():
+                        try:
+                            opened = target.open(slide_size)
+                        except Exception as e:
+                            opened = False
+                            problem = f"Could not open {target.path.name} ({e}); kept as .bak, started a new one"
+                        if not opened:  # unreadable, or not one of ours: keep it, start over
+                            os.replace(target.path, target.path.with_name(target.path.name + ".bak"))
                     else:
-                        prs = Presentation()
-                    if len(prs.slides) == 0:
-                        layout = prs.slide_layouts[0] if prs.slide_layouts else None
-                        if layout:
-                            slide = prs.slides.add_slide(layout)
-                            if slide.shapes.title:
-                                slide.shapes.title.text = self.session.project_name
-                            if len(slide.placeholders) > 1:
-                                try:
-                                    slide.placeholders[1].text = f"Generated {datetime.now():%Y-%m-%d}"
-                                except Exception:
-                                    pass
-                except Exception:
-                    prs = Presentation()
-
-                # Word
+                        opened = False
+                        if mode == "new" and kind in DECKS:
+                            remove_parts(target.path)  # parts of the documents this replaces
+                    if not opened:
+                        target.start(part_title(session, part), slide_size)
+                        problem = problem or "; ".join(getattr(target, "problems", ())) or None
+                        dirty = True
+                    filled = target.filled() if opened and kind in DECKS else (0, 0)
+                    size = target.slide_size if kind == "pptx" else None
+                    events.put((EV_READY, kind, not opened, size, part, filled, time.perf_counter() - t0, problem))
+                elif msg[0] == OP_ADD:
+                    _, seq, shot, image_path, caption, size, media = msg
+                    t0 = time.perf_counter()
+                    try:
+                        position = target.add(image_path, caption, size, media)
+                    except Exception as e:
+                        events.put((EV_ERROR, kind, f"{target.path.name}: adding {image_path.name} failed: {e}"))
+                        position = None
+                    else:
+                        dirty = True
+                        if shot is not None: unsaved.append(shot)
+                    if seq is not None: applied = seq
+                    built += 1
+                    events.put((EV_BUILT, kind, seq, shot, image_path.name, part, position,
+                                time.perf_counter() - t0))
+                elif msg[0] == OP_ROLL:
+                    if kind not in DECKS or msg[1] <= part:
+                        continue
+                    t0 = time.perf_counter()
+                    if dirty:
+                        try:
+                            target.save()
+                        except Exception as e:  # its last shots are only in the journal now
+                            events.put((EV_ERROR, kind, f"Sealing {target.path.name} failed: {e}"))
+                            sealed = False
+                        else:
+                            events.put((EV_SAVED, kind, applied, part, file_stamp(target.path), unsaved, built,
+                                        time.perf_counter() - t0))
+                            unsaved = []
+                    target.close()
+                    part = msg[1]
+                    target = make_output(kind, session, part)
+                    target.start(part_title(session, part), slide_size)
+                    for text in getattr(target, "problems", ()):
+                        events.put((EV_ERROR, kind, text))
+                    dirty = True
+                    events.put((EV_ROLLED, kind, part, time.perf_counter() - t0))
+                elif msg[0] == OP_SAVE:
+                    now = time.monotonic()
+                    if first_req is None: first_req = now
+                    last_req = now
+                    force = force or msg[1]
+                elif msg[0] == OP_CLOSE:
+                    closing = True
+
+            due = first_req is not None and (force or time.monotonic() - last_req >= save_quiet
+                                             or time.monotonic() - first_req >= save_max_latency)
+            if dirty and (due or closing):
+                t0 = time.perf_counter()
                 try:
-                    doc = Document()
-                    h = doc.add_heading(self.session.project_name, 0)
-                    h.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    p = doc.add_paragraph(f"Generated on {datetime.now():%Y-%m-%d %H:%M:%S}")
-                    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    doc.add_page_break()
-                except Exception:
-                    doc = Document()
-
-            elif msg[0] == "add" and prs and doc:
-                _, image_path, caption = msg
-                if not image_path.exists():
-                    continue
+                    target.save()
+                except Exception as e:
+                    events.put((EV_ERROR, kind, f"Saving {target.path.name} failed: {e}"))
+                else:
+                    events.put((EV_SAVED, kind, applied, part, file_stamp(target.path), unsaved, built,
+                                time.perf_counter() - t0))
+                    unsaved, dirty = [], False
+            if due or not dirty:
+                first_req = last_req = None
+    except Exception as e:
+        events.put((EV_ERROR, kind, f"{kind.upper()} writer stopped: {e}"))
+        dirty = True
+    finally:
+        if target is not None:
+            try:
+                target.close()
+            except Exception as e:
+                events.put((EV_ERROR, kind, f"Closing {target.path.name} failed: {e}"))
+        events.put((EV_CLOSED, kind, sealed and not dirty))
+
+class DocWriter:
+    """Handle on one output's worker: a bounded inbox (back-pressure: `put()`
+    blocks while it is full) and the counters the builder keeps from its events."""
+
+    def __init__(self, kind: str, session: Session, events, save_quiet: float, save_max_latency: float,
+                 max_queued: int, context=None):
+        self.kind = kind
+        self.path = output_path(session, kind)
+        self.inbox = queue.Queue(max_queued) if context is None else context.Queue(max_queued)
+        args = (kind, session, self.inbox, events, save_quiet, save_max_latency)
+        if context is None:
+            self.worker = threading.Thread(target=run_doc_writer, args=args, daemon=True, name=f"{kind}-writer")
+        else:
+            self.worker = context.Process(target=run_doc_writer, args=args, daemon=True,
+                                          name=f"{APP_NAME}-{kind}-writer")
+        self.sent = self.built = self.saved = 0  # adds handed over / in the document / on disk
+        self.ready = threading.Event()
+        self.fresh = True      # started a new file (nothing of it is on disk yet)
+        self.part = 1          # the part being written (see part_path)
+        self.filled = (0, 0)   # (shots, picture bytes) that part had when opened
+        self.closed = self.clean = False
+        self.worker.start()
+
+    @property
+    def label(self) -> str:
+        return self.kind.upper()
+
+    @property
+    def file(self) -> Path:
+        return part_path(self.path, self.part)
+
+    @property
+    def behind(self) -> int:
+        """Adds handed to this writer that are not in its document yet."""
+        return self.sent - self.built
+
+    def put(self, msg):
+        while True:
+            try:
+                self.inbox.put(msg, timeout=0.5)
+                break
+            except queue.Full:
+                if not self.worker.is_alive():
+                    raise RuntimeError(f"{self.label} writer stopped")
+        if msg[0] == OP_ADD:
+            self.sent += 1
 
-                # PPT slide
+class DocBuilder:
+    """Builds the PPTX, the DOCX and any `exports` ("pdf", "html") with one
+    DocWriter each, so the slower output never holds up the faster one.
+
+    A dispatch thread reads and resamples each shot once and hands it to every
+    writer; a collector thread turns their events into metrics, catalog placement
+    and journal checkpoints. The queues are bounded, so `add()` blocks while the
+    writers are behind (`stalled_since`). `close()` flushes, `done` says when it has.
+    """
+
+    def __init__(self, session: Session, save_quiet: float = 1.5, save_max_latency: float = 10.0,
+                 embed_dpi: int = 150, metrics: Metrics | None = None,
+                 journal: SessionJournal | None = None, catalog: Catalog | None = None,
+                 exports: tuple = (), max_queued: int = 8, processes: bool = False,
+                 part_max_slides: int = 0, part_max_mb: float = 0):
+        self.session = session
+        self.metrics = metrics or Metrics()
+        self.journal = journal
+        self.catalog = catalog  # gets each shot's SHA-1 and slide/page number
+        self.embed_dpi = embed_dpi  # 0 embeds the full-resolution PNG
+        self._media = OrderedDict()  # sha1 of source PNG -> resampled bytes (small LRU)
+        self.q = queue.Queue(max_queued * 2)  # ("init", ...), ("add", ...), OP_SAVE, OP_CLOSE for the dispatcher
+        self.last_saved: float | None = None  # time.time() of the last durable save
+        self.last_error: str | None = None
+        self.recovered = 0  # shots replayed from the journal on "init"
+        self.stalled = 0    # add() calls that had to wait for the queue
+        self.stalled_since: float | None = None  # monotonic start of the wait in progress
+        self._queued = self._dispatched = 0
+        self._durable_left: dict[int, int] = {}  # metric shot id -> writers yet to save it
+        self._slide_size = None
+        self._parts = PartLimit(part_max_slides, int(part_max_mb * (1 << 20)))  # dispatcher only
+        self.ready = threading.Event()  # set once every output is open or started
+        context = None
+        if processes:
+            import multiprocessing
+            context = multiprocessing.get_context("spawn")
+        self._events = context.Queue() if context else queue.Queue()
+        kinds = ["pptx", "docx"] + [k for k in dict.fromkeys(exports) if k in EXPORTERS]
+        self.writers = {k: DocWriter(k, session, self._events, save_quiet, save_max_latency, max_queued, context)
+                        for k in kinds}
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._dispatcher.start()
+        self._collector.start()
+
+    def init_docs(self, recovery: Recovery | None = None, resume: bool = False):
+        """Start new documents, append to the existing ones (`resume`) or replay
+        what each output is missing from a crashed session's journal (`recovery`)."""
+        if self.journal:
+            self.journal.begin(self.session, recovery, resume)
+        self.q.put(("init", recovery, resume))
+
+    def _running(self):
+        return [w for w in self.writers.values() if not w.closed]
+
+    @property
+    def backlog(self) -> int:
+        """Adds not in every document yet."""
+        return self._queued - self._dispatched + max((w.behind for w in self._running()), default=0)
+
+    @property
+    def unsaved(self) -> int:
+        """Adds in a document but not on disk yet (slowest writer)."""
+        return max((w.built - w.saved for w in self._running()), default=0)
+
+    @property
+    def slowest(self) -> DocWriter | None:
+        """The writer furthest behind, if any is."""
+        w = max(self._running(), key=lambda w: w.behind + w.built - w.saved, default=None)
+        return w if w and w.behind + w.built - w.saved else None
+
+    @property
+    def done(self) -> bool:
+        """Closed and every writer has finished (after `close()`)."""
+        return not self._dispatcher.is_alive() and not self._collector.is_alive()
+
+    def add(self, image_path: Path, caption: str, shot: int | None = None, mode: str = "",
+            size: tuple | None = None):
+        """Queue a shot. `size` (pixels), when known, spares reopening the image.
+        Blocks while the queue is full."""
+        seq = None
+        if self.journal or self.catalog:
+            try:
+                sha1 = file_sha1(image_path)
+                if self.catalog:
+                    self.catalog.update(image_path.name, sha1=sha1)
+                if self.journal:
+                    seq = self.journal.add(image_path, caption, mode, sha1)
+            except Exception as e:
+                self.last_error = f"Journal write failed: {e}"
+        self._queued += 1
+        self._put(("add", image_path, caption, shot, seq, size))
+
+    def save(self, now: bool = False): self._put((OP_SAVE, now))
+
+    def close(self, wait: bool = False, timeout: float | None = None):
+        self._put((OP_CLOSE,))
+        if wait:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            self._dispatcher.join(timeout)
+            self._collector.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def _put(self, msg):
+        try:
+            self.q.put_nowait(msg)
+            return
+        except queue.Full:
+            pass
+        t0 = time.monotonic()
+        self.stalled += 1
+        self.stalled_since = t0
+        try:
+            self.q.put(msg)
+        finally:
+            self.stalled_since = None
+            self.metrics.record("stall", time.monotonic() - t0, slowest=getattr(self.slowest, "kind", None))
+
+    # -- dispatch thread --
+    def _dispatch(self):
+        closing = False
+        while not closing:
+            batch = [self.q.get()]
+            while True:  # drain what is already queued, to report the depth
+                try: batch.append(self.q.get_nowait())
+                except queue.Empty: break
+            self.metrics.record("queue", depth=len(batch))
+            for msg in batch:
                 try:
-                    slide = prs.slides.add_slide(prs.slide_layouts[6] if len(prs.slide_layouts) > 6 else prs.slide_layouts[-1])
-                    slide_w, slide_h = prs.slide_width, prs.slide_height
-                    with Image.open(image_path) as im:
-                        w, h = im.size
-                        ar = w / h
-                    max_w = slide_w * 0.88
-                    max_h = slide_h * 0.74
-                    if max_w / ar <= max_h:
-                        pic_w, pic_h = max_w, max_w / ar
-                    else:
-                        pic_h, pic_w = max_h, max_h * ar
-                    left = (slide_w - pic_w) / 2
-                    top  = (slide_h - pic_h) / 2 - Inches(0.6)
-                    slide.shapes.add_picture(str(image_path), left, top, width=pic_w, height=pic_h)
-
-                    tb = slide.shapes.add_textbox(left, top + pic_h + Inches(0.25), pic_w, Inches(0.8))
-                    tf = tb.text_frame; tf.clear()
-                    p = tf.paragraphs[0]; p.text = caption
-                    p.alignment = PP_ALIGN.CENTER; p.font.size = Pt(20); p.font.bold = True
-                    p.font.color.rgb = RGBColor(0, 110, 210)
-                except Exception:
-                    pass
-
-                # Word page
+                    if msg[0] == "init":
+                        self._init(*msg[1:])
+                    elif msg[0] == "add":
+                        _, image_path, caption, shot, seq, size = msg
+                        try:
+                            if image_path.exists():
+                                self._send(self.writers.values(), seq, shot, image_path, caption, size)
+                        finally:
+                            self._dispatched += 1  # only now: backlog must not dip to 0 in between
+                    elif msg[0] == OP_SAVE:
+                        self._broadcast(msg)
+                    elif msg[0] == OP_CLOSE:
+                        closing = True
+                        self._broadcast(msg)
+                except Exception as e:
+                    self.last_error = str(e)
+
+    def _broadcast(self, msg, kinds=None):
+        for w in self.writers.values():
+            if not w.closed and (kinds is None or w.kind in kinds):
                 try:
-                    h1 = doc.add_heading(caption, level=1)
-                    h1.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    par = doc.add_paragraph(); run = par.add_run()
-                    try:
-                        run.add_picture(str(image_path), width=DocxInches(6.5))
-                    except Exception:
-                        run.add_picture(str(image_path), width=DocxInches(6.0))
-                    par.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    doc.add_page_break()
-                except Exception:
-                    pass
+                    w.put(msg)
+                except RuntimeError as e:
+                    self.last_error = str(e)
 
-            elif msg[0] == "save":
-                try:
-                    if prs: prs.save(str(self.session.pptx_path))
-                    if doc: doc.save(str(self.session.docx_path))
-                except Exception:
-                    pass
+    def _send(self, writers, seq, shot, image_path: Path, caption: str, size: tuple | None) -> bool:
+        """Read and resample a shot once, then hand it to `writers`."""
+        try:
+            with self.metrics.span("prepare", shot):
+                data = image_path.read_bytes()
+                if size is None:
+                    with Image.open(io.BytesIO(data)) as im:
+                        size = im.size
+                media = self._media_for(data, size, display_inches(*self._slide_size, size))
+        except Exception as e:
+            self.last_error = f"Could not read {image_path.name}: {e}"
+            return False
+        if self._parts.take(len(media)):
+            self._broadcast((OP_ROLL, self._parts.part), DECKS)
+        writers = [w for w in writers if not w.closed]
+        if shot is not None:
+            self._durable_left[shot] = len(writers)
+        for w in writers:
+            try:
+                w.put((OP_ADD, seq, shot, image_path, caption, size, media))
+            except RuntimeError as e:
+                self.last_error = str(e)
+        return True
+
+    def _init(self, recovery: Recovery | None, resume: bool):
+        """Open or start every output (the presentation first: its slide size
+        sizes the pictures and the report pages), then replay what each is missing."""
+        try:
+            self._open_all(recovery, resume)
+        finally:
+            self.ready.set()
+
+    def _open_all(self, recovery: Recovery | None, resume: bool):
+        def mode(kind):
+            if recovery:
+                return "open" if recovery.resumed or kind in recovery.checkpoints else "new"
+            return "open" if resume else "new"
+        def part(kind):  # the part to carry on with: the checkpoint's, else the last one on disk
+            if kind not in DECKS or mode(kind) == "new":
+                return 1
+            if recovery and kind in recovery.checkpoints:
+                return recovery.part(kind)
+            return last_part(output_path(self.session, kind))
+        pptx = self.writers["pptx"]
+        if mode("pptx") == "new":
+            index_path(self.session).unlink(missing_ok=True)
+        pptx.put((OP_INIT, mode("pptx"), None, part("pptx")))
+        pptx.ready.wait()
+        self._slide_size = self._slide_size or (9144000, 6858000)  # python-pptx default, if the deck failed
+        for w in self.writers.values():
+            if w is not pptx:
+                w.put((OP_INIT, mode(w.kind), self._slide_size, part(w.kind)))
+        for w in self.writers.values():
+            w.ready.wait()
+        # Count parts on from the deck that is furthest back: every later add goes through _send
+        decks = [self.writers[k] for k in DECKS if not self.writers[k].closed]
+        if decks:
+            base = min(decks, key=lambda w: 0 if w.fresh or not recovery else recovery.done(w.kind))
+            self._parts.seed(base.part, *base.filled)
+            self._broadcast((OP_ROLL, base.part), DECKS)  # a deck short of parts catches up
+        if recovery:
+            with self.metrics.span("replay"):
+                replayed = set()
+                for rec in recovery.records:
+                    todo = [w for w in self.writers.values()
+                            if w.fresh or rec["seq"] > recovery.done(w.kind)]
+                    image_path = self.session.project_dir / rec["path"]
+                    try:
+                        if not todo or file_sha1(image_path) != rec["sha1"]:
+                            continue  # skip shots deleted or replaced since
+                    except OSError:
+                        continue
+                    size = self.catalog.size(image_path.name) if self.catalog else None
+                    if self._send(todo, rec["seq"], None, image_path, rec["caption"], size):
+                        replayed.add(rec["seq"])
+                self.recovered = len(replayed)
+            self._broadcast((OP_SAVE, True))  # make the recovered outputs durable right away
+        elif resume and self.journal:
+            for w in self.writers.values():
+                if not w.fresh:
+                    self.journal.saved(w.kind, 0, file_stamp(w.file), w.part)  # a crash before the first save replays onto these
+
+    # -- collector thread --
+    def _collect(self):
+        writers = self.writers
+        while not all(w.closed for w in writers.values()):
+            try:
+                ev = self._events.get(timeout=0.5)
+            except queue.Empty:
+                for w in writers.values():
+                    if not w.closed and not w.worker.is_alive():  # died without a word (killed process)
+                        w.closed = True
+                        w.ready.set()
+                        self.last_error = f"{w.label} writer stopped unexpectedly"
+                continue
+            w = writers[ev[1]]
+            try:
+                self._on_event(w, ev)
+            except Exception as e:
+                self.last_error = f"{w.label}: {e}"
+        if self.journal and all(w.clean for w in writers.values()):
+            self.journal.close()  # clean shutdown; a failed last save leaves it open for recovery
+        for w in writers.values():
+            w.worker.join(5)
+
+    def _on_event(self, w: DocWriter, ev: tuple):
+        op = ev[0]
+        if op == EV_READY:
+            _, _, w.fresh, slide_size, w.part, w.filled, seconds, problem = ev
+            if slide_size:
+                self._slide_size = slide_size
+            if problem:
+                self.last_error = problem
+            self.metrics.record("open", seconds, doc=w.kind, fresh=w.fresh)
+            w.ready.set()
+        elif op == EV_BUILT:
+            _, _, seq, shot, name, part, position, seconds = ev
+            w.built += 1
+            self.metrics.record("build", seconds, shot, doc=w.kind)
+            if self.catalog and position is not None and w.kind in DECKS:
+                if w.kind == "pptx":
+                    self.catalog.update(name, slide=position, part=part)
+                else:
+                    self.catalog.update(name, page=position)
+        elif op == EV_SAVED:
+            _, _, seq, part, stamp, shots, built, seconds = ev
+            w.saved = built
+            self.last_saved = time.time()
+            self.metrics.record("save", seconds, doc=w.kind, shots=len(shots), part=part)
+            if self.journal:
+                self.journal.saved(w.kind, seq, stamp, part)
+            if self.catalog and w.kind in DECKS and w.part > 1:
+                write_index(self.session, self.catalog.shots())
+            durable = []
+            for shot in shots:
+                left = self._durable_left.get(shot, 1) - 1
+                if left > 0:
+                    self._durable_left[shot] = left
+                else:
+                    self._durable_left.pop(shot, None)
+                    durable.append(shot)
+            self.metrics.durable(durable)
+        elif op == EV_ROLLED:
+            _, _, w.part, seconds = ev
+            self.metrics.record("roll", seconds, doc=w.kind, part=w.part)
+        elif op == EV_ERROR:
+            self.last_error = ev[2]
+        elif op == EV_CLOSED:
+            w.closed, w.clean = True, ev[2]
+            w.ready.set()  # a writer that died during init must not hang the dispatcher
+
+    def _media_for(self, data: bytes, size: tuple, display_in: float) -> bytes:
+        """Bytes to embed for one shot: the original file, or a copy resampled to
+        `embed_dpi` at the size it is displayed (always a copy for WebP). The file
+        in the project folder is never touched. Identical sources give identical
+        bytes, and python-pptx / python-docx look image parts up by SHA-1, so a
+        repeated image is stored only once per package."""
+        if not needs_resample(data, size, display_in, self.embed_dpi):
+            return data
+        key = hashlib.sha1(data).hexdigest()
+        blob = self._media.get(key)
+        if blob is None:
+            blob = resample_for_display(data, size, display_in, self.embed_dpi)
+            self._media[key] = blob
+            while len(self._media) > 32:
+                self._media.popitem(last=False)
+        else:
+            self._media.move_to_end(key)
+        return blob
+
+# ----- Image encode pipeline (off the Tk thread) -----
+PNG_ENCODE_PRESETS = {
+    # name: (zlib compress_level, optimize) - "fast" trades file size for speed
+    "fast": (1, False),
+    "balanced": (6, False),
+    "small": (9, True),
+}
+# Lossless WebP (method, quality) per preset; for lossless, quality is compression effort
+WEBP_EFFORT = {"fast": (0, 100), "balanced": (1, 0), "small": (6, 100)}
+JPEG_QUALITY = 92
+CAPTURE_FORMATS = {"png": ".png", "png8": ".png", "webp": ".webp", "jpeg": ".jpg"}
+
+def analyze_frame(frame: "Frame", samples: int = 1 << 16) -> dict:
+    """Content statistics on about `samples` pixels: whole rows spread over the
+    frame, so neighbouring pixels stay neighbours.
+
+    colors: distinct RGB values in the sample.
+    flat:   share of horizontal neighbours that are identical (UI backgrounds).
+    edges:  share of horizontal neighbours that jump by more than 32 grey levels
+            (text, borders).
+    """
+    rows = max(1, min(frame.height, samples // max(1, frame.width)))
+    px = frame.bgra[np.linspace(0, frame.height - 1, rows).astype(int), :, :3]
+    packed = (px[..., 0].astype(np.uint32) << 16) | (px[..., 1].astype(np.uint32) << 8) | px[..., 2]
+    colors = len(np.unique(packed))
+    if frame.width < 2:
+        return {"colors": colors, "flat": 1.0, "edges": 0.0}
+    same = packed[:, 1:] == packed[:, :-1]
+    gray = px @ np.array([0.114, 0.587, 0.299], dtype=np.float32)
+    jump = np.abs(gray[:, 1:] - gray[:, :-1]) > 32
+    return {"colors": colors, "flat": round(float(same.mean()), 3), "edges": round(float(jump.mean()), 4)}
+
+def choose_format(stats: dict) -> str:
+    """Few colors -> palette PNG (exact); continuous tone with few hard edges
+    (photos, video) -> JPEG; everything else (anti-aliased UI) -> lossless WebP."""
+    if stats["colors"] <= 256:
+        return "png8"
+    if stats["flat"] < 0.35 and stats["edges"] < 0.02:
+        return "jpeg"
+    return "webp" if _webp_ok() else "png"
+
+def _webp_ok() -> bool:
+    from PIL import features
+    return bool(features.check("webp"))
+
+def encode_image(raw: bytes, mode: str, size: tuple, path: str, fmt: str, preset: str = "balanced",
+                 rawmode: str | None = None) -> str:
+    """Process-pool worker: encode a raw frame as `fmt` and move it into place atomically.
+
+    Returns the format written: "png" for a "png8" frame with more than 256 colours
+    (choose_format only sees a sample of the rows)."""
+    level, optimize = PNG_ENCODE_PRESETS.get(preset, PNG_ENCODE_PRESETS["balanced"])
+    tmp = path + ".part"
+    im = Image.frombytes(mode, size, raw, "raw", rawmode or mode)
+    if fmt == "png8":
+        colors = im.getcolors(256) if im.mode == "RGB" else None
+        if colors is None:
+            fmt = "png"
+        else:
+            # Palette of exactly the colors present, so the mapping is lossless
+            pal = Image.new("P", (1, 1))
+            pal.putpalette([c for _, rgb in colors for c in rgb])
+            im = im.quantize(palette=pal, dither=Image.Dither.NONE)
+        im.save(tmp, "PNG", compress_level=level, optimize=optimize)
+    elif fmt == "webp":
+        method, quality = WEBP_EFFORT.get(preset, WEBP_EFFORT["balanced"])
+        im.save(tmp, "WEBP", lossless=True, quality=quality, method=method)
+    elif fmt == "jpeg":
+        im.convert("RGB").save(tmp, "JPEG", quality=JPEG_QUALITY, subsampling=0)
+    else:
+        im.save(tmp, "PNG", compress_level=level, optimize=optimize)
+    os.replace(tmp, path)
+    return fmt
+
+class EncodePipeline:
+    """Encodes captures in a ProcessPoolExecutor behind a bounded number of in-flight jobs.
+
+    `submit()` hands the raw frame to a worker and returns immediately; `on_done(path,
+    fmt)` runs once the file is on disk (`fmt` as written, see encode_image), on the
+    executor's callback thread, so it must not block: later encodes cannot finish
+    meanwhile. When `max_pending` jobs are in flight (`full`), `submit()` blocks
+    until one finishes.
+    """
+
+    def __init__(self, preset: str = "balanced", max_pending: int = 4, workers: int | None = None):
+        self.preset = preset if preset in PNG_ENCODE_PRESETS else "balanced"
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pool = None
+        self.inflight: dict[Path, object] = {}  # target path -> Future
+        self.last_error: str | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self.inflight)
+
+    @property
+    def full(self) -> bool:
+        return len(self.inflight) >= self.max_pending
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def submit(self, image: "Frame | Image.Image", path: Path, on_done=None, fmt: str = "png"):
+        if isinstance(image, Frame):
+            # BGRX -> RGB happens in the worker's raw decoder, not on the Tk thread
+            args = (image.tobytes(), "RGB", image.size)
+            rawmode = "BGRX"
+        else:
+            if image.mode not in ("RGB", "RGBA", "L", "P"):
+                image = image.convert("RGB")
+            args = (image.tobytes(), image.mode, image.size)
+            rawmode = None
+        self._slots.acquire()
+        try:
+            fut = self._executor().submit(encode_image, *args, str(path), fmt, self.preset, rawmode)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.inflight[path] = fut
 
-            elif msg[0] == "close":
+        def done(f):
+            self._slots.release()
+            try:
+                written = f.result()
+            except Exception as e:
+                self.last_error = f"Encoding {path.name} failed: {e}"
+            else:
                 try:
-                    if prs: prs.save(str(self.session.pptx_path))
-                    if doc: doc.save(str(self.session.docx_path))
-                except Exception:
-                    pass
-                break
+                    if on_done:
+                        on_done(path, written)
+                except Exception as e:
+                    self.last_error = f"{path.name}: {e}"
+            finally:
+                with self._lock:  # pending until the shot is handed on, so drain() covers on_done
+                    self.inflight.pop(path, None)
+        fut.add_done_callback(done)
+        return fut
+
+    def drain(self, timeout: float | None = None):
+        """Wait until every submitted encode has finished (and its callback ran)."""
+        with self._lock:
+            futs = list(self.inflight.values())
+        wait(futs, timeout=timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.inflight and (deadline is None or time.monotonic() < deadline):
+            time.sleep(0.01)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+# ----- Batch builder (headless PPTX/DOCX from a folder of images) -----
+IMAGE_EXT = (".png", ".jpg", ".jpeg", ".webp")
+
+def list_images(folder: Path, order: str = "name", catalog: "Catalog | None" = None) -> list:
+    """Images in `folder` by name, mtime, or capture time (catalog, else mtime)."""
+    files = [p for p in folder.iterdir() if p.is_file() and p.suffix.lower() in IMAGE_EXT]
+    if order == "captured" and catalog:
+        captured = {r["name"]: r["captured"] for r in catalog.shots()}
+        files.sort(key=lambda p: (captured.get(p.name) or p.stat().st_mtime, p.name.lower()))
+    elif order in ("mtime", "captured"):
+        files.sort(key=lambda p: (p.stat().st_mtime, p.name.lower()))
+    else:
+        files.sort(key=lambda p: p.name.lower())
+    return files
+
+def prepare_image(path: str, slide_w: int, slide_h: int, dpi: int, size: tuple | None = None):
+    """Process-pool worker: probe one image (unless its `size` is known), return
+    (size, bytes to embed)."""
+    data = Path(path).read_bytes()
+    if size is None:
+        with Image.open(io.BytesIO(data)) as im:
+            size = im.size
+    return size, resample_for_display(data, size, display_inches(slide_w, slide_h, size), dpi)
+
+def _write_doc(document, add, appender: PackageAppender, q: queue.Queue, flush_every: int):
+    """Writer thread for one document: append items until None, flushing as it goes
+    so sealed media can be dropped from memory."""
+    n = 0
+    while True:
+        item = q.get()
+        if item is None:
+            break
+        add(document, *item)
+        n += 1
+        if n % flush_every == 0:
+            appender.save(document)
+    appender.save(document)
+
+def _put(q: queue.Queue, item, writer):
+    while True:
+        try:
+            q.put(item, timeout=0.5)
+            return
+        except queue.Full:
+            if writer.done():
+                writer.result()  # re-raise the writer's error
+                raise RuntimeError("document writer stopped early")
+
+def build_project(folder: Path, project_name: str | None = None, template: Path | None = None,
+                  order: str = "name", workers: int | None = None, embed_dpi: int = 150,
+                  flush_every: int = 20, progress=None, part_max_slides: int = 0,
+                  part_max_mb: float = 0) -> Session:
+    """Rebuild <folder>.pptx/.docx from the images in `folder`, without Tk or Win32.
+
+    Images are probed and resampled in a process pool (a bounded window ahead of
+    the writers), the PPTX and DOCX are built by two writer threads at the same
+    time, and both are flushed with the append-only writer every `flush_every`
+    shots, releasing embedded media, so memory stays bounded for any folder size.
+    With a part limit they roll over like a live session's (see PartLimit), a
+    part's writers finishing while the next part's start, and the index is written.
+    """
+    folder = Path(folder)
+    session = Session(
+        base_folder=folder.parent,
+        project_name=project_name or folder.name,
+        template_path=Path(template) if template else None,
+        project_dir=folder,
+        pptx_path=folder / f"{folder.name}.pptx",
+        docx_path=folder / f"{folder.name}.docx",
+    )
+    catalog = Catalog.existing(folder)  # captions, sizes and capture order of live shots
+    rows = {r["name"]: r for r in catalog.shots()} if catalog else {}
+    images = [p for p in list_images(folder, order, catalog)
+              if not rows.get(p.name, {}).get("duplicate_of")]  # collapsed by dedupe
+    prs, doc = new_presentation(session, report=progress), new_document(session)
+    slide_w, slide_h = prs.slide_width, prs.slide_height
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    window = workers * 2
+
+    def slide(d, caption, size, media): add_slide(d, caption, size, media)
+    def page(d, caption, size, media): add_page(d, caption, media)
+
+    limit = PartLimit(part_max_slides, int(part_max_mb * (1 << 20)))
+    index = []  # caption, part, slide, page of each shot placed
+    with ProcessPoolExecutor(max_workers=workers) as pool, ThreadPoolExecutor(max_workers=4) as writers:
+        def start_part(part, prs, doc):
+            qs = [queue.Queue(maxsize=window), queue.Queue(maxsize=window)]
+            pptx = PptxAppender(part_path(session.pptx_path, part), release_media=True)
+            docx = DocxAppender(part_path(session.docx_path, part), release_media=True)
+            return qs, [writers.submit(_write_doc, prs, slide, pptx, qs[0], flush_every),
+                        writers.submit(_write_doc, doc, page, docx, qs[1], flush_every)]
+
+        qs, outs = start_part(1, prs, doc)
+        sealing = []  # writers of earlier parts, still finishing
+        pending = deque()
+        if catalog: catalog.clear_placement()
+
+        def emit():
+            nonlocal qs, outs
+            path, fut = pending.popleft()
+            try:
+                size, media = fut.result()
+            except Exception as e:
+                if progress: progress(f"skipped {path.name}: {e}")
+                return
+            if limit.take(len(media)):
+                for q, out in zip(qs, outs):
+                    _put(q, None, out)
+                sealing.extend(outs)
+                title = part_title(session, limit.part)
+                qs, outs = start_part(limit.part, new_presentation(session, title=title, report=progress),
+                                         new_document(session, title))
+                if progress: progress(f"started part {limit.part}")
+            row = rows.get(path.name) or {}
+            caption = row.get("caption") or path.stem
+            for q, out in zip(qs, outs):
+                _put(q, (caption, size, media), out)
+            placed = limit.shots + 1  # after the title slide / title page
+            index.append({"caption": caption, "part": limit.part, "slide": placed, "page": placed})
+            if catalog:
+                catalog.update(path.name, width=size[0], height=size[1], slide=placed, page=placed, part=limit.part)
+            if progress: progress(f"added {path.name}")
+
+        for path in images:
+            row = rows.get(path.name) or {}
+            size = (row["width"], row["height"]) if row.get("width") and row.get("height") else None
+            pending.append((path, pool.submit(prepare_image, str(path), slide_w, slide_h, embed_dpi, size)))
+            if len(pending) >= window:
+                emit()
+        while pending:
+            emit()
+        for q, out in zip(qs, outs):
+            _put(q, None, out)
+        for out in sealing + outs:
+            out.result()
+    for path in (session.pptx_path, session.docx_path):
+        remove_parts(path, limit.part)  # parts of an earlier, longer build
+    if limit.part > 1:
+        write_index(session, index)
+    else:
+        index_path(session).unlink(missing_ok=True)
+    if catalog:
+        catalog.close()
+    return session
 
 # ----- Capture helpers -----
-class Capture:
+class Frame:
+    """A captured BGRA framebuffer, held as a NumPy view (no copy on grab).
+
+    `left`/`top` are the virtual-desktop coordinates of the top-left pixel.
+    Conversion to PIL only happens in `to_image()`, i.e. when the preview or the
+    encoder actually needs pixels in RGB order.
+    """
+
+    __slots__ = ("bgra", "left", "top", "grabbed_at")
+
+    def __init__(self, bgra: np.ndarray, left: int = 0, top: int = 0, grabbed_at: float | None = None):
+        self.bgra = bgra  # (height, width, 4) uint8, B G R A/X
+        self.left, self.top = left, top
+        self.grabbed_at = time.perf_counter() if grabbed_at is None else grabbed_at
+
+    @property
+    def width(self) -> int: return self.bgra.shape[1]
+    @property
+    def height(self) -> int: return self.bgra.shape[0]
+    @property
+    def size(self) -> tuple: return self.bgra.shape[1], self.bgra.shape[0]
+
+    def rgb(self) -> np.ndarray:
+        """(h, w, 3) RGB view: channel swizzle and alpha drop by striding, no copy."""
+        return self.bgra[..., 2::-1]
+
+    def crop(self, left: int, top: int, width: int, height: int) -> "Frame":
+        """Sub-frame in desktop coordinates, as a view into the same buffer.
+
+        Clipped to the frame, so a box reaching past its edges (e.g. a monitor that was
+        added after the grab) yields the visible part instead of wrapping around.
+        """
+        box = box_intersect({"left": left, "top": top, "width": width, "height": height},
+                            {"left": self.left, "top": self.top, "width": self.width, "height": self.height})
+        if box is None:
+            raise ValueError(f"crop ({left}, {top}, {width}x{height}) lies outside the frame")
+        x, y = box["left"] - self.left, box["top"] - self.top
+        return Frame(self.bgra[y:y + box["height"], x:x + box["width"]],
+                     box["left"], box["top"], self.grabbed_at)
+
+    def tobytes(self) -> bytes:
+        """Raw BGRX bytes, for handing the frame to another process."""
+        return self.bgra.tobytes()
+
+    def to_image(self) -> Image.Image:
+        bgra = self.bgra if self.bgra.flags.c_contiguous else np.ascontiguousarray(self.bgra)
+        # Pillow's BGRX unpacker swizzles and drops alpha in one C pass over the buffer
+        return Image.frombuffer("RGB", self.size, bgra, "raw", "BGRX", 0, 1)
+
+def make_preview(frame: Frame, max_w: int = 540, max_h: int = 320) -> Image.Image:
+    """Small RGB preview of a frame, without converting the full-resolution buffer.
+
+    Rows/columns are skipped to get within ~2x of the target (strided view; only
+    the kept pixels are copied, already swizzled to RGB), the rest is a box
+    `reduce()` by an integer factor and a cheap bilinear resize to the exact size.
+    A frame already that close is reduced straight from its buffer, mapped as
+    RGBX, and only the small result is swizzled.
+    """
+    w, h = frame.size
+    scale = min(max_w / w, max_h / h, 1.0)
+    nw, nh = max(1, int(w * scale)), max(1, int(h * scale))
+    factor = max(1, min(w // nw, h // nh))
+    step = max(1, factor // 2)
+    if step > 1:
+        im = Image.fromarray(np.ascontiguousarray(frame.bgra[::step, ::step, 2::-1]))
+    elif frame.bgra.flags.c_contiguous:
+        im = Image.frombuffer("RGBX", frame.size, frame.bgra, "raw", "RGBX", 0, 1)  # B,G,R,X, not copied
+    else:
+        im = frame.to_image()
+    if factor // step > 1:
+        im = im.reduce(factor // step)
+    if im.mode == "RGBX":
+        b, g, r, _ = im.split()
+        im = Image.merge("RGB", (r, g, b))
+    if im.size != (nw, nh):
+        im = im.resize((nw, nh), Image.BILINEAR)
+    return im
+
+class Grabber:
+    """Platform screen grabber: returns a Frame for a box in desktop coordinates."""
+
+    def grab(self, box: dict) -> Frame:
+        raise NotImplementedError
+
+class MssGrabber(Grabber):
+    """mss-backed grabber. mss holds per-thread GDI handles, so each thread that
+    grabs (Tk thread, burst thread) gets its own instance."""
+
     def __init__(self):
-        self.sct = mss.mss()
+        import mss
+        self._new = mss.mss
+        self._local = threading.local()
+        self._local.sct = self._new()
+
+    def grab(self, box: dict) -> Frame:
+        t0 = time.perf_counter()
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = self._new()
+        shot = sct.grab(box)
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return Frame(bgra, shot.left, shot.top, t0)
+
+def synthetic_desktop(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """A deterministic UI-like BGRA framebuffer (flat panels, title bars, text rows)."""
+    rng = np.random.default_rng(seed)
+    fb = np.empty((height, width, 4), dtype=np.uint8)
+    fb[...] = (48, 40, 32, 255)
+    fb[..., 0] += (np.arange(width, dtype=np.uint16) * 64 // max(1, width)).astype(np.uint8)
+    for _ in range(max(1, width * height // 400_000)):
+        w, h = int(rng.integers(width // 8, width // 2)), int(rng.integers(height // 8, height // 2))
+        x, y = int(rng.integers(0, width - w)), int(rng.integers(0, height - h))
+        fb[y:y + h, x:x + w, :3] = rng.integers(200, 256, 3, dtype=np.uint8)
+        fb[y:y + 28, x:x + w, :3] = rng.integers(0, 256, 3, dtype=np.uint8)
+        rows = fb[y + 40:y + h - 8:18, x + 12:x + w - 12, :3]
+        rows[:, rng.random(rows.shape[1]) < 0.6] = 30  # "glyphs"
+    return fb
+
+def synthetic_photo(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """A deterministic photo/video-like BGRA frame: smooth colour fields plus sensor noise."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    fb = np.empty((height, width, 4), dtype=np.uint8)
+    for c in range(3):
+        fx, fy, ph = rng.uniform(1, 6, 2).tolist() + [rng.uniform(0, 6.3)]
+        field = np.sin(x / width * fx * np.pi + ph) * np.cos(y / height * fy * np.pi)
+        field = 128 + 90 * field + rng.normal(0, 6, (height, width))
+        fb[..., c] = np.clip(field, 0, 255)
+    fb[..., 3] = 255
+    return fb
+
+class SyntheticGrabber(Grabber):
+    """Stands in for mss on machines without a real desktop (tests, benchmarks).
+
+    Serves crops of a fixed synthetic framebuffer whose top-left pixel sits at
+    (`left`, `top`) on the virtual desktop. Like mss, each grab returns a fresh
+    buffer unless `copy=False`.
+    """
+
+    def __init__(self, width: int = 1920, height: int = 1080, left: int = 0, top: int = 0,
+                 seed: int = 0, copy: bool = True):
+        self.screen = Frame(synthetic_desktop(width, height, seed), left, top)
+        self.copy = copy
+
+    def grab(self, box: dict) -> Frame:
+        f = self.screen.crop(box["left"], box["top"], box["width"], box["height"])
+        return Frame(f.bgra.copy(), f.left, f.top, time.perf_counter()) if self.copy else f
 
-    @staticmethod
-    def virtual_screen():
-        SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN = 76, 77
-        SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN = 78, 79
-        x = user32.GetSystemMetrics(SM_XVIRTUALSCREEN)
-        y = user32.GetSystemMetrics(SM_YVIRTUALSCREEN)
-        w = user32.GetSystemMetrics(SM_CXVIRTUALSCREEN)
-        h = user32.GetSystemMetrics(SM_CYVIRTUALSCREEN)
-        return x, y, w, h
+class Capture:
+    """Grabber + platform backend, each created on first use."""
 
-    @staticmethod
-    def monitor_workarea_under_cursor():
-        x, y = win32api.GetCursorPos()
-        hmon = win32api.MonitorFromPoint((x, y), win32con.MONITOR_DEFAULTTONEAREST)
-        info = win32api.GetMonitorInfo(hmon)
-        l, t, r, b = info["Work"]  # excludes taskbar on that monitor
-        return {"left": l, "top": t, "width": r - l, "height": b - t}
+    def __init__(self, grabber: Grabber | None = None, platform: Platform | None = None):
+        self._grabber = grabber
+        self._platform = platform
+
+    @property
+    def grabber(self) -> Grabber:
+        if self._grabber is None:
+            self._grabber = MssGrabber()
+        return self._grabber
+
+    @property
+    def platform(self) -> Platform:
+        if self._platform is None:
+            self._platform = get_platform()
+        return self._platform
+
+    def virtual_screen(self):
+        return self.platform.virtual_screen()
 
-    def grab(self, box: dict) -> Image.Image:
-        shot = self.sct.grab(box)
-        return Image.frombytes("RGB", (shot.width, shot.height), shot.bgra, "raw", "BGRX")
+    def monitor_workarea_under_cursor(self):
+        return self.platform.monitor_workarea_under_cursor()
 
-    def capture_monitor(self) -> Image.Image:
+    def grab(self, box: dict) -> Frame:
+        return self.grabber.grab(box)
+
+    def capture_monitor(self) -> Frame:
         return self.grab(self.monitor_workarea_under_cursor())
 
+    def grab_desktop(self) -> Frame:
+        """The whole virtual screen in one grab (all monitors at the same instant)."""
+        x, y, w, h = self.virtual_screen()
+        return self.grab({"left": x, "top": y, "width": w, "height": h})
+
+    def capture_all_monitors(self, area: str = "work") -> tuple:
+        """(desktop, [per-monitor Frame]) from a single grab.
+
+        The per-monitor frames are views into the desktop buffer (`area` "work" leaves
+        out taskbars, "monitor" is the full panel); pixels are only copied when a view
+        is encoded.
+        """
+        desktop = self.grab_desktop()
+        return desktop, [desktop.crop(**m[area]) for m in self.platform.monitors()]
+
+# ----- Burst capture (fixed rate into a bounded ring) -----
+class FrameRing:
+    """Preallocated BGRA slots for burst frames: fixed memory, no per-frame allocation.
+
+    `put()` copies a frame into a free slot, or returns False when every slot is
+    still waiting for the encoder (the caller drops the frame). `get()` hands
+    filled slots out in capture order; `release()` returns a slot to the pool.
+    """
+
+    def __init__(self, width: int, height: int, budget_bytes: int, max_slots: int):
+        slots = min(max_slots, budget_bytes // (width * height * 4))
+        if slots < 1:
+            raise ValueError(f"a {width}x{height} frame does not fit in the burst buffer")
+        self.buf = np.empty((slots, height, width, 4), dtype=np.uint8)
+        self._free = queue.SimpleQueue()
+        for i in range(slots):
+            self._free.put(i)
+        self._filled = queue.Queue()
+
+    @property
+    def slots(self) -> int:
+        return self.buf.shape[0]
+
+    def put(self, frame: Frame, index: int) -> bool:
+        try:
+            i = self._free.get_nowait()
+        except queue.Empty:
+            return False
+        self.buf[i] = frame.bgra
+        self._filled.put((i, index, Frame(self.buf[i], frame.left, frame.top, frame.grabbed_at)))
+        return True
+
+    def close(self):
+        self._filled.put(None)
+
+    def get(self):
+        """(slot, index, frame) in capture order, or None once closed and drained."""
+        return self._filled.get()
+
+    def release(self, slot: int):
+        self._free.put(slot)
+
+class Burst:
+    """`count` grabs of one box at a fixed `interval`, on a background thread.
+
+    Frames go into a FrameRing; a feeder thread hands them to `on_frame(frame,
+    index)` (which encodes/queues them and may block) and frees the slot after.
+    A frame is dropped, not queued, when the ring is full or its tick was missed
+    because the previous grab overran, so memory never grows past the ring.
+    """
+
+    def __init__(self, capture: Capture, box: dict, count: int, interval: float,
+                 ring: FrameRing, on_frame):
+        self.capture, self.box, self.count, self.interval = capture, box, count, interval
+        self.ring, self.on_frame = ring, on_frame
+        self.captured = self.dropped = self.handed_off = 0
+        self.error: str | None = None
+        self._stop = threading.Event()
+        self._threads = [threading.Thread(target=self._grab_loop, daemon=True),
+                         threading.Thread(target=self._feed_loop, daemon=True)]
+
+    def start(self):
+        for t in self._threads:
+            t.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def done(self) -> bool:
+        return not any(t.is_alive() for t in self._threads)
+
+    def _grab_loop(self):
+        try:
+            t0 = time.perf_counter()
+            for index in range(self.count):
+                due = t0 + index * self.interval
+                now = time.perf_counter()
+                if now - due >= self.interval:
+                    self.dropped += 1  # missed tick
+                    continue
+                if self._stop.wait(max(0.0, due - now)):
+                    self.dropped += self.count - index
+                    break
+                frame = self.capture.grab(self.box)
+                if self.ring.put(frame, index):
+                    self.captured += 1
+                else:
+                    self.dropped += 1
+        except Exception as e:
+            self.error = f"Burst capture failed: {e}"
+        finally:
+            self.ring.close()
+
+    def _feed_loop(self):
+        while True:
+            item = self.ring.get()
+            if item is None:
+                return
+            slot, index, frame = item
+            try:
+                self.on_frame(frame, index)
+                self.handed_off += 1
+            except Exception as e:
+                self.error = f"Burst frame {index} failed: {e}"
+            finally:
+                self.ring.release(slot)
+
+# ----- Scrolling capture (repeated grabs stitched into one tall image) -----
+@cache
+def _row_weights() -> np.ndarray:
+    """Odd per-column multipliers for row_hashes, made on first use (numpy.random is not cheap to import)."""
+    return np.random.default_rng(0x5C011).integers(0, 1 << 32, 1 << 14, dtype=np.uint32) | 1
+
+def row_hashes(frame: Frame) -> np.ndarray:
+    """One 64-bit hash per row of a frame (alpha ignored), so rows compare as integers."""
+    bgra = frame.bgra if frame.bgra.strides[1] == 4 else np.ascontiguousarray(frame.bgra)
+    px = bgra.view(np.uint32)[..., 0] & np.uint32(0xFFFFFF)  # (h, w) BGR packed
+    weights = _row_weights()
+    w = px.shape[1]
+    if w > weights.size:
+        px = px[:, :weights.size]
+        w = weights.size
+    px *= weights[:w]  # wraps mod 2**32: a cheap multiplicative hash per pixel
+    return px.sum(axis=1, dtype=np.uint64)
+
+def scroll_offset(prev: np.ndarray, cur: np.ndarray, top: int = 0, bottom: int = 0,
+                  min_overlap: int = 32, min_score: float = 0.9) -> int | None:
+    """How many rows the content moved up between two frames' row hashes.
+
+    Only rows [top, len - bottom) are compared (fixed header/footer left out). An
+    anchor of k rows near the top of `cur` (the first window with at least half the
+    row-to-row changes of the busiest one, so blank stretches do not anchor) is
+    located in `prev` with one vectorized sliding-window compare; each hit is then
+    scored on the whole overlap.
+    Returns 0 for no movement, None when no shift leaves `min_overlap` rows that
+    agree on at least `min_score` of them (scrolled too far, or up).
+    """
+    a, b = prev[top:len(prev) - bottom], cur[top:len(cur) - bottom]
+    n = len(b)
+    if n < min_overlap or not (a != b).any():
+        return 0
+    k = max(1, min(16, min_overlap // 2))
+    changes = np.concatenate(([0], np.cumsum(b[1:] != b[:-1])))
+    span = changes[k - 1:] - changes[:n - k + 1]  # row changes inside each k-row window
+    s = int(np.argmax(span >= max(1, int(span.max()) // 2)))  # topmost busy window
+    windows = np.lib.stride_tricks.sliding_window_view(a, k)
+    shifts = np.flatnonzero((windows == b[s:s + k]).all(axis=1)) - s
+    shifts = shifts[(shifts > 0) & (shifts <= n - max(min_overlap, s + k))]
+    best, best_score = None, min_score
+    for d in shifts[:32]:
+        score = np.count_nonzero(a[d:] == b[:n - d]) / (n - d)
+        if score >= best_score and (best is None or score > best_score):
+            best, best_score = int(d), score
+    return best
+
+class ScrollStitcher:
+    """Stitches grabs of one region, scrolled down between grabs, into one image on a
+    preallocated canvas; rows that stay put on the first movement are a fixed header/footer."""
+
+    def __init__(self, width: int, height: int, budget_bytes: int, min_overlap: int = 32):
+        rows = budget_bytes // (width * 4)
+        if rows < height:
+            raise ValueError(f"a {width}x{height} region does not fit in the scroll buffer")
+        self.canvas = np.empty((rows, width, 4), dtype=np.uint8)
+        self.min_overlap = min_overlap
+        self.rows = 0         # canvas rows filled, footer not included
+        self.header = self.footer = None  # fixed rows, known after the first movement
+        self.lost = 0         # grabs that matched nothing (scrolled too fast)
+        self.full = False
+        self._ref = None      # row hashes of the last grab that added rows (scrolling back up resumes from it)
+        self._last = None     # ... and the grab itself (its footer ends the image)
+
+    def add(self, frame: Frame) -> int:
+        """Stitch one grab; returns the number of new rows (0: no movement or no match)."""
+        h = row_hashes(frame)
+        if self._ref is None:
+            self.canvas[:frame.height] = frame.bgra
+            self.rows, self._ref, self._last = frame.height, h, frame
+            return frame.height
+        if self.full:
+            return 0
+        if self.header is None:
+            same = self._ref == h
+            if same.all():
+                return 0
+            self.header = int(np.argmin(same))
+            self.footer = int(np.argmin(same[::-1]))
+            self.rows -= self.footer  # the first grab's footer is replaced by the last one's
+        d = scroll_offset(self._ref, h, self.header, self.footer, self.min_overlap)
+        if d is None:
+            self.lost += 1
+            return 0
+        if not d:
+            return 0
+        if self.rows + d + self.footer > self.canvas.shape[0]:
+            self.full = True
+            return 0
+        end = frame.height - self.footer
+        self.canvas[self.rows:self.rows + d] = frame.bgra[end - d:end]
+        self.rows += d
+        self._ref, self._last = h, frame
+        return d
+
+    def result(self) -> Frame:
+        """The stitched image, as a view into the canvas."""
+        last = self._last
+        if self.footer:
+            self.canvas[self.rows:self.rows + self.footer] = last.bgra[last.height - self.footer:]
+        return Frame(self.canvas[:self.rows + (self.footer or 0)], last.left, last.top, last.grabbed_at)
+
+class ScrollCapture:
+    """Grabs `box` at `fps` on a background thread while the user scrolls, stitching
+    each grab as it arrives. Ends `idle_s` after the last movement (`start_s` if
+    scrolling never starts), when the canvas is full, or on `stop()`."""
+
+    def __init__(self, capture: Capture, box: dict, fps: float, stitcher: ScrollStitcher,
+                 idle_s: float = 2.0, start_s: float = 6.0):
+        self.capture, self.box, self.interval = capture, box, 1.0 / fps
+        self.stitcher, self.idle_s, self.start_s = stitcher, idle_s, start_s
+        self.grabs = 0
+        self.stitch_ms = deque(maxlen=1000)
+        self.error: str | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def _loop(self):
+        try:
+            t0 = moved = time.perf_counter()
+            started = False
+            while True:
+                frame = self.capture.grab(self.box)
+                t = time.perf_counter()
+                added = self.stitcher.add(frame)
+                now = time.perf_counter()
+                self.stitch_ms.append((now - t) * 1000)
+                if self.grabs and added:
+                    moved, started = now, True
+                self.grabs += 1
+                if self.stitcher.full or now - moved > (self.idle_s if started else self.start_s):
+                    break
+                if self._stop.wait(max(0.0, t0 + self.grabs * self.interval - time.perf_counter())):
+                    break
+        except Exception as e:
+            self.error = f"Scrolling capture failed: {e}"
+
+def synthetic_document(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """A deterministic long-page BGRA framebuffer: text lines that all differ,
+    paragraph gaps and the odd coloured block (settings page, log)."""
+    rng = np.random.default_rng(seed)
+    fb = np.full((height, width, 4), 255, dtype=np.uint8)
+    y = 8
+    while y < height - 16:
+        if rng.random() < 0.08:  # block: code sample, image, banner
+            h = int(rng.integers(40, 160))
+            fb[y:y + h, 24:width - 24, :3] = rng.integers(150, 240, 3, dtype=np.uint8)
+            y += h + 12
+            continue
+        line = rng.random(width - 48) < 0.45
+        line[int(rng.integers(width // 3, width - 48)):] = False  # ragged right edge
+        fb[y:y + 12, 24:width - 24, :3][:, line] = rng.integers(0, 90, 3, dtype=np.uint8)
+        fb[y + 3:y + 9, 24:width - 24, :3][:, line & (rng.random(width - 48) < 0.5)] = 255  # glyph shapes
+        y += 20 + (14 if rng.random() < 0.15 else 0)
+    return fb
+
+class ScrollingGrabber(Grabber):
+    """A long synthetic page seen through the grab box, moving `step` rows further
+    down on every grab, under a fixed header and above a fixed footer (tests,
+    benchmarks). `expected()` is what a perfect stitch of the whole page gives."""
+
+    def __init__(self, width: int = 1200, height: int = 800, page_rows: int = 6000,
+                 step: int = 60, header: int = 56, footer: int = 28, seed: int = 0):
+        self.page = synthetic_document(width, page_rows, seed)
+        self.head = synthetic_desktop(width, header, seed + 1) if header else self.page[:0]
+        self.foot = synthetic_desktop(width, footer, seed + 2) if footer else self.page[:0]
+        self.band = height - header - footer
+        self.step, self.offset = step, 0
+
+    def grab(self, box: dict) -> Frame:
+        fb = np.concatenate((self.head, self.page[self.offset:self.offset + self.band], self.foot))
+        self.offset = min(self.offset + self.step, len(self.page) - self.band)
+        return Frame(fb, box["left"], box["top"])
+
+    def expected(self) -> np.ndarray:
+        return np.concatenate((self.head, self.page, self.foot))
+
+# ----- Near-duplicate detection (perceptual hash + BK-tree) -----
+def dhash(frame: Frame, size: int = 8) -> int:
+    """64-bit difference hash of a frame.
+
+    Grayscale is computed on a strided sample (~16 px per cell), box-averaged to
+    size x (size+1) cells with `reduceat`, and each bit says whether a cell is
+    brighter than its right neighbour. A ticking clock or a blinking cursor moves
+    a few bits at most; a different screen moves dozens.
+    """
+    h, w = frame.height, frame.width
+    sy, sx = max(1, h // (size * 16)), max(1, w // ((size + 1) * 16))
+    gray = frame.bgra[::sy, ::sx, :3] @ np.array([0.114, 0.587, 0.299], dtype=np.float32)  # BGR
+    ys = np.linspace(0, gray.shape[0], size + 1).astype(int)
+    xs = np.linspace(0, gray.shape[1], size + 2).astype(int)
+    cells = np.add.reduceat(np.add.reduceat(gray, ys[:-1], axis=0), xs[:-1], axis=1)
+    cells /= np.maximum(np.outer(np.diff(ys), np.diff(xs)), 1)
+    bits = (cells[:, 1:] > cells[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+class BKTree:
+    """Hamming-distance BK-tree over integer hashes.
+
+    A radius-r query only descends into children whose edge distance is within r
+    of the query's distance to the node, so a near-duplicate lookup touches a
+    small fraction of the nodes even with thousands of shots.
+    """
+
+    def __init__(self):
+        self.root = None  # [hash, key, {distance: child}]
+        self.size = 0
+
+    def add(self, h: int, key):
+        self.size += 1
+        if self.root is None:
+            self.root = [h, key, {}]
+            return
+        node = self.root
+        while True:
+            d = (h ^ node[0]).bit_count()
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [h, key, {}]
+                return
+            node = child
+
+    def nearest(self, h: int, radius: int):
+        """(key, distance) of the closest hash within `radius`, or None."""
+        best = None
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            d = (h ^ node[0]).bit_count()
+            if d <= radius and (best is None or d < best[1]):
+                best = (node[1], d)
+                radius = d  # only something closer is interesting now
+            for edge, child in node[2].items():
+                if d - radius <= edge <= d + radius:
+                    stack.append(child)
+        return best
+
+class ShotIndex:
+    """Perceptual hashes of the shots in a project's documents, for near-duplicate
+    lookup. Persisted as <project>/clickshot_hashes.jsonl, one line per shot."""
+
+    NAME = "clickshot_hashes.jsonl"
+
+    def __init__(self, project_dir: Path, fresh: bool = False):
+        self.path = project_dir / self.NAME
+        self.tree = BKTree()
+        self._lock = threading.Lock()
+        if fresh:
+            self.path.write_text("", encoding="utf-8")
+            return
+        try:
+            for line in self.path.read_text(encoding="utf-8").splitlines():
+                try:
+                    rec = json.loads(line)
+                    self.tree.add(int(rec["hash"], 16), rec["name"])
+                except (ValueError, KeyError):
+                    continue
+        except OSError:
+            pass
+
+    def nearest(self, h: int, radius: int):
+        with self._lock:
+            return self.tree.nearest(h, radius)
+
+    def add(self, h: int, name: str):
+        with self._lock:
+            self.tree.add(h, name)
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"hash": f"{h:016x}", "name": name}) + "\n")
+            except OSError:
+                pass
+
 # ----- Overlays -----
+def frozen_backdrop(desktop: Frame, monitors: list, max_side: int = 2560) -> list:
+    """Dimmed display copies of a desktop grab, one per monitor box.
+
+    Each monitor is sampled every `factor` pixels so its long side stays within
+    `max_side` (a 4K panel is shown from a quarter of its pixels and zoomed back
+    up by Tk), swizzled to RGB and halved in brightness in one pass over the kept
+    pixels. Returns [(left, top, factor, RGB Image)] in desktop coordinates.
+    """
+    out = []
+    for m in monitors:
+        try:
+            view = desktop.crop(**m)
+        except ValueError:  # monitor added after the grab
+            continue
+        factor = max(1, -(-max(view.size) // max_side))
+        rgb = view.bgra[::factor, ::factor, 2::-1] >> 1
+        out.append((view.left, view.top, factor, Image.fromarray(rgb)))
+    return out
+
 class RegionSelector:
-    def __init__(self, root):
+    def __init__(self, root, capture: Capture):
         self.root = root
-
-    def select(self):
-        """Drag rectangle over full virtual desktop. Returns (x, y, w, h) or None."""
-        x0, y0, wv, hv = Capture.virtual_screen()
+        self.capture = capture
+        self.open_s = 0.0  # time from select() to the overlay being drawn (last call)
+
+    def select(self, frozen: Frame | None = None):
+        """Drag rectangle over full virtual desktop. Returns (x, y, w, h) or None.
+
+        With `frozen` (a grab of the whole desktop) the overlay is opaque and shows
+        that grab dimmed instead of the live screen, so the selection is made on
+        exactly the pixels that will be cropped.
+        """
+        t0 = time.perf_counter()
+        x0, y0, wv, hv = self.capture.virtual_screen()
         overlay = tk.Toplevel(self.root)
         overlay.overrideredirect(True)
         overlay.attributes("-topmost", True)
-        try: overlay.attributes("-alpha", 0.25)
-        except Exception: pass
+        if frozen is None:
+            try: overlay.attributes("-alpha", 0.25)
+            except Exception: pass
         overlay.configure(bg="#000")
         overlay.geometry(f"{wv}x{hv}+{x0}+{y0}")
         canvas = tk.Canvas(overlay, bg="#000", highlightthickness=0, cursor="crosshair")
         canvas.pack(fill="both", expand=True)
+        if frozen is not None:
+            from PIL import ImageTk
+            canvas.photos = []  # Tk does not keep its own reference
+            boxes = [m["monitor"] for m in self.capture.platform.monitors()]
+            for left, top, factor, im in frozen_backdrop(frozen, boxes):
+                photo = ImageTk.PhotoImage(im)
+                if factor > 1:  # pixel-replicated back to panel size inside Tk
+                    small, photo = photo, tk.PhotoImage(master=canvas)
+                    photo.tk.call(photo, "copy", small, "-zoom", factor, factor)
+                canvas.photos.append(photo)
+                canvas.create_image(left - x0, top - y0, image=photo, anchor="nw")
 
         canvas.create_text(wv//2, 40, text="Drag to select area • ESC to cancel",
                            fill="#58a6ff", font=("Segoe UI", 14, "bold"))
@@ -258,16 +2967,18 @@ class RegionSelector:
         overlay.focus_force()
         overlay.grab_set()
         self.root.update_idletasks()
+        self.open_s = time.perf_counter() - t0
         overlay.wait_window()  # no nested mainloop
         return result["box"]
 
 class WindowPicker:
-    def __init__(self, root):
+    def __init__(self, root, capture: Capture):
         self.root = root
+        self.capture = capture
 
     def pick(self):
         """Click a window to capture. Returns hwnd or None."""
-        x0, y0, wv, hv = Capture.virtual_screen()
+        x0, y0, wv, hv = self.capture.virtual_screen()
         overlay = tk.Toplevel(self.root)
         overlay.overrideredirect(True)
         overlay.attributes("-topmost", True)
@@ -283,18 +2994,7 @@ class WindowPicker:
         result = {"hwnd": None}
 
         def on_click(e):
-            sx, sy = e.x + x0, e.y + y0
-            hwnd = win32gui.WindowFromPoint((sx, sy))
-            if hwnd:
-                hwnd = win32gui.GetAncestor(hwnd, win32con.GA_ROOT)
-                # Filter out desktop/taskbar/our own windows
-                cname = win32gui.GetClassName(hwnd)
-                title = win32gui.GetWindowText(hwnd) or ""
-                if cname.lower() in ("shell_traywnd", "progman", "workerw"):
-                    hwnd = None
-                if title.find(APP_NAME) != -1:
-                    hwnd = None
-            result["hwnd"] = hwnd
+            result["hwnd"] = self.capture.platform.window_at(e.x + x0, e.y + y0)
             overlay.destroy()
 
         def on_escape(_):
@@ -310,23 +3010,90 @@ class WindowPicker:
 
 # ----- App -----
 class ClickShotApp:
-    def __init__(self):
+    def __init__(self, session: Session | None = None):
+        self.startup = {}  # milestone -> time.time(), see startup_benchmark() in bench.py
+        enable_dpi_awareness()
         self.root = tk.Tk()
         self.root.title(APP_NAME)
-        self.root.geometry("520x520")
+        self.root.geometry("520x640")
         self.root.configure(bg="#0d1117")
         self.root.attributes("-alpha", 0.98)
 
+        self.config = load_config()
+        self._preview_pool = ThreadPoolExecutor(max_workers=1)
+        self._profile_next = bool(self.config["profile_next_capture"])
+        self._capturing = False  # a capture (hide -> grab -> name) is on screen
+        self._handing_off = False  # project switch / quit waiting for the documents
+        self._held = deque()       # (frame, path, on_done, fmt) waiting for room, see _encode_held
+        self._to_docs = queue.Queue()  # encoded shots on their way to a DocBuilder, see _feed_docs
+        self._feeding = 0          # ...of which not added yet
+        self._feed_lock = threading.Lock()
+        threading.Thread(target=self._feed_docs, daemon=True, name="doc-feeder").start()
+        self._toast_win = None
         self.capture = Capture()
-        self.selector = RegionSelector(self.root)
-        self.winpicker = WindowPicker(self.root)
+        self.selector = RegionSelector(self.root, self.capture)
+        self.winpicker = WindowPicker(self.root, self.capture)
 
-        self.session = self._setup_session()  # ask every run
-        self.builder = DocBuilder(self.session)
-        self.builder.init_docs()
+        self.session = session or self._setup_session()  # ask every run
+        self.builder = self._new_builder()
+        self.encoder = EncodePipeline(self.config["png_encode"],
+                                      max_pending=int(self.config["encode_max_pending"]))
 
         self._build_ui()
         self.root.protocol("WM_DELETE_WINDOW", self._quit)
+        self._poll_builder()
+        self.root.after_idle(self._first_drawn)
+
+    def _first_drawn(self):
+        self.root.update_idletasks()
+        self.startup["window"] = time.time()
+        self.root.after(1, self._warm_up)
+
+    def _warm_up(self):
+        # Load the capture path now that the window is up, not on the first click
+        try:
+            self.capture.platform
+            self.capture.grabber
+            from PIL import ImageTk  # name dialog preview
+        except Exception as e:
+            self._err(f"Capture unavailable: {e}")
+            return
+        self.startup["capture_ready"] = time.time()
+
+    def _new_builder(self) -> DocBuilder:
+        log = self.session.project_dir / "clickshot_metrics.jsonl" if self.config["metrics"] else None
+        self.metrics = Metrics(log)
+        recovery = SessionJournal.recover(self.session)
+        if recovery and not messagebox.askyesno(
+                APP_NAME, "The last session in this project did not close cleanly "
+                          f"({len(recovery.todo)} of {len(recovery.records)} shots are not in the "
+                          "documents yet).\n\nRecover it? (No starts new documents.)"):
+            recovery = None
+        self._recovering = recovery is not None
+        resume = False
+        if recovery is None and (self.session.pptx_path.exists() or self.session.docx_path.exists()):
+            resume = self.config["existing_decks"] == "append"
+            if self.config["existing_decks"] == "ask":
+                resume = messagebox.askyesno(
+                    APP_NAME, f"{self.session.pptx_path.stem} already has documents.\n\n"
+                              "Append new shots to them? (No starts new documents and replaces them.)")
+        self.catalog = Catalog(self.session.project_dir)
+        if recovery is None and not resume:
+            self.catalog.clear_placement()
+        builder = DocBuilder(self.session, metrics=self.metrics,
+                             save_quiet=float(self.config["save_quiet_s"]),
+                             save_max_latency=float(self.config["save_max_latency_s"]),
+                             embed_dpi=int(self.config["embed_dpi"]),
+                             journal=SessionJournal(self.session.project_dir),
+                             catalog=self.catalog, exports=tuple(self.config["exports"]),
+                             max_queued=max(1, int(self.config["doc_max_queued"])),
+                             processes=self.config["doc_writers"] == "processes",
+                             part_max_slides=int(self.config["part_max_slides"]),
+                             part_max_mb=float(self.config["part_max_mb"]))
+        builder.init_docs(recovery, resume)
+        # Near-duplicate lookup covers the shots in these documents: kept on recovery/append
+        self.shots = ShotIndex(self.session.project_dir, fresh=recovery is None and not resume)
+        return builder
 
     # -- Startup wizard --
     def _setup_session(self) -> Session:
@@ -371,11 +3138,19 @@ class ClickShotApp:
         self.status_lbl = tk.Label(status, text="Ready", bg=glass, fg="#16a34a",
                                    font=("Segoe UI", 11, "bold"), anchor="w", padx=12, pady=10)
         self.status_lbl.pack(fill="x")
+        self.saved_lbl = tk.Label(status, text="Documents not saved yet", bg=glass, fg=fg,
+                                  font=("Segoe UI", 9), anchor="w", padx=12)
+        self.saved_lbl.pack(fill="x", pady=(0, 8))
 
         controls = tk.Frame(wrap, bg=glass); controls.pack(fill="x", pady=(0, 16))
-        self._btn(controls, "📷 Capture Current Monitor (taskbar excluded)", self._capture_monitor).pack(pady=6, padx=12)
-        self._btn(controls, "🪟 Capture Active Window (click target)", self._capture_window).pack(pady=6, padx=12)
-        self._btn(controls, "✂️ Capture Region (drag rectangle)", self._capture_region).pack(pady=6, padx=12)
+        self._btn(controls, "📷 Capture Current Monitor (taskbar excluded)", lambda: self._run_capture(self._capture_monitor)).pack(pady=6, padx=12)
+        self._btn(controls, "🖥️ Capture All Monitors (one shot each)", lambda: self._run_capture(self._capture_all_monitors)).pack(pady=6, padx=12)
+        self._btn(controls, "🪟 Capture Active Window (click target)", lambda: self._run_capture(self._capture_window)).pack(pady=6, padx=12)
+        self._btn(controls, "✂️ Capture Region (drag rectangle)", lambda: self._run_capture(self._capture_region)).pack(pady=6, padx=12)
+        burst = tk.Frame(controls, bg=glass); burst.pack(pady=6, padx=12)
+        self._btn(burst, "🎞️ Burst Monitor", lambda: self._start_burst("monitor")).pack(side="left", padx=6)
+        self._btn(burst, "🎞️ Burst Window", lambda: self._start_burst("window")).pack(side="left", padx=6)
+        self._btn(controls, "📜 Scrolling Capture (drag, then scroll)", self._start_scroll).pack(pady=6, padx=12)
 
         proj = tk.Frame(wrap, bg=glass); proj.pack(fill="x", pady=(0, 16))
         tk.Label(proj, text="Project folder", bg=glass, fg=fg, font=("Segoe UI", 10, "bold"),
@@ -383,7 +3158,7 @@ class ClickShotApp:
         tk.Label(proj, text=str(self.session.project_dir), bg=glass, fg=fg, font=("Segoe UI", 9),
                  anchor="w", wraplength=460, justify="left").pack(fill="x", padx=12, pady=(0, 10))
         row = tk.Frame(proj, bg=glass); row.pack(pady=(0, 10))
-        self._btn(row, "💾 Save PPTX/DOCX Now", lambda: self.builder.save()).pack(side="left", padx=6)
+        self._btn(row, "💾 Save PPTX/DOCX Now", lambda: self.builder.save(now=True)).pack(side="left", padx=6)
         self._btn(row, "📂 Change Project", self._change_project).pack(side="left", padx=6)
 
         footer = tk.Frame(wrap, bg=glass); footer.pack(fill="x")
@@ -403,24 +3178,64 @@ class ClickShotApp:
     def _info(self, text): self._status(text, "#58a6ff")
     def _err(self, text): self._status(text, "#dc2626")
 
+    def _poll_builder(self):
+        # DocBuilder saves on its own thread; pick up its progress from the Tk loop
+        if self.encoder.last_error:
+            self._err(self.encoder.last_error)
+            self.encoder.last_error = None
+        if self.builder.last_error:
+            self._err(self.builder.last_error)
+            self.builder.last_error = None
+        if self._recovering and self.builder.ready.is_set():
+            self._recovering = False
+            self._ok(f"Recovered {self.builder.recovered} shots from the interrupted session.")
+        parts = []
+        pending = (len(self._held) + self.encoder.pending + self._feeding
+                   + self.builder.backlog + self.builder.unsaved)
+        if pending:
+            parts.append(f"⏳ {pending} shot{'s' if pending > 1 else ''} processing")
+            slowest = self.builder.slowest
+            if slowest and (self._held or self.builder.stalled_since is not None):
+                parts.append(f"🐢 {slowest.label} is behind, captures are waiting for it")
+        ts = self.builder.last_saved
+        if ts:
+            parts.append(f"💾 Documents saved at {datetime.fromtimestamp(ts):%H:%M:%S}")
+            summary = self.metrics.summary()
+            if summary: parts.append(summary)
+        if parts:
+            try: self.saved_lbl.configure(text="  •  ".join(parts))
+            except Exception: pass
+        self.root.after(250, self._poll_builder)
+
     def _toast(self, text):
+        # Fades run on after() ticks so the Tk loop (and the next capture) never waits on them
         try:
-            toast = tk.Toplevel(self.root)
+            if self._toast_win is not None:
+                self._toast_win.destroy()
+            toast = self._toast_win = tk.Toplevel(self.root)
             toast.overrideredirect(True)
             toast.attributes("-topmost", True)
             toast.attributes("-alpha", 0.0)
             toast.configure(bg="#161b22")
             tk.Label(toast, text=text, bg="#161b22", fg="#f0f6fc",
                      font=("Segoe UI", 9, "bold"), padx=18, pady=12).pack()
-            toast.geometry("+110+110"); toast.update()
-            for i in range(8): toast.attributes("-alpha", min(0.96, i*0.12)); toast.update(); time.sleep(0.015)
-            toast.after(1600, lambda: self._fade_toast(toast))
+            toast.geometry("+110+110")
+            self._fade_toast(toast, 1)
         except Exception: pass
 
-    def _fade_toast(self, toast):
+    def _fade_toast(self, toast, step):
+        """Step 1..8 fades in, 9..16 (after a 1.6 s hold) fades out, then destroy."""
         try:
-            for i in range(8): toast.attributes("-alpha", max(0, 0.96 - i*0.12)); toast.update(); time.sleep(0.015)
-            toast.destroy()
+            if step <= 8:
+                toast.attributes("-alpha", min(0.96, step * 0.12))
+                toast.after(1600 if step == 8 else 15, self._fade_toast, toast, step + 1)
+            elif step <= 16:
+                toast.attributes("-alpha", max(0, 0.96 - (step - 8) * 0.12))
+                toast.after(15, self._fade_toast, toast, step + 1)
+            else:
+                toast.destroy()
+                if self._toast_win is toast:
+                    self._toast_win = None
         except Exception: pass
 
     # -- App visibility helpers --
@@ -428,7 +3243,6 @@ class ClickShotApp:
         try:
             self.root.withdraw()
             self.root.update_idletasks()
-            time.sleep(0.12)
         except Exception: pass
 
     def _show_app(self):
@@ -441,51 +3255,134 @@ class ClickShotApp:
         except Exception: pass
 
     # -- Capture handlers (buttons) --
-    def _capture_monitor(self):
+    def _run_capture(self, handler):
+        # Hide, then grab once the window manager has had `hide_delay_ms` to take the
+        # window off screen; the Tk loop keeps running in between.
+        if self._capturing:
+            return
+        self._capturing = True
         self._hide_app()
+        self.root.after(int(self.config["hide_delay_ms"]), self._capture_hidden, handler)
+
+    def _capture_hidden(self, handler):
         try:
-            img = self.capture.capture_monitor()
-            self._name_and_save(img, "monitor")
-        except Exception as e:
-            self._err(f"Capture failed: {e}")
+            if not self._profile_next:
+                handler()
+                return
+            # One-shot cProfile of a capture as seen from the Tk thread (grab, dialog, hand-off)
+            self._profile_next = False
+            prof = cProfile.Profile()
+            try:
+                prof.runcall(handler)
+            finally:
+                out = self.session.project_dir / f"clickshot_profile_{datetime.now():%Y%m%d_%H%M%S}.prof"
+                prof.dump_stats(str(out))
+                self._info(f"Profile written: {out.name}")
         finally:
+            self._capturing = False
             self._show_app()
 
+    def _grab(self, box: dict):
+        """Grab `box` and open a metrics shot for it. Returns (frame, shot)."""
+        t0 = time.perf_counter()
+        frame = self.capture.grab(box)
+        shot = self.metrics.new_shot(frame.grabbed_at)
+        self.metrics.record("grab", time.perf_counter() - t0, shot, w=frame.width, h=frame.height)
+        return frame, shot
+
+    def _capture_monitor(self):
+        try:
+            frame, shot = self._grab(self.capture.monitor_workarea_under_cursor())
+            self._name_and_save(frame, "monitor", shot)
+        except Exception as e:
+            self._err(f"Capture failed: {e}")
+
+    def _capture_all_monitors(self):
+        # One grab of the virtual screen; each monitor becomes its own shot, cut from
+        # that buffer as a view, so all monitors show the same instant.
+        try:
+            area = "monitor" if self.config["all_monitors_area"] == "monitor" else "work"
+            t0 = time.perf_counter()
+            desktop, views = self.capture.capture_all_monitors(area)
+            shot = self.metrics.new_shot(desktop.grabbed_at)
+            self.metrics.record("grab", time.perf_counter() - t0, shot, w=desktop.width,
+                                h=desktop.height, monitors=len(views))
+            name = self._name_dialog(desktop, shot, f"{len(views)} monitor(s) • one file each")
+            if name is None:
+                self._info("Save cancelled.")
+                return
+            safe = "".join(c for c in name if c.isalnum() or c in " -_()").strip()
+            if not safe:
+                safe = f"screenshot_{datetime.now():%H%M%S}"
+            for i, view in enumerate(views, 1):
+                if i > 1:
+                    shot = self.metrics.new_shot(time.perf_counter())
+                path = self._submit_shot(view, f"{safe} - monitor {i}", "all monitors", shot)
+                if self.config["dedupe"] != "off":
+                    self.shots.add(dhash(view), path.name)
+            self._ok(f"Captured {len(views)} monitors • ready")
+            self._toast("✅ Saved successfully")
+        except Exception as e:
+            self._err(f"Capture failed: {e}")
+
     def _capture_window(self):
-        self._hide_app()
         try:
             hwnd = self.winpicker.pick()
             if not hwnd:
                 self._info("Window capture cancelled.")
             else:
-                l, t, r, b = get_extended_frame_bounds(hwnd)
+                l, t, r, b = self.capture.platform.window_bounds(hwnd)
                 w, h = max(1, r - l), max(1, b - t)
                 box = {"left": l, "top": t, "width": w, "height": h}
-                img = self.capture.grab(box)
-                self._name_and_save(img, "window")
+                frame, shot = self._grab(box)
+                self._name_and_save(frame, "window", shot)
         except Exception as e:
             self._err(f"Capture failed: {e}")
-        finally:
-            self._show_app()
 
     def _capture_region(self):
-        self._hide_app()
         try:
-            box = self.selector.select()
-            if not box:
-                self._info("Selection cancelled.")
-            else:
+            if self.config["region_capture"] == "live":
+                box = self.selector.select()
+                if not box:
+                    return self._info("Selection cancelled.")
                 x, y, w, h = box
-                img = self.capture.grab({"left": x, "top": y, "width": w, "height": h})
-                self._name_and_save(img, "region")
+                frame, shot = self._grab({"left": x, "top": y, "width": w, "height": h})
+                return self._name_and_save(frame, "region", shot)
+            # Frozen: one grab before the overlay exists; the selection is cropped out
+            # of that buffer as a view, so the shot is exactly what was on screen.
+            t0 = time.perf_counter()
+            desktop = self.capture.grab_desktop()
+            grab_s = time.perf_counter() - t0
+            box = self.selector.select(desktop)
+            if not box:
+                return self._info("Selection cancelled.")
+            frame = desktop.crop(*box)
+            frame.grabbed_at = time.perf_counter()  # time spent selecting is not latency
+            shot = self.metrics.new_shot(frame.grabbed_at)
+            self.metrics.record("grab", grab_s, shot, w=frame.width, h=frame.height, frozen=True,
+                                overlay_ms=round(self.selector.open_s * 1000, 1))
+            self._name_and_save(frame, "region", shot)
         except Exception as e:
             self._err(f"Capture failed: {e}")
-        finally:
-            self._show_app()
 
     # -- Naming + saving --
-    def _name_and_save(self, image: Image.Image, mode: str):
-        name = self._name_dialog(image)  # dialog appears while app is hidden; entry is auto-focused
+    def _name_and_save(self, frame: Frame, mode: str, shot: int | None = None, note: str | None = None):
+        policy = self.config["dedupe"]
+        h, match = None, None
+        if policy != "off":
+            with self.metrics.span("dedupe", shot):
+                h = dhash(frame)
+                match = self.shots.nearest(h, int(self.config["dedupe_distance"]))
+            if match:
+                self.metrics.record("duplicate", shot=shot, of=match[0], bits=match[1], action=policy)
+        if match and policy == "skip":
+            self._info(f"Skipped: looks like {match[0]}")
+            return
+
+        if match:
+            dup = f"⚠ Looks like {match[0]}" + (" — kept out of the documents" if policy == "collapse" else "")
+            note = f"{note} • {dup}" if note else dup
+        name = self._name_dialog(frame, shot, note)  # dialog appears while app is hidden; entry is auto-focused
         if name is None:
             self._info("Save cancelled.")
             return
@@ -493,33 +3390,205 @@ class ClickShotApp:
         safe = "".join(c for c in name if c.isalnum() or c in " -_()").strip()
         if not safe:
             safe = f"screenshot_{datetime.now():%H%M%S}"
-        path = (self.session.project_dir / safe).with_suffix(".png")
-        i = 1
-        while path.exists():
-            path = (self.session.project_dir / f"{safe}_{i}").with_suffix(".png")
-            i += 1
+        collapse = bool(match) and policy == "collapse"
+        path = self._submit_shot(frame, safe, mode, shot, document=not collapse)
+        if collapse:
+            self.catalog.update(path.name, duplicate_of=match[0])
+        if h is not None:
+            self.shots.add(h, path.name)
+
+        # Ready for the next shot now; PNG + documents finish in the background
+        if collapse:
+            self._ok(f"Captured {path.name} • collapsed into {match[0]}, not added to the documents")
+        else:
+            self._ok(f"Captured {path.name} • ready")
+        self._toast("✅ Saved successfully")
 
-        image.save(str(path), "PNG", optimize=True)
-        self.builder.add(path, f"{safe} ({mode})")
-        self.builder.save()
+    def _submit_shot(self, frame: Frame, safe: str, mode: str, shot: int | None = None,
+                     document: bool = True, hold: bool = True) -> Path:
+        """Pick the file format (`capture_format`, or by content), reserve a free
+        <safe>.<ext> in the catalog and encode the frame to it in the process pool.
+        The documents get the shot (unless `document` is False) once it is on
+        disk. Returns the path at once: while the encoder or the documents are
+        behind, the frame is held (see _encode_held). Off the Tk thread, `hold=False`
+        blocks in the encoder instead."""
+        caption = f"{safe} ({mode})"
+        fmt = self.config["capture_format"]
+        if fmt not in CAPTURE_FORMATS:
+            with self.metrics.span("analyze", shot) as span:
+                stats = analyze_frame(frame)
+                fmt = choose_format(stats)
+                if self.metrics.enabled: span.fields.update(stats, format=fmt)
+        path = self.session.project_dir / self.catalog.reserve(safe, CAPTURE_FORMATS[fmt])
+        self.catalog.update(path.name, caption=caption, mode=mode, width=frame.width,
+                            height=frame.height, format=fmt)
+
+        builder, metrics, catalog, size = self.builder, self.metrics, self.catalog, frame.size
+        submitted = time.perf_counter()
+        def on_encoded(p, written):  # encoder callback thread: hand over, never wait here
+            metrics.record("encode", time.perf_counter() - submitted, shot)
+            if written != fmt:  # png8 guessed from a sample, the frame had more colours
+                catalog.update(p.name, format=written)
+            if document:
+                with self._feed_lock:
+                    self._feeding += 1
+                self._to_docs.put((builder, p, caption, shot, mode, size))
+        if not hold:
+            self.encoder.submit(frame, path, on_encoded, fmt)
+            return path
+        self._held.append((frame, path, on_encoded, fmt))
+        if len(self._held) == 1:  # else an _encode_held() is already scheduled
+            self._encode_held()
+        return path
+
+    def _encode_held(self):
+        """Hand held shots to the encoder, oldest first, while it and the documents
+        have room, else look again shortly: the Tk loop never waits on them."""
+        while self._held and not (self.encoder.full or self.builder.stalled_since is not None
+                                  or self.builder.backlog >= int(self.config["doc_max_queued"])):
+            frame, path, on_done, fmt = self._held.popleft()
+            try:
+                self.encoder.submit(frame, path, on_done, fmt)
+            except Exception as e:
+                self._err(f"Encoding {path.name} failed: {e}")
+        if self._held:
+            self.root.after(50, self._encode_held)
+
+    def _feed_docs(self):
+        """Feeder thread: encoded shots -> DocBuilder.add(), which blocks while the
+        documents are behind (so the wait is here, not on the encoder's thread)."""
+        while True:
+            builder, path, caption, shot, mode, size = self._to_docs.get()
+            try:
+                builder.add(path, caption, shot, mode=mode, size=size)
+                builder.save()
+            except Exception as e:
+                builder.last_error = f"{path.name}: {e}"
+            finally:
+                with self._feed_lock:
+                    self._feeding -= 1
+
+    # -- Burst --
+    def _start_burst(self, mode: str):
+        if self._capturing:
+            return
+        self._capturing = True
+        self._hide_app()
+        self.root.after(int(self.config["hide_delay_ms"]), self._burst_hidden, mode)
 
-        # Bring app back on top and show toast
+    def _burst_hidden(self, mode: str):
+        try:
+            if mode == "window":
+                hwnd = self.winpicker.pick()
+                if not hwnd:
+                    self._info("Burst cancelled.")
+                    return self._burst_finished(None)
+                l, t, r, b = self.capture.platform.window_bounds(hwnd)
+                box = {"left": l, "top": t, "width": max(1, r - l), "height": max(1, b - t)}
+            else:
+                box = self.capture.monitor_workarea_under_cursor()
+            fps = max(0.1, float(self.config["burst_fps"]))
+            count = max(1, round(fps * float(self.config["burst_seconds"])))
+            ring = FrameRing(box["width"], box["height"],
+                             int(self.config["burst_buffer_mb"]) << 20, count)
+            start, pattern = datetime.now(), self.config["burst_name"]
+
+            def on_frame(frame, index):
+                name = pattern.format(start=start, index=index + 1, mode=mode)
+                safe = "".join(c for c in name if c.isalnum() or c in " -_()").strip()
+                shot = self.metrics.new_shot(frame.grabbed_at)
+                self._submit_shot(frame, safe or f"burst_{index + 1:04d}", f"{mode} burst", shot, hold=False)
+
+            burst = Burst(self.capture, box, count, 1.0 / fps, ring, on_frame).start()
+        except Exception as e:
+            self._err(f"Burst failed: {e}")
+            return self._burst_finished(None)
+        self._burst_poll(burst)
+
+    def _burst_poll(self, burst: Burst):
+        if burst.done:
+            self._burst_finished(burst)
+        else:
+            self.root.after(100, self._burst_poll, burst)
+
+    def _burst_finished(self, burst: Burst | None):
+        self._capturing = False
         self._show_app()
-        self._ok(f"Saved: {path.name}")
-        self._toast("✅ Saved successfully")
+        if burst is None:
+            return
+        self.metrics.record("burst", frames=burst.handed_off, dropped=burst.dropped,
+                            slots=burst.ring.slots)
+        if burst.error:
+            self._err(burst.error)
+        elif burst.dropped:
+            self._info(f"Burst: {burst.handed_off} frames, {burst.dropped} dropped (encoder could not keep up)")
+        else:
+            self._ok(f"Burst: {burst.handed_off} frames captured")
+
+    # -- Scrolling capture --
+    def _start_scroll(self):
+        if self._capturing:
+            return
+        self._capturing = True
+        self._hide_app()
+        self.root.after(int(self.config["hide_delay_ms"]), self._scroll_hidden)
 
-    def _name_dialog(self, pil_img: Image.Image) -> str | None:
-        # Prepare preview
-        preview = pil_img.copy()
-        max_w, max_h = 540, 320
-        w, h = preview.size
-        ar = w / h
-        if w > max_w or h > max_h:
-            if max_w / ar <= max_h:
-                nw, nh = int(max_w), int(max_w / ar)
-            else:
-                nh, nw = int(max_h), int(max_h * ar)
-            preview = preview.resize((nw, nh), Image.LANCZOS)
+    def _scroll_hidden(self):
+        try:
+            box = self.selector.select()
+            if not box:
+                self._info("Scrolling capture cancelled.")
+                return self._scroll_finished(None)
+            x, y, w, h = box
+            stitcher = ScrollStitcher(w, h, int(self.config["scroll_buffer_mb"]) << 20)
+            scroll = ScrollCapture(self.capture, {"left": x, "top": y, "width": w, "height": h},
+                                   max(1.0, float(self.config["scroll_fps"])), stitcher,
+                                   float(self.config["scroll_idle_s"])).start()
+        except Exception as e:
+            self._err(f"Scrolling capture failed: {e}")
+            return self._scroll_finished(None)
+        self._info("Scroll the page now • stops when it stops moving")
+        self._scroll_poll(scroll)
+
+    def _scroll_poll(self, scroll: ScrollCapture):
+        if scroll.done:
+            self._scroll_finished(scroll)
+        else:
+            self.root.after(100, self._scroll_poll, scroll)
+
+    def _scroll_finished(self, scroll: ScrollCapture | None):
+        try:
+            if scroll is None:
+                return
+            st = scroll.stitcher
+            ms = sorted(scroll.stitch_ms)
+            self.metrics.record("scroll", grabs=scroll.grabs, rows=st.rows, lost=st.lost, full=st.full,
+                                stitch_p95_ms=round(ms[int(len(ms) * 0.95)], 2) if ms else None)
+            if scroll.error:
+                return self._err(scroll.error)
+            if st.header is None:
+                self._info("The page did not scroll • saving a single grab")
+            # The stitched image is a view into the canvas; the encoder copies it on submit.
+            # Its clock starts now: the idle wait is not preview latency.
+            frame = st.result()
+            frame.grabbed_at = time.perf_counter()
+            shot = self.metrics.new_shot(frame.grabbed_at)
+            note = f"{frame.width}x{frame.height} from {scroll.grabs} grabs"
+            if st.full:
+                note += " • buffer full, page cut off"
+            elif st.lost:
+                note += f" • {st.lost} grab(s) did not match (scrolled too fast?)"
+            self._name_and_save(frame, "scrolling", shot, note)
+        finally:
+            self._capturing = False
+            self._show_app()
+
+    def _name_dialog(self, frame: Frame, shot: int | None = None, note: str | None = None) -> str | None:
+        # Prepare preview on a worker thread while the dialog is being built
+        def build_preview():
+            with self.metrics.span("preview", shot):
+                return make_preview(frame, 540, 320)
+        preview = self._preview_pool.submit(build_preview)
 
         dlg = tk.Toplevel(self.root)
         dlg.title("Name your screenshot")
@@ -529,8 +3598,11 @@ class ClickShotApp:
         dlg.grab_set()  # modal/focused
         dlg.focus_force()
 
-        img_tk = ImageTk.PhotoImage(preview)
-        tk.Label(dlg, image=img_tk, bg="#161b22").pack(padx=14, pady=(14, 8))
+        img_lbl = tk.Label(dlg, bg="#161b22")
+        img_lbl.pack(padx=14, pady=(14, 8))
+        if note:
+            tk.Label(dlg, text=note, bg="#161b22", fg="#d29922",
+                     font=("Segoe UI", 9, "bold")).pack(padx=14, pady=(0, 6), anchor="w")
 
         tk.Label(dlg, text="File name (without extension):", bg="#161b22",
                  fg="#f0f6fc", font=("Segoe UI", 10, "bold")).pack(padx=14, anchor="w")
@@ -564,36 +3636,92 @@ class ClickShotApp:
         dlg.bind("<Return>", lambda e: ok())
         dlg.bind("<Escape>", lambda e: cancel())
 
+        from PIL import ImageTk
+        img_tk = ImageTk.PhotoImage(preview.result())
+        img_lbl.configure(image=img_tk)
         self.root.update_idletasks()
+        shown = time.perf_counter()
+        ms = (shown - frame.grabbed_at) * 1000
+        self.metrics.record("dialog", ms / 1000, shot)
+        target = float(self.config["preview_target_ms"])
+        if ms > target:
+            self._info(f"Preview took {ms:.0f} ms (target {target:.0f} ms)")
         dlg.wait_window()  # no nested mainloop
+        self.metrics.pause(shot, time.perf_counter() - shown)
         return result["name"]
 
     # -- Project switching & quit --
     def _change_project(self):
-        self.session = self._setup_session()
-        self.builder.close()
-        self.builder = DocBuilder(self.session)
-        self.builder.init_docs()
-        self._ok("Project changed.")
+        if self._capturing or self._handing_off:
+            return
+        session = self._setup_session()
+
+        def switch():
+            self.session = session
+            self.builder = self._new_builder()
+            self._capturing = False
+            self._ok("Project changed.")
+        self._capturing = True  # no captures into a project that is being closed
+        self._hand_off(switch)
 
     def _quit(self):
-        try:
-            self.builder.close()
-        except Exception:
-            pass
-        finally:
+        if self._handing_off:  # second Quit while waiting: stop now, the journal recovers the rest
+            if messagebox.askyesno(APP_NAME, "Documents are still being written.\n\nQuit anyway? "
+                                             "Unsaved shots are recovered when this project is opened next."):
+                self.root.destroy()
+            return
+        self._capturing = True
+
+        def done():
+            self.encoder.shutdown()
             self.root.destroy()
+        self._hand_off(done)
+
+    def _hand_off(self, then):
+        """Let the shots still encoding reach the documents, close the builder and wait
+        (without blocking the Tk loop) until every document is written, then `then()`."""
+        self._handing_off = True
+        old, closing = self.builder, False
+
+        def poll():
+            nonlocal closing
+            if not closing and not (self._held or self.encoder.pending or self._feeding):
+                # shots still on their way belong to this project
+                old.close()
+                closing = True
+            if closing and old.done:
+                self._handing_off = False
+                errors = [e for e in (self.encoder.last_error, old.last_error) if e]
+                self.encoder.last_error = old.last_error = None
+                try:
+                    self.catalog.close()
+                    self.metrics.close()
+                except Exception as e:
+                    errors.append(f"Closing the project failed: {e}")
+                if errors:
+                    messagebox.showerror(APP_NAME, "\n".join(errors))
+                return then()
+            left = len(self._held) + self.encoder.pending + self._feeding + old.backlog + old.unsaved
+            per_doc = ", ".join(f"{w.label} {w.behind + w.built - w.saved}" for w in old.writers.values()
+                                if w.behind + w.built - w.saved)
+            self._info(f"Finishing {old.session.project_name}: {left} shot{'s' if left != 1 else ''} left"
+                       + (f" ({per_doc})" if per_doc else "") if left else f"Saving {old.session.project_name}…")
+            self.root.after(100, poll)
+        poll()
 
     def run(self):
         self.root.mainloop()
 
 # ----- Entrypoint -----
 def ensure_deps():
+    # find_spec locates a module without executing it; the imports happen on first use
+    from importlib.util import find_spec
     missing = []
-    for mod, pipname in [("mss", "mss"), ("PIL", "Pillow"),
+    for mod, pipname in [("mss", "mss"), ("numpy", "numpy"), ("PIL", "Pillow"),
                          ("pptx", "python-pptx"), ("docx", "python-docx"),
                          ("win32api", "pywin32")]:
-        try: __import__(mod)
+        try:
+            if find_spec(mod) is None: missing.append(pipname)
         except Exception: missing.append(pipname)
     if missing:
         print("Missing modules:", ", ".join(missing))
@@ -601,7 +3729,37 @@ def ensure_deps():
         input("Press Enter to exit...")
         sys.exit(1)
 
+def cli(argv) -> int:
+    ap = argparse.ArgumentParser(prog=APP_NAME, description="Headless ClickShot tools.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    cfg = load_config()
+    b = sub.add_parser("build", help="build <folder>.pptx/.docx from the images in a project folder")
+    b.add_argument("folder", type=Path)
+    b.add_argument("--order", choices=("name", "mtime", "captured"), default="name")
+    b.add_argument("--project", help="document title (default: folder name)")
+    b.add_argument("--template", type=Path, help="PowerPoint template (.pptx)")
+    b.add_argument("--workers", type=int, help="image worker processes")
+    b.add_argument("--embed-dpi", type=int, default=int(cfg["embed_dpi"]))
+    b.add_argument("--part-slides", type=int, default=int(cfg["part_max_slides"]),
+                   help="roll over to <folder>_part2... after this many shots (0 = never)")
+    b.add_argument("--part-mb", type=float, default=float(cfg["part_max_mb"]),
+                   help="...or before a part's pictures pass this many MB (0 = no limit)")
+    args = ap.parse_args(argv)
+
+    if not args.folder.is_dir():
+        print(f"Not a folder: {args.folder}", file=sys.stderr)
+        return 2
+    t0 = time.perf_counter()
+    session = build_project(args.folder, args.project, args.template, args.order,
+                            args.workers, args.embed_dpi, progress=print,
+                            part_max_slides=args.part_slides, part_max_mb=args.part_mb)
+    print(f"Wrote {session.pptx_path.name} and {session.docx_path.name} "
+          f"in {time.perf_counter() - t0:.1f}s")
+    return 0
+
 def main():
+    if len(sys.argv) > 1:
+        sys.exit(cli(sys.argv[1:]))
     if os.name != "nt":
         print(f"{APP_NAME} requires Windows.")
         return
@@ -609,4 +3767,6 @@ def main():
     ClickShotApp().run()
 
 if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()  # PNG encode workers in the frozen .exe
     main()
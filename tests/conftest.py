@@ -0,0 +1,25 @@
+import sys
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # main.py is not a package
+
+from main import Session  # noqa: E402 - needs the path above
+
+
+@pytest.fixture
+def session(tmp_path):
+    """A session whose project folder is tmp_path, without a template."""
+    return Session(tmp_path, "B", None, tmp_path, tmp_path / "B.pptx", tmp_path / "B.docx")
+
+
+@pytest.fixture
+def png_file(tmp_path):
+    """Factory: png_file(name, size, colour) writes a solid PNG into tmp_path."""
+    def make(name="shot.png", size=(320, 200), colour=(20, 120, 220)):
+        path = tmp_path / name
+        Image.new("RGB", size, colour).save(path)
+        return path
+    return make
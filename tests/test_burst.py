@@ -0,0 +1,98 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from main import Burst, Capture, FakePlatform, Frame, FrameRing, SyntheticGrabber
+
+BOX = {"left": 0, "top": 0, "width": 64, "height": 48}
+FRAME_BYTES = 64 * 48 * 4
+
+
+class CountingGrabber(SyntheticGrabber):
+    """Stamps the number of each grab into its first pixel."""
+
+    def __init__(self):
+        super().__init__(64, 48)
+        self.grabs = 0
+
+    def grab(self, box):
+        frame = super().grab(box)
+        frame.bgra[0, 0, 0] = self.grabs
+        self.grabs += 1
+        return frame
+
+
+def burst(count, interval, slots, on_frame):
+    capture = Capture(CountingGrabber(), FakePlatform([(0, 0, 64, 48)]))
+    return Burst(capture, BOX, count, interval, FrameRing(64, 48, FRAME_BYTES * slots, slots), on_frame)
+
+
+def finish(b, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not b.done:
+        assert time.monotonic() < deadline, "burst did not finish"
+        time.sleep(0.01)
+    assert b.error is None
+
+
+def test_ring_slots_follow_the_budget():
+    assert FrameRing(64, 48, FRAME_BYTES * 3 + 10, max_slots=8).slots == 3
+    assert FrameRing(64, 48, FRAME_BYTES * 30, max_slots=8).slots == 8
+    with pytest.raises(ValueError):
+        FrameRing(64, 48, FRAME_BYTES - 1, max_slots=8)
+
+
+def test_ring_copies_hands_out_in_order_and_reuses_slots():
+    ring = FrameRing(4, 2, 4 * 2 * 4 * 2, max_slots=2)
+    src = [Frame(np.full((2, 4, 4), i, dtype=np.uint8), left=i) for i in range(3)]
+    assert ring.put(src[0], 0) and ring.put(src[1], 1)
+    assert not ring.put(src[2], 2)  # every slot waits for the encoder
+    src[0].bgra[...] = 99
+    slot, index, frame = ring.get()
+    assert (index, frame.left, int(frame.bgra.max())) == (0, 0, 0)  # a copy, not the grab's buffer
+    assert np.shares_memory(frame.bgra, ring.buf)
+    ring.release(slot)
+    assert ring.put(src[2], 2)
+    assert [ring.get()[1] for _ in range(2)] == [1, 2]
+    ring.close()
+    assert ring.get() is None
+
+
+def test_burst_hands_every_frame_over_in_order():
+    seen = []
+    b = burst(6, 0.02, 3, lambda frame, index: seen.append((index, int(frame.bgra[0, 0, 0])))).start()
+    finish(b)
+    assert b.captured + b.dropped == 6
+    assert b.handed_off == b.captured == len(seen)
+    assert [i for i, _ in seen] == sorted(i for i, _ in seen)
+    assert [g for _, g in seen] == list(range(len(seen)))
+
+
+def test_full_ring_drops_frames_instead_of_growing():
+    go = threading.Event()
+    seen = []
+
+    def slow(frame, index):
+        go.wait(10)  # the encoder is stuck: the first frame holds its slot
+        seen.append(index)
+
+    b = burst(8, 0.005, 2, slow).start()
+    deadline = time.monotonic() + 10
+    while b.captured + b.dropped < 8:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    go.set()
+    finish(b)
+    assert (b.captured, b.dropped, b.handed_off) == (2, 6, 2)
+    assert seen == [0, 1]
+
+
+def test_stop_drops_the_remaining_ticks():
+    first = threading.Event()
+    b = burst(5, 1.0, 2, lambda frame, index: first.set()).start()
+    assert first.wait(10)
+    b.stop()
+    finish(b)
+    assert (b.captured, b.dropped, b.handed_off) == (1, 4, 1)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from main import Frame, SyntheticGrabber, make_preview
+
+SCREEN = {"left": -100, "top": -50, "width": 640, "height": 360}
+
+
+@pytest.fixture
+def grabber():
+    return SyntheticGrabber(640, 360, left=-100, top=-50, copy=False)
+
+
+def test_rgb_and_to_image_swap_channels():
+    bgra = np.zeros((2, 3, 4), dtype=np.uint8)
+    bgra[...] = (10, 20, 30, 0)  # alpha/X is garbage on most grabs
+    f = Frame(bgra)
+    assert f.rgb()[0, 0].tolist() == [30, 20, 10]
+    assert np.shares_memory(f.rgb(), bgra)
+    im = f.to_image()
+    assert im.mode == "RGB" and im.size == (3, 2)
+    assert im.getpixel((2, 1)) == (30, 20, 10)
+
+
+def test_to_image_of_a_crop_matches_rgb(grabber):
+    view = grabber.grab(SCREEN).crop(0, 0, 200, 100)
+    assert not view.bgra.flags.c_contiguous
+    assert np.array_equal(np.asarray(view.to_image()), view.rgb())
+
+
+def test_crop_is_a_view_in_desktop_coordinates(grabber):
+    screen = grabber.grab(SCREEN)
+    view = screen.crop(-60, -20, 100, 80)
+    assert np.shares_memory(view.bgra, screen.bgra)
+    assert (view.left, view.top, view.size) == (-60, -20, (100, 80))
+    assert np.array_equal(view.bgra, screen.bgra[30:110, 40:140])
+
+
+def test_crop_clips_to_the_frame(grabber):
+    screen = grabber.grab(SCREEN)
+    view = screen.crop(500, 300, 400, 400)  # runs off the right and bottom
+    assert (view.left, view.top, view.size) == (500, 300, (40, 10))
+    view = screen.crop(-200, -80, 150, 60)  # starts left of and above the frame
+    assert (view.left, view.top, view.size) == (-100, -50, (50, 30))
+    with pytest.raises(ValueError):
+        screen.crop(540, 0, 10, 10)
+
+
+@pytest.mark.parametrize("size", [(1920, 1080), (1080, 1920), (300, 200), (4000, 90)])
+def test_make_preview_fits_and_keeps_aspect(size):
+    w, h = size
+    frame = SyntheticGrabber(w, h, copy=False).screen
+    im = make_preview(frame, 540, 320)
+    assert im.mode == "RGB"
+    assert im.width <= 540 and im.height <= 320
+    if w <= 540 and h <= 320:
+        assert im.size == size  # never upscaled
+    else:
+        assert im.width == 540 or im.height == 320
+    assert abs(im.width / im.height - w / h) <= (w / h) * 2 / min(im.size)
+
+
+def test_make_preview_colours():
+    bgra = np.zeros((1000, 2000, 4), dtype=np.uint8)
+    bgra[...] = (0, 0, 255, 255)  # pure red in BGRA
+    im = make_preview(Frame(bgra))
+    assert im.getpixel((0, 0)) == (255, 0, 0)
+
+
+def test_make_preview_same_for_a_crop_and_a_copy(grabber):
+    view = grabber.grab(SCREEN).crop(-100, -50, 600, 300)  # within 3x of the preview: no row skipping
+    assert not view.bgra.flags.c_contiguous
+    copy = Frame(np.ascontiguousarray(view.bgra))
+    assert np.array_equal(np.asarray(make_preview(view, 300, 150)), np.asarray(make_preview(copy, 300, 150)))
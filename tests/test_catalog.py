@@ -0,0 +1,71 @@
+import sqlite3
+
+from main import Catalog, list_images
+
+
+def test_reserve_counts_on_and_keeps_counters_across_a_reopen(tmp_path, png_file):
+    catalog = Catalog(tmp_path)
+    assert [catalog.reserve("shot") for _ in range(3)] == ["shot.png", "shot_1.png", "shot_2.png"]
+    assert catalog.reserve("other", ".webp") == "other.webp"
+    catalog.close()
+    png_file("shot_3.png")  # dropped in by hand, unknown to the catalog
+    catalog = Catalog(tmp_path)
+    assert catalog.reserve("shot") == "shot_4.png"
+    assert catalog.reserve("other", ".webp") == "other_1.webp"
+    catalog.close()
+
+
+def test_new_catalog_is_seeded_from_the_folder(tmp_path, png_file):
+    png_file("b.png")
+    png_file("a.png")
+    (tmp_path / "notes.txt").write_text("not an image")
+    catalog = Catalog(tmp_path)
+    assert sorted(r["name"] for r in catalog.shots(order="name")) == ["a.png", "b.png"]
+    assert catalog.reserve("a") == "a_1.png"
+    catalog.close()
+
+
+def test_update_get_size_and_placement(tmp_path):
+    catalog = Catalog(tmp_path)
+    name = catalog.reserve("x")
+    assert catalog.size(name) is None
+    catalog.update(name, caption="x (region)", width=640, height=360, format="png8", slide=4, page=3, part=2)
+    row = catalog.get(name)
+    assert (row["caption"], row["format"], row["slide"], row["page"], row["part"]) == ("x (region)", "png8", 4, 3, 2)
+    assert catalog.size(name) == (640, 360)
+    catalog.clear_placement()
+    row = catalog.get(name)
+    assert (row["slide"], row["page"], row["part"]) == (None, None, None)
+    assert catalog.get("missing.png") is None
+    catalog.close()
+
+
+def test_shots_in_capture_order(tmp_path, png_file):
+    catalog = Catalog(tmp_path)
+    for stem, t in (("c", 1.0), ("a", 3.0), ("b", 2.0)):
+        name = catalog.reserve(stem)
+        png_file(name)
+        catalog.update(name, captured=t)
+    assert [r["name"] for r in catalog.shots()] == ["c.png", "b.png", "a.png"]
+    assert [p.name for p in list_images(tmp_path, "captured", catalog)] == ["c.png", "b.png", "a.png"]
+    assert [p.name for p in list_images(tmp_path, "name", catalog)] == ["a.png", "b.png", "c.png"]
+    catalog.close()
+
+
+def test_older_catalog_gains_new_columns(tmp_path):
+    db = sqlite3.connect(str(tmp_path / Catalog.NAME))
+    db.execute("CREATE TABLE shots (name TEXT PRIMARY KEY, caption TEXT, mode TEXT, width INTEGER, "
+               "height INTEGER, sha1 TEXT, captured REAL, slide INTEGER, page INTEGER)")
+    db.execute("INSERT INTO shots(name, captured) VALUES ('old.png', 1.0)")
+    db.commit()
+    db.close()
+    catalog = Catalog.existing(tmp_path)
+    catalog.update("old.png", format="jpeg", part=2, duplicate_of="x.png")
+    row = catalog.get("old.png")
+    assert (row["format"], row["part"], row["duplicate_of"]) == ("jpeg", 2, "x.png")
+    catalog.close()
+
+
+def test_existing_is_none_without_a_catalog(tmp_path):
+    assert Catalog.existing(tmp_path) is None
+    assert not (tmp_path / Catalog.NAME).exists()
@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+from PIL import Image
+from pptx import Presentation
+
+from main import BKTree, Catalog, Frame, ShotIndex, build_project, dhash, synthetic_desktop
+
+
+def test_dhash_tolerates_small_changes_only():
+    screen = synthetic_desktop(1920, 1080, seed=1)
+    h = dhash(Frame(screen))
+    assert 0 <= h < 1 << 64
+    assert dhash(Frame(screen.copy())) == h
+    blink = screen.copy()
+    blink[500:520, 900:902, :3] = 0  # a text cursor
+    assert (dhash(Frame(blink)) ^ h).bit_count() <= 2
+    assert (dhash(Frame(synthetic_desktop(1920, 1080, seed=2))) ^ h).bit_count() > 10
+
+
+def test_dhash_of_a_view_matches_a_copy():
+    screen = Frame(synthetic_desktop(1920, 1080))
+    view = screen.crop(100, 50, 1000, 700)
+    assert dhash(view) == dhash(Frame(np.ascontiguousarray(view.bgra)))
+
+
+def test_bktree_matches_brute_force():
+    rng = random.Random(7)
+    hashes = [rng.getrandbits(64) for _ in range(1500)]
+    hashes += [h ^ (1 << rng.randrange(64)) for h in hashes[:300]]  # near-duplicates
+    tree = BKTree()
+    for i, h in enumerate(hashes):
+        tree.add(h, i)
+    assert tree.size == len(hashes)
+    for _ in range(500):
+        q = rng.choice(hashes)
+        for _ in range(rng.randrange(12)):
+            q ^= 1 << rng.randrange(64)
+        if rng.random() < 0.2:
+            q = rng.getrandbits(64)
+        radius = rng.randrange(16)
+        best = min((h ^ q).bit_count() for h in hashes)
+        found = tree.nearest(q, radius)
+        if best > radius:
+            assert found is None
+        else:
+            key, d = found
+            assert d == best == (hashes[key] ^ q).bit_count()
+
+
+def test_shot_index_persists(tmp_path):
+    index = ShotIndex(tmp_path)
+    index.add(0xF0F0, "a.png")
+    index.add(0x0F0F, "b.png")
+    with open(tmp_path / ShotIndex.NAME, "a", encoding="utf-8") as f:
+        f.write('{"hash": "zz", "name"')  # torn last line
+    assert ShotIndex(tmp_path).nearest(0xF0F1, 4) == ("a.png", 1)
+    assert ShotIndex(tmp_path, fresh=True).nearest(0xF0F1, 4) is None
+    assert ShotIndex(tmp_path).nearest(0xF0F1, 4) is None
+
+
+def test_build_leaves_collapsed_shots_out(tmp_path):
+    folder = tmp_path / "Demo"
+    folder.mkdir()
+    catalog = Catalog(folder)
+    for i, stem in enumerate("abc"):
+        Image.new("RGB", (320, 200), (i * 80, 0, 0)).save(folder / catalog.reserve(stem))
+    catalog.update("b.png", duplicate_of="a.png")
+    catalog.close()
+    build_project(folder, workers=1)
+    slides = Presentation(str(folder / "Demo.pptx")).slides
+    assert [slide.shapes[-1].text for slide in slides][1:] == ["a", "c"]
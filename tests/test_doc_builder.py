@@ -0,0 +1,36 @@
+import pytest
+from docx import Document
+from pptx import Presentation
+
+from main import DocBuilder, PptxAppender, DocxAppender, add_page, add_slide, new_document, new_presentation
+
+GARBAGE = b"\x89PNG not really"
+
+
+def test_bad_picture_leaves_no_half_built_slide_or_page(session, png_file):
+    prs, doc = new_presentation(session), new_document(session)
+    with pytest.raises(Exception):
+        add_slide(prs, "broken", (320, 200), GARBAGE)
+    with pytest.raises(Exception):
+        add_page(doc, "broken", GARBAGE)
+    good = png_file("good.png").read_bytes()
+    add_slide(prs, "good", (320, 200), good)
+    add_page(doc, "good", good)
+    PptxAppender(session.pptx_path).save(prs)
+    DocxAppender(session.docx_path).save(doc)
+    assert len(Presentation(str(session.pptx_path)).slides) == 2
+    reopened = Document(str(session.docx_path))
+    assert [p.text for p in reopened.paragraphs if p.style.name == "Heading 1"] == ["good"]
+
+
+def test_writer_reports_undecodable_media(session, png_file):
+    bad = session.project_dir / "bad.png"
+    bad.write_bytes(GARBAGE)
+    b = DocBuilder(session, save_quiet=0.05)
+    b.init_docs()
+    b.add(bad, "bad", size=(320, 200))  # a known size: the dispatcher does not decode it
+    b.add(png_file("good.png"), "good", size=(320, 200))
+    b.close(wait=True, timeout=30)
+    assert b.done
+    assert b.last_error and "bad.png" in b.last_error
+    assert len(Presentation(str(session.pptx_path)).slides) == 2
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from main import (CAPTURE_FORMATS, EncodePipeline, Frame, _webp_ok, analyze_frame, choose_format,
+                  encode_image, synthetic_desktop, synthetic_photo)
+
+
+def noise(width=400, height=300):
+    return np.random.default_rng(0).integers(0, 256, (height, width, 4), dtype=np.uint8)
+
+
+def stripes(width=1000, height=400, colours=4):
+    bgra = np.zeros((height, width, 4), dtype=np.uint8)
+    for i in range(colours):
+        bgra[:, i * width // colours:, :3] = (30 * i, 60, 200 - 40 * i)
+    return bgra
+
+
+def rgb(bgra):
+    return np.ascontiguousarray(bgra[..., 2::-1])
+
+
+def encode(tmp_path, bgra, fmt):
+    path = tmp_path / f"shot{CAPTURE_FORMATS[fmt]}"
+    f = Frame(bgra)
+    written = encode_image(f.tobytes(), "RGB", f.size, str(path), fmt, "fast", "BGRX")
+    return path, written
+
+
+def test_analyze_frame_of_a_flat_frame():
+    assert analyze_frame(Frame(np.zeros((50, 80, 4), dtype=np.uint8))) == {"colors": 1, "flat": 1.0, "edges": 0.0}
+
+
+def test_choose_format_by_content():
+    assert choose_format(analyze_frame(Frame(stripes()))) == "png8"
+    assert choose_format(analyze_frame(Frame(synthetic_photo(640, 360)))) == "jpeg"
+    assert choose_format(analyze_frame(Frame(noise()))) == ("webp" if _webp_ok() else "png")
+
+
+@pytest.mark.parametrize("fmt", ["png", "png8", "webp"])
+def test_lossless_formats_round_trip(tmp_path, fmt):
+    if fmt == "webp" and not _webp_ok():
+        pytest.skip("Pillow built without WebP")
+    bgra = stripes() if fmt == "png8" else synthetic_desktop(640, 360)
+    path, written = encode(tmp_path, bgra, fmt)
+    assert written == fmt
+    with Image.open(path) as im:
+        assert im.mode == ("P" if fmt == "png8" else "RGB")
+        assert np.array_equal(np.asarray(im.convert("RGB")), rgb(bgra))
+
+
+def test_jpeg_is_close(tmp_path):
+    bgra = synthetic_photo(640, 360)
+    path, written = encode(tmp_path, bgra, "jpeg")
+    assert written == "jpeg"
+    with Image.open(path) as im:
+        assert im.format == "JPEG"
+        diff = np.abs(np.asarray(im, dtype=np.int16) - rgb(bgra).astype(np.int16))
+    assert diff.mean() < 6  # quality 92 on sensor noise
+
+
+def test_png8_with_more_colours_than_sampled_is_written_as_png(tmp_path):
+    bgra = stripes()
+    bgra[3, :, 0] = np.arange(1000) % 256  # an unsampled row with hundreds of colours
+    bgra[3, :, 1] = np.arange(1000) // 256
+    assert 3 not in np.linspace(0, 399, 65).astype(int)
+    assert choose_format(analyze_frame(Frame(bgra))) == "png8"
+    path, written = encode(tmp_path, bgra, "png8")
+    assert written == "png"
+    with Image.open(path) as im:
+        assert im.mode == "RGB"
+        assert np.array_equal(np.asarray(im), rgb(bgra))
+
+
+def test_pipeline_reports_the_format_written(tmp_path):
+    done = []
+    pipeline = EncodePipeline("fast", workers=1)
+    pipeline.submit(Frame(stripes()), tmp_path / "few.png", lambda p, fmt: done.append((p.name, fmt)), "png8")
+    pipeline.submit(Frame(noise()), tmp_path / "many.png", lambda p, fmt: done.append((p.name, fmt)), "png8")
+    pipeline.drain(timeout=60)
+    pipeline.shutdown()
+    assert sorted(done) == [("few.png", "png8"), ("many.png", "png")]
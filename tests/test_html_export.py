@@ -0,0 +1,88 @@
+from html.parser import HTMLParser
+from urllib.parse import unquote
+
+from PIL import Image
+
+from main import HtmlExporter
+
+SLIDE = (12192000, 6858000)
+VOID = {"meta", "img", "br", "link"}
+
+
+class Page(HTMLParser):
+    """Checks that every element is closed in order; collects figures."""
+
+    def __init__(self, text):
+        super().__init__()
+        self.open, self.figures = [], []
+        self.feed(text)
+        self.close()
+        assert self.open == []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "figure":
+            self.figures.append({"id": attrs["id"]})
+        elif tag == "a" and self.open[-1:] == ["figure"]:
+            self.figures[-1]["href"] = unquote(attrs["href"])
+        elif tag == "img":
+            self.figures[-1].update(src=unquote(attrs["src"]), size=(int(attrs["width"]), int(attrs["height"])),
+                                    alt=attrs["alt"], loading=attrs["loading"])
+        if tag not in VOID:
+            self.open.append(tag)
+
+    def handle_endtag(self, tag):
+        assert self.open.pop() == tag
+
+    def handle_data(self, data):
+        if self.open[-1:] == ["figcaption"]:
+            self.figures[-1]["caption"] = data
+
+
+def add(ex, png_file, name, size, caption):
+    path = png_file(name, size=size)
+    ex.add(path, caption, size, path.read_bytes())
+
+
+def test_figures_thumbnails_and_links(tmp_path, png_file):
+    ex = HtmlExporter(tmp_path / "T.html")
+    ex.start("Demo <1>", SLIDE)
+    add(ex, png_file, "wide shot.png", (3840, 1080), "wide & tall? <no>")
+    add(ex, png_file, "small.png", (200, 100), "small")
+    ex.save()
+    ex.close()
+    text = ex.path.read_text(encoding="utf-8")
+    assert "<title>Demo &lt;1&gt;</title>" in text
+    page = Page(text)
+    assert [f["caption"] for f in page.figures] == ["wide & tall? <no>", "small"]
+    assert [f["alt"] for f in page.figures] == ["wide & tall? <no>", "small"]
+    assert [f["href"] for f in page.figures] == ["wide shot.png", "small.png"]
+    assert [f["size"] for f in page.figures] == [(960, 270), (200, 100)]  # never upscaled
+    for f in page.figures:
+        assert f["loading"] == "lazy"
+        with Image.open(tmp_path / f["src"]) as thumb:
+            assert thumb.format == "JPEG" and thumb.size == f["size"]
+
+
+def test_open_appends_to_a_saved_file(tmp_path, png_file):
+    ex = HtmlExporter(tmp_path / "T.html")
+    ex.start("Demo", SLIDE)
+    add(ex, png_file, "a.png", (320, 200), "first")
+    ex.save()
+    ex.close()
+    again = HtmlExporter(tmp_path / "T.html")
+    assert again.open(SLIDE)
+    add(again, png_file, "b.png", (320, 200), "second")
+    again.save()
+    add(again, png_file, "c.png", (320, 200), "third")
+    again.save()
+    again.close()
+    text = again.path.read_text(encoding="utf-8")
+    assert text.count("</html>") == 1
+    assert [f["caption"] for f in Page(text).figures] == ["first", "second", "third"]
+
+
+def test_open_refuses_other_files(tmp_path):
+    (tmp_path / "T.html").write_text("<html><body>someone else's</body></html>", encoding="utf-8")
+    assert not HtmlExporter(tmp_path / "T.html").open(SLIDE)
+    assert not HtmlExporter(tmp_path / "missing.html").open(SLIDE)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from main import Capture, FakePlatform, SyntheticGrabber, rect_box
+
+# primary, one to the left and raised, a taller one to the right
+LAYOUT = [(0, 0, 1920, 1080), (-1920, -200, 1920, 1080), (1920, 0, 2560, 1440)]
+# topmost first: a dialog over an editor that spans the left and primary monitors
+WINDOWS = [(-300, 100, 300, 500), (-1500, -100, 1200, 900)]
+
+
+@pytest.fixture
+def capture():
+    platform = FakePlatform(LAYOUT, taskbar=40, cursor=(-100, -150), windows=WINDOWS)
+    x, y, w, h = platform.virtual_screen()
+    return Capture(SyntheticGrabber(w, h, left=x, top=y), platform)
+
+
+def test_virtual_screen_spans_negative_offsets(capture):
+    assert capture.virtual_screen() == (-1920, -200, 6400, 1640)
+    assert capture.monitor_workarea_under_cursor() == {"left": -1920, "top": -200,
+                                                       "width": 1920, "height": 1040}
+
+
+@pytest.mark.parametrize("area", ["work", "monitor"])
+def test_all_monitors_are_views_of_one_grab(capture, area):
+    desktop, views = capture.capture_all_monitors(area)
+    assert desktop.size == (6400, 1640)
+    assert len(views) == len(LAYOUT)
+    for m, view in zip(capture.platform.monitors(), views):
+        box = m[area]
+        direct = capture.grab(box)
+        assert (view.left, view.top, view.size) == (box["left"], box["top"], (box["width"], box["height"]))
+        assert np.array_equal(view.bgra, direct.bgra)
+        assert np.shares_memory(view.bgra, desktop.bgra)
+        assert not np.shares_memory(direct.bgra, desktop.bgra)
+
+
+def test_window_at_and_bounds(capture):
+    platform = capture.platform
+    assert platform.window_at(0, 300) == 1  # the dialog is on top
+    assert platform.window_at(-1000, 0) == 2
+    assert platform.window_at(3000, 300) is None  # bare desktop
+    assert [platform.window_bounds(hwnd) for hwnd in (1, 2)] == WINDOWS
+
+
+def test_window_grab_across_monitors(capture):
+    x, y, w, h = capture.virtual_screen()
+    desktop = capture.grab({"left": x, "top": y, "width": w, "height": h})
+    l, t, r, b = capture.platform.window_bounds(capture.platform.window_at(-1000, 0))
+    frame = capture.grab(rect_box((l, t, r, b)))
+    assert (frame.left, frame.top, frame.size) == (l, t, (r - l, b - t))
+    assert np.array_equal(frame.bgra, desktop.crop(l, t, r - l, b - t).bgra)
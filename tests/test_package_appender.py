@@ -0,0 +1,140 @@
+"""Round trips of the append-only writer through python-pptx / python-docx.
+
+PackageAppender leans on internals of zipfile and of both libraries (see
+requirements.txt for the pinned versions); these tests are the guard for an upgrade.
+"""
+import io
+import zipfile
+from collections import Counter
+
+from PIL import Image
+from docx import Document
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from main import DocxAppender, PptxAppender
+
+
+def png(i: int, size=(320, 200)) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, ((i * 40) % 256, (i * 90) % 256, 128)).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def add_slide(prs, media: bytes):
+    slide = prs.slides.add_slide(prs.slide_layouts[6])  # blank
+    slide.shapes.add_picture(io.BytesIO(media), 0, 0)
+
+
+def add_page(doc, media: bytes):
+    doc.add_picture(io.BytesIO(media))
+    doc.add_page_break()
+
+
+def assert_clean_zip(path):
+    with zipfile.ZipFile(path) as zf:
+        names = [zi.filename for zi in zf.infolist()]
+        assert [n for n, c in Counter(names).items() if c > 1] == []
+        assert zf.testzip() is None
+
+
+def pictures(slide) -> int:
+    return [sh.shape_type for sh in slide.shapes].count(MSO_SHAPE_TYPE.PICTURE)
+
+
+def pages(doc) -> int:
+    return len(doc.element.body.xpath('.//w:br[@w:type="page"]'))
+
+
+def test_pptx_saved_repeatedly_reopens(tmp_path):
+    prs, out = Presentation(), PptxAppender(tmp_path / "T.pptx")
+    for i in range(8):
+        add_slide(prs, png(i))
+        if i % 2:
+            out.save(prs)
+    assert_clean_zip(out.path)
+    slides = Presentation(str(out.path)).slides
+    assert len(slides) == 8
+    assert all(pictures(slide) == 1 for slide in slides)
+
+
+def test_docx_saved_repeatedly_reopens(tmp_path):
+    doc, out = Document(), DocxAppender(tmp_path / "T.docx")
+    for i in range(8):
+        add_page(doc, png(i))
+        if i % 3 == 2:
+            out.save(doc)
+    out.save(doc)
+    assert_clean_zip(out.path)
+    reopened = Document(str(out.path))
+    assert pages(reopened) == 8
+    assert len(reopened.inline_shapes) == 8
+
+
+def test_pptx_append_after_open(tmp_path):
+    prs = Presentation()
+    for i in range(3):
+        add_slide(prs, png(i))
+    PptxAppender(tmp_path / "T.pptx").save(prs)
+    out = PptxAppender(tmp_path / "T.pptx")
+    prs = out.open(Presentation)
+    for i in range(3, 6):
+        add_slide(prs, png(i))
+        out.save(prs)
+    assert_clean_zip(out.path)
+    slides = Presentation(str(out.path)).slides
+    assert len(slides) == 6
+    assert all(pictures(slide) == 1 for slide in slides)
+
+
+def test_pptx_resumes_after_a_deleted_slide(tmp_path):
+    prs = Presentation()
+    for i in range(3):
+        add_slide(prs, png(i))
+    gone = prs.slides._sldIdLst[1]
+    prs.part.drop_rel(gone.rId)
+    prs.slides._sldIdLst.remove(gone)
+    prs.save(str(tmp_path / "T.pptx"))  # slide1.xml, slide3.xml: python-pptx renames on open
+    out = PptxAppender(tmp_path / "T.pptx")
+    prs = out.open(Presentation)
+    for i in range(3, 5):
+        add_slide(prs, png(i))
+        out.save(prs)
+    assert_clean_zip(out.path)
+    slides = Presentation(str(out.path)).slides
+    blobs = [sh.image.blob for slide in slides for sh in slide.shapes]
+    assert blobs == [png(i) for i in (0, 2, 3, 4)]
+
+
+def test_docx_append_after_open(tmp_path):
+    doc = Document()
+    for i in range(3):
+        add_page(doc, png(i))
+    DocxAppender(tmp_path / "T.docx").save(doc)
+    out = DocxAppender(tmp_path / "T.docx")
+    doc = out.open(Document)
+    for i in range(3, 6):
+        add_page(doc, png(i))
+        out.save(doc)
+    assert_clean_zip(out.path)
+    reopened = Document(str(out.path))
+    assert pages(reopened) == 6
+    assert len(reopened.inline_shapes) == 6
+
+
+def test_released_media_still_deduplicated(tmp_path):
+    prs, pptx = Presentation(), PptxAppender(tmp_path / "T.pptx", release_media=True)
+    doc, docx = Document(), DocxAppender(tmp_path / "T.docx", release_media=True)
+    same = png(0)
+    for i in range(6):
+        add_slide(prs, same)
+        add_page(doc, same)
+        if i % 2:
+            pptx.save(prs)
+            docx.save(doc)
+    for path in (pptx.path, docx.path):
+        assert_clean_zip(path)
+        with zipfile.ZipFile(path) as zf:
+            assert sum("/media/" in n for n in zf.namelist()) == 1
+    assert len(Document(str(docx.path)).inline_shapes) == 6
+    assert all(pictures(slide) == 1 for slide in Presentation(str(pptx.path)).slides)
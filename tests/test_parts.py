@@ -0,0 +1,59 @@
+import re
+
+from docx import Document
+from pptx import Presentation
+
+from main import Catalog, DocBuilder, index_path, last_part, part_path, remove_parts
+
+
+def run(session, catalog, png_file, names, resume=False):
+    b = DocBuilder(session, save_quiet=0.05, catalog=catalog, part_max_slides=2)
+    b.init_docs(resume=resume)
+    for i, name in enumerate(names):
+        path = png_file(catalog.reserve(name), colour=(40 * i, 90, 200))
+        catalog.update(path.name, caption=name)  # as the app does before queueing the shot
+        b.add(path, name, size=(320, 200))
+    b.close(wait=True, timeout=60)
+    assert b.done and b.last_error is None
+
+
+def slides(path):
+    return [slide.shapes[-1].text for slide in Presentation(str(path)).slides]
+
+
+def test_part_path_and_last_part(tmp_path):
+    deck = tmp_path / "B.pptx"
+    assert part_path(deck, 1) == deck
+    assert part_path(deck, 3).name == "B_part3.pptx"
+    assert last_part(deck) == 1
+    for name in ("B_part2.pptx", "b_PART7.PPTX", "B_part3.docx", "B_partx.pptx", "C_part9.pptx"):
+        (tmp_path / name).touch()
+    assert last_part(deck) == 7
+    remove_parts(deck, keep=2)
+    assert sorted(p.name for p in tmp_path.glob("*.pptx")) == ["B_part2.pptx", "B_partx.pptx", "C_part9.pptx"]
+
+
+def test_roll_over_across_a_restart(session, png_file):
+    catalog = Catalog(session.project_dir)
+    run(session, catalog, png_file, ["a", "b", "c"])
+    run(session, catalog, png_file, ["d", "e"], resume=True)  # carries on in part 2, which has one shot
+
+    assert last_part(session.pptx_path) == last_part(session.docx_path) == 3
+    assert slides(part_path(session.pptx_path, 1))[1:] == ["a", "b"]
+    assert slides(part_path(session.pptx_path, 2))[1:] == ["c", "d"]
+    assert Presentation(str(part_path(session.pptx_path, 2))).slides[0].shapes.title.text == "B (part 2)"
+    assert slides(part_path(session.pptx_path, 3))[1:] == ["e"]
+    for n, captions in ((1, ["a", "b"]), (2, ["c", "d"]), (3, ["e"])):
+        doc = Document(str(part_path(session.docx_path, n)))
+        assert [p.text for p in doc.paragraphs if p.style.name == "Heading 1"] == captions
+
+    placed = {r["caption"]: (r["part"], r["slide"]) for r in catalog.shots()}
+    assert placed == {"a": (1, 2), "b": (1, 3), "c": (2, 2), "d": (2, 3), "e": (3, 2)}
+    catalog.close()
+
+    html = index_path(session).read_text(encoding="utf-8")
+    assert re.findall(r'href="([^"]+)"', html) == [
+        "B.pptx", "B.docx", "B_part2.pptx", "B_part2.docx", "B_part3.pptx", "B_part3.docx"]
+    rows = re.findall(r'<td class="n">(\d*)</td><td class="n">(\d*)</td><td>([^<]*)</td>', html)
+    assert [(slide, caption) for slide, _, caption in rows] == [
+        ("2", "a"), ("3", "b"), ("2", "c"), ("3", "d"), ("2", "e")]
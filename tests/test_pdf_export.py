@@ -0,0 +1,71 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from main import PdfExporter, synthetic_desktop
+
+pypdf = pytest.importorskip("pypdf")
+
+SLIDE = (12192000, 6858000)  # 16:9 in EMU -> 960 x 540 pt
+
+
+def encoded(fmt, size=(320, 200), seed=0, **kw):
+    rgb = synthetic_desktop(*size, seed)[..., 2::-1]
+    im = Image.fromarray(np.ascontiguousarray(rgb))
+    if fmt == "PNG8":
+        im, fmt = im.quantize(16), "PNG"
+    buf = io.BytesIO()
+    im.save(buf, fmt, **kw)
+    return buf.getvalue()
+
+
+SHOTS = [("JPEG", {"quality": 90}), ("PNG", {}), ("PNG8", {}), ("PNG", {"interlace": 1})]
+
+
+def read(path):
+    return pypdf.PdfReader(path, strict=True)
+
+
+def test_pages_images_and_captions(tmp_path):
+    ex = PdfExporter(tmp_path / "T.pdf")
+    ex.start("Title (with parens)", SLIDE)
+    for i, (fmt, kw) in enumerate(SHOTS):
+        ex.add(tmp_path / f"s{i}.png", f"shot {i} {fmt}", (320, 200), encoded(fmt, seed=i, **kw))
+    ex.save()
+    ex.close()
+    pdf = read(ex.path)
+    assert pdf.metadata.title == "Title (with parens)"
+    assert len(pdf.pages) == len(SHOTS)
+    for i, page in enumerate(pdf.pages):
+        assert (float(page.mediabox.width), float(page.mediabox.height)) == (960, 540)
+        assert f"shot {i}" in page.extract_text()
+        (image,) = page.images
+        assert image.image.size == (320, 200)
+    lossless = np.asarray(pdf.pages[1].images[0].image.convert("RGB"))
+    assert np.array_equal(lossless, synthetic_desktop(320, 200, 1)[..., 2::-1])
+
+
+def test_open_appends_to_a_saved_file(tmp_path):
+    ex = PdfExporter(tmp_path / "T.pdf")
+    ex.start("T", SLIDE)
+    ex.add(tmp_path / "a.png", "first", (320, 200), encoded("PNG"))
+    ex.save()
+    ex.close()
+    again = PdfExporter(ex.path)
+    assert again.open(SLIDE)
+    again.add(tmp_path / "b.png", "second", (320, 200), encoded("JPEG"))
+    again.save()
+    again.add(tmp_path / "c.png", "third", (320, 200), encoded("PNG", seed=2))
+    again.save()
+    again.close()
+    pdf = read(again.path)
+    assert [p.extract_text().strip() for p in pdf.pages] == ["first", "second", "third"]
+
+
+def test_open_refuses_other_files(tmp_path):
+    path = tmp_path / "T.pdf"
+    path.write_bytes(b"%PDF-1.4 not ours")
+    assert not PdfExporter(path).open(SLIDE)
+    assert not PdfExporter(tmp_path / "missing.pdf").open(SLIDE)
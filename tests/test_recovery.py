@@ -0,0 +1,134 @@
+import os
+import time
+
+from docx import Document
+from pptx import Presentation
+
+from main import DocBuilder, SessionJournal, file_stamp
+
+
+def builder(session, **kw):
+    """Writers in processes of their own, saving only when told to."""
+    return DocBuilder(session, save_quiet=60, save_max_latency=60, processes=True,
+                      journal=SessionJournal(session.project_dir), **kw)
+
+
+def add(b, png_file, names):
+    for name in names:
+        shade = sum(map(ord, name)) % 256
+        b.add(png_file(f"{name}.png", colour=(shade, 255 - shade, 128)), name, size=(320, 200))
+
+
+def saved(b, n, timeout=60):
+    deadline = time.monotonic() + timeout
+    while not all(w.saved == n for w in b.writers.values()):
+        assert time.monotonic() < deadline, "writers did not save"
+        time.sleep(0.05)
+
+
+def crash(b):
+    """Kill every writer process, as if the app died, and let the builder notice."""
+    for w in b.writers.values():
+        w.worker.kill()
+    b.close(wait=True, timeout=30)
+
+
+def recover(session, **kw):
+    recovery = SessionJournal.recover(session)
+    assert recovery is not None
+    b = builder(session, **kw)
+    b.init_docs(recovery)
+    b.close(wait=True, timeout=60)
+    assert b.done
+    return b
+
+
+def captions(session):
+    slides = [slide.shapes[-1].text for slide in list(Presentation(str(session.pptx_path)).slides)[1:]]
+    pages = [p.text for p in Document(str(session.docx_path)).paragraphs if p.style.name == "Heading 1"]
+    assert slides == pages
+    return slides
+
+
+def test_clean_close_leaves_nothing_to_recover(session, png_file):
+    b = builder(session)
+    b.init_docs()
+    add(b, png_file, ["a", "b"])
+    b.close(wait=True, timeout=60)
+    assert SessionJournal.recover(session) is None
+    assert captions(session) == ["a", "b"]
+
+
+def test_replay_appends_what_the_decks_are_missing(session, png_file):
+    b = builder(session)
+    b.init_docs()
+    add(b, png_file, ["a", "b", "c"])
+    b.save(now=True)
+    saved(b, 3)
+    add(b, png_file, ["d", "e"])  # journaled, built, never saved
+    crash(b)
+    assert captions(session) == ["a", "b", "c"]
+    r = recover(session)
+    assert r.recovered == 2
+    assert captions(session) == ["a", "b", "c", "d", "e"]
+
+
+def test_crash_before_the_first_save_rebuilds_new_decks(session, png_file):
+    b = builder(session)
+    b.init_docs()
+    add(b, png_file, ["a", "b", "c"])
+    crash(b)
+    assert SessionJournal.recover(session).checkpoints == {}
+    r = recover(session)
+    assert r.recovered == 3
+    assert captions(session) == ["a", "b", "c"]
+
+
+def test_stale_stamp_rebuilds_that_deck_only(session, png_file):
+    b = builder(session)
+    b.init_docs()
+    add(b, png_file, ["a", "b"])
+    b.save(now=True)
+    saved(b, 2)
+    add(b, png_file, ["c"])
+    crash(b)
+    with open(session.pptx_path, "r+b") as f:  # a save torn after its checkpoint
+        f.truncate(session.pptx_path.stat().st_size - 100)
+    recovery = SessionJournal.recover(session)
+    assert set(recovery.checkpoints) == {"docx"}
+    assert [r["seq"] for r in recovery.todo] == [1, 2, 3]
+    recover(session)
+    assert captions(session) == ["a", "b", "c"]
+
+
+def test_replay_onto_a_deck_from_before_the_session(session, png_file):
+    b = builder(session)
+    b.init_docs()
+    add(b, png_file, ["old1", "old2"])
+    b.close(wait=True, timeout=60)
+    b = builder(session)
+    b.init_docs(resume=True)
+    saved(b, 0)
+    add(b, png_file, ["new1", "new2"])
+    crash(b)
+    assert captions(session) == ["old1", "old2"]
+    recovery = SessionJournal.recover(session)
+    assert recovery.resumed and [r["caption"] for r in recovery.todo] == ["new1", "new2"]
+    recover(session)
+    assert captions(session) == ["old1", "old2", "new1", "new2"]
+
+
+def test_unreadable_deck_is_kept_as_bak_and_rebuilt(session, png_file):
+    b = builder(session)
+    b.init_docs()
+    add(b, png_file, ["a", "b"])
+    b.save(now=True)
+    saved(b, 2)
+    crash(b)
+    stamp = file_stamp(session.pptx_path)
+    session.pptx_path.write_bytes(b"\0" * stamp[0])  # same size and mtime: the checkpoint still matches
+    os.utime(session.pptx_path, ns=(stamp[1], stamp[1]))
+    r = recover(session)
+    assert ".bak" in (r.last_error or "")
+    assert session.pptx_path.with_name("B.pptx.bak").read_bytes() == b"\0" * stamp[0]
+    assert captions(session) == ["a", "b"]
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from main import ScrollingGrabber, ScrollStitcher
+
+W, H, PAGE = 600, 400, 2400
+BOX = {"left": 0, "top": 0, "width": W, "height": H}
+
+
+def stitch(grabber):
+    """Grab until the page has reached the end and stopped moving."""
+    st = ScrollStitcher(W, H, (PAGE + H) * W * 4)
+    while True:
+        at_end = grabber.offset == len(grabber.page) - grabber.band
+        if not st.add(grabber.grab(BOX)) and at_end:
+            return st
+
+
+@pytest.mark.parametrize("step", [1, 7, 45, 120, 250])
+def test_stitch_is_exact(step):
+    g = ScrollingGrabber(W, H, PAGE, step)
+    st = stitch(g)
+    assert st.lost == 0
+    assert np.array_equal(st.result().bgra, g.expected())
+
+
+def test_stitch_without_fixed_rows():
+    g = ScrollingGrabber(W, H, PAGE, 90, header=0, footer=0)
+    st = stitch(g)
+    assert np.array_equal(st.result().bgra, g.expected())
+
+
+def test_scrolling_too_fast_is_counted():
+    g = ScrollingGrabber(W, H, PAGE, step=H - 56 - 28 - 10)  # leaves a 10-row overlap
+    st = stitch(g)
+    assert st.lost > 0
+    assert not np.array_equal(st.result().bgra, g.expected())
+
+
+def test_canvas_too_small():
+    with pytest.raises(ValueError):
+        ScrollStitcher(W, H, W * 4 * (H - 1))
+
+
+def test_import_leaves_numpy_random_unloaded():
+    code = "import sys, main; print('numpy.random' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).resolve().parent.parent,
+                         capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
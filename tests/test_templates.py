@@ -0,0 +1,90 @@
+import os
+
+import pytest
+from pptx import Presentation
+
+import main
+from main import PptxAppender, Session, TemplateCache, new_presentation
+
+WIDE = 12192000  # 16:9 width in EMU; python-pptx's own default is 9144000
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Counts template builds and template hashes."""
+    n = {"build": 0, "sha1": 0}
+    build, sha1 = TemplateCache._build, main.file_sha1
+
+    def counted_build(template, copy):
+        n["build"] += 1
+        return build(template, copy)
+
+    def counted_sha1(path):
+        n["sha1"] += 1
+        return sha1(path)
+
+    monkeypatch.setattr(TemplateCache, "_build", staticmethod(counted_build))
+    monkeypatch.setattr(main, "file_sha1", counted_sha1)
+    return n
+
+
+def make_template(path, used_layout=None):
+    prs = Presentation()
+    prs.slide_width = WIDE
+    if used_layout is not None:
+        prs.slides.add_slide(prs.slide_layouts[used_layout])
+    prs.save(str(path))
+    return path
+
+
+def broken_cache(self, template):
+    raise PermissionError(f"read-only: {self.folder}")
+
+
+def test_template_used_when_cache_fails(tmp_path, monkeypatch):
+    template = make_template(tmp_path / "corp.pptx")
+    monkeypatch.setattr(main.TemplateCache, "get", broken_cache)
+    s = Session(tmp_path, "T", template, tmp_path, tmp_path / "T.pptx", tmp_path / "T.docx")
+    for out in (None, PptxAppender(s.pptx_path)):
+        problems = []
+        deck = new_presentation(s, out, report=problems.append)
+        assert deck.slide_width == WIDE
+        assert len(problems) == 1 and "Template cache unavailable" in problems[0]
+
+
+def test_cache_hit_miss_and_touch(tmp_path, calls):
+    template = make_template(tmp_path / "corp.pptx")
+    cache = TemplateCache(tmp_path / "cache")
+    copy = cache.get(template)
+    assert calls == {"build": 1, "sha1": 1}
+    assert cache.get(template) == copy
+    assert TemplateCache(tmp_path / "cache").get(template) == copy
+    assert calls == {"build": 1, "sha1": 1}  # a hit costs a stat, not a hash
+    st = template.stat()
+    os.utime(template, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))  # touched, same bytes
+    assert cache.get(template) == copy
+    assert calls == {"build": 1, "sha1": 2}
+    assert cache.get(template) == copy
+    assert calls == {"build": 1, "sha1": 2}
+
+
+def test_cache_rebuilds_a_changed_or_lost_copy(tmp_path, calls):
+    template = make_template(tmp_path / "corp.pptx")
+    cache = TemplateCache(tmp_path / "cache")
+    copy = cache.get(template)
+    make_template(template, used_layout=1)
+    assert cache.get(template) == copy
+    assert calls["build"] == 2
+    copy.unlink()
+    assert cache.get(template).exists()
+    assert calls["build"] == 3
+
+
+@pytest.mark.parametrize("used, kept", [(None, ["Title Slide", "Blank"]),
+                                        (1, ["Title Slide", "Title and Content", "Blank"])])
+def test_copy_keeps_only_the_layouts_in_use(tmp_path, used, kept):
+    copy = TemplateCache(tmp_path / "cache").get(make_template(tmp_path / "corp.pptx", used))
+    prs = Presentation(str(copy))
+    assert [layout.name for layout in prs.slide_layouts] == kept
+    assert prs.slide_layouts[main.content_layout_index(len(kept))].name == "Blank"
+    assert prs.slide_width == WIDE